@@ -0,0 +1,469 @@
+"""
+Caché de la aplicación en dos niveles, configurado con CACHE_CONFIG:
+un LRU en memoria delante de un almacén SQLite con expiración (TTL) y
+desalojo por tamaño, separado por espacios de nombres (consultas de Winda,
+URLs cortas, correos reescritos). Los análisis de CVs tienen su propio
+almacén por hash del PDF (cv_processor.cache).
+
+Los valores se guardan como JSON. Es seguro usarlo desde varios hilos
+(una conexión SQLite por hilo) y desde varios procesos (SQLite en modo WAL).
+AsyncResultCache agrega, para código async, la fusión de llamadas
+concurrentes con la misma clave en una sola.
+"""
+
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from system.config import CACHE_CONFIG
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+_MISSING = object()
+
+# Tras superar el tamaño máximo en disco se desaloja hasta esta fracción
+EVICTION_TARGET = 0.9
+
+
+@dataclass
+class CacheStats:
+    """Contadores de un espacio de nombres (del proceso actual)"""
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    writes: int = 0
+    evictions: int = 0  # Entradas desalojadas del disco por tamaño o cantidad
+    memory_evictions: int = 0  # Entradas que salieron del LRU en memoria (siguen en disco)
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class CacheNamespace:
+    """Vista de AppCache limitada a un espacio de nombres"""
+
+    def __init__(self, cache: 'AppCache', name: str, timeout: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.cache = cache
+        self.name = name
+        self.timeout = timeout
+        self.max_entries = max_entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.cache.get(self.name, key, default)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.cache.set(self.name, key, value, self.timeout if ttl is None else ttl, self.max_entries)
+
+    def get_or_set(self, key: str, factory: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        return self.cache.get_or_set(self.name, key, factory, self.timeout if ttl is None else ttl,
+                                     self.max_entries)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(self.name, key)
+
+    def items(self) -> Dict[str, Any]:
+        return self.cache.items(self.name)
+
+    def clear(self) -> None:
+        self.cache.clear(self.name)
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats(self.name)
+
+
+class AppCache:
+    """
+    LRU en memoria (por proceso) + SQLite compartido en disco. Una lectura
+    consulta la memoria, luego el disco (y sube el valor a memoria); una
+    escritura va a ambos niveles. Las entradas vencidas cuentan como fallo.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_items: Optional[int] = None,
+                 max_size_mb: Optional[float] = None, timeout: Optional[float] = None,
+                 memory_enabled: Optional[bool] = None, disk_enabled: Optional[bool] = None):
+        types = CACHE_CONFIG['types']
+        enabled = CACHE_CONFIG['enabled']
+        self.path = path or CACHE_CONFIG['file_path']
+        self.max_items = max_items or types['memory']['max_items']
+        self.max_size_bytes = int((max_size_mb or types['disk']['max_size_mb']) * 1024 * 1024)
+        self.timeout = CACHE_CONFIG['timeout'] if timeout is None else timeout
+        self.memory_enabled = enabled and types['memory']['enabled'] if memory_enabled is None else memory_enabled
+        self.disk_enabled = enabled and types['disk']['enabled'] if disk_enabled is None else disk_enabled
+
+        # (espacio, clave) -> (valor, vence); el orden es el de uso más reciente
+        self._memory: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats: Dict[str, CacheStats] = {}
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+        if self.disk_enabled:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._init_db()
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"No se pudo abrir el caché en disco {self.path}: {str(e)}")
+                self.disk_enabled = False
+
+    # ---- SQLite ----
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión del hilo actual; un proceso hijo abre las suyas"""
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._local = threading.local()
+            with self._lock:
+                self._memory.clear()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _init_db(self) -> None:
+        connection = self._connection()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+
+    def _disk_get(self, namespace: str, key: str, now: float) -> Any:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return _MISSING, None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            connection.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            with self._lock:
+                self._stat(namespace).expirations += 1
+            return _MISSING, None
+        connection.execute("UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                           (now, namespace, key))
+        return json.loads(value), expires_at
+
+    def _disk_set(self, namespace: str, key: str, value: Any, expires_at: Optional[float], now: float,
+                  max_entries: Optional[int] = None) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (namespace, key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace, key, data, len(data.encode('utf-8')), expires_at, now)
+        )
+        if max_entries:
+            self._trim_namespace(connection, namespace, max_entries)
+        self._evict_disk(connection, now)
+
+    def _trim_namespace(self, connection: sqlite3.Connection, namespace: str, max_entries: int) -> None:
+        """Deja solo las `max_entries` entradas usadas más recientemente del espacio"""
+        victims = [row[0] for row in connection.execute(
+            "SELECT key FROM entries WHERE namespace = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?",
+            (namespace, max_entries))]
+        if not victims:
+            return
+        connection.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?",
+                               [(namespace, key) for key in victims])
+        with self._lock:
+            for key in victims:
+                self._stat(namespace).evictions += 1
+                self._memory.pop((namespace, key), None)
+
+    def _evict_disk(self, connection: sqlite3.Connection, now: float) -> None:
+        """
+        Si el total supera el tamaño máximo, borra las entradas vencidas y
+        luego las menos usadas recientemente hasta bajar a EVICTION_TARGET
+        """
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        expired = connection.execute(
+            "SELECT namespace, COUNT(*) FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ? "
+            "GROUP BY namespace", (now,)).fetchall()
+        connection.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        with self._lock:
+            for namespace, count in expired:
+                self._stat(namespace).expirations += count
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        target = self.max_size_bytes * EVICTION_TARGET
+        if total <= target:
+            return
+        removed = 0
+        victims = []
+        for namespace, key, size in connection.execute(
+                "SELECT namespace, key, size FROM entries ORDER BY accessed_at"):
+            if total - removed <= target:
+                break
+            victims.append((namespace, key))
+            removed += size
+        connection.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+        with self._lock:
+            for namespace, key in victims:
+                self._stat(namespace).evictions += 1
+                self._memory.pop((namespace, key), None)
+
+    # ---- API ----
+
+    def _stat(self, namespace: str) -> CacheStats:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats.setdefault(namespace, CacheStats())
+        return stats
+
+    def namespace(self, name: str, timeout: Optional[float] = _MISSING) -> CacheNamespace:
+        """
+        Espacio de nombres con su propio TTL (por defecto el de
+        CACHE_CONFIG['namespaces'], o el global) y, si allí se define
+        `max_entries`, un máximo de entradas en disco
+        """
+        settings = CACHE_CONFIG.get('namespaces', {}).get(name, {})
+        if timeout is _MISSING:
+            timeout = settings.get('timeout', self.timeout)
+        return CacheNamespace(self, name, timeout, settings.get('max_entries'))
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Valor guardado o `default` si no existe o venció"""
+        now = time.time()
+        memory_key = (namespace, key)
+        with self._lock:
+            stats = self._stat(namespace)
+            if self.memory_enabled and memory_key in self._memory:
+                value, expires_at = self._memory[memory_key]
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(memory_key)
+                    stats.hits += 1
+                    stats.memory_hits += 1
+                    return value
+                del self._memory[memory_key]
+                stats.expirations += 1
+
+        value, expires_at = _MISSING, None
+        if self.disk_enabled:
+            try:
+                value, expires_at = self._disk_get(namespace, key, now)
+            except (sqlite3.Error, ValueError) as e:
+                logger.error(f"Error al leer el caché ({namespace}): {str(e)}")
+
+        with self._lock:
+            if value is _MISSING:
+                stats.misses += 1
+                return default
+            stats.hits += 1
+            stats.disk_hits += 1
+            self._remember(memory_key, value, expires_at)
+        return value
+
+    def _remember(self, memory_key: tuple, value: Any, expires_at: Optional[float]) -> None:
+        if not self.memory_enabled:
+            return
+        self._memory[memory_key] = (value, expires_at)
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > self.max_items:
+            (namespace, _), _ = self._memory.popitem(last=False)
+            self._stat(namespace).memory_evictions += 1
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = _MISSING,
+            max_entries: Optional[int] = None) -> None:
+        """
+        Guarda un valor serializable a JSON. `ttl` en segundos (None o 0: sin
+        vencimiento); por defecto se usa el timeout global. Con `max_entries`
+        se desalojan del espacio las entradas menos usadas que sobren
+        """
+        now = time.time()
+        if ttl is _MISSING:
+            ttl = self.timeout
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._stat(namespace).writes += 1
+            self._remember((namespace, key), value, expires_at)
+        if self.disk_enabled:
+            try:
+                self._disk_set(namespace, key, value, expires_at, now, max_entries)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.error(f"Error al escribir en el caché ({namespace}): {str(e)}")
+
+    def get_or_set(self, namespace: str, key: str, factory: Callable[[], Any],
+                   ttl: Optional[float] = _MISSING, max_entries: Optional[int] = None) -> Any:
+        """Valor guardado o el resultado de `factory()`, que se guarda si no es None"""
+        value = self.get(namespace, key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            if value is not None:
+                self.set(namespace, key, value, ttl, max_entries)
+        return value
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """
+        {clave: valor} de las entradas vigentes del espacio de nombres. No
+        cuenta como acierto ni cambia el orden de uso (sirve para reportes)
+        """
+        now = time.time()
+        if self.disk_enabled:
+            try:
+                rows = self._connection().execute(
+                    "SELECT key, value FROM entries WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (namespace, now)).fetchall()
+                return {key: json.loads(value) for key, value in rows}
+            except (sqlite3.Error, ValueError) as e:
+                logger.error(f"Error al leer el caché ({namespace}): {str(e)}")
+        with self._lock:
+            return {key: value for (name, key), (value, expires_at) in self._memory.items()
+                    if name == namespace and (expires_at is None or expires_at > now)}
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._memory.pop((namespace, key), None)
+        if self.disk_enabled:
+            try:
+                self._connection().execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            except sqlite3.Error as e:
+                logger.error(f"Error al borrar del caché ({namespace}): {str(e)}")
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Vacía un espacio de nombres o todo el caché"""
+        with self._lock:
+            for memory_key in [k for k in self._memory if namespace is None or k[0] == namespace]:
+                del self._memory[memory_key]
+        if self.disk_enabled:
+            try:
+                if namespace is None:
+                    self._connection().execute("DELETE FROM entries")
+                else:
+                    self._connection().execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            except sqlite3.Error as e:
+                logger.error(f"Error al vaciar el caché: {str(e)}")
+
+    def purge_expired(self) -> int:
+        """Borra las entradas vencidas de ambos niveles; retorna cuántas había en disco"""
+        now = time.time()
+        with self._lock:
+            for memory_key in [k for k, (_, expires_at) in self._memory.items()
+                               if expires_at is not None and expires_at <= now]:
+                del self._memory[memory_key]
+        if not self.disk_enabled:
+            return 0
+        try:
+            cursor = self._connection().execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Error al depurar el caché: {str(e)}")
+            return 0
+
+    def stats(self, namespace: Optional[str] = None) -> Any:
+        """Contadores de un espacio de nombres, o {espacio: contadores} de todos"""
+        with self._lock:
+            if namespace is not None:
+                return CacheStats(**asdict(self._stat(namespace)))
+            return {name: CacheStats(**asdict(stats)) for name, stats in self._stats.items()}
+
+    def disk_usage(self) -> Dict[str, int]:
+        """Entradas y bytes en disco por espacio de nombres"""
+        if not self.disk_enabled:
+            return {}
+        rows = self._connection().execute(
+            "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY namespace").fetchall()
+        return {namespace: {"entries": count, "bytes": size} for namespace, count, size in rows}
+
+    def close(self) -> None:
+        """Cierra la conexión del hilo actual"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class AsyncResultCache:
+    """
+    Memoización para corutinas sobre un espacio de nombres: un acierto
+    retorna sin esperar nada y las llamadas concurrentes con la misma clave
+    esperan a la única que está en curso en lugar de repetir el trabajo
+    """
+
+    def __init__(self, namespace: CacheNamespace):
+        self.namespace = namespace
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0  # Llamadas que esperaron a otra en curso
+
+    async def get_or_compute(self, key: str, factory: Callable[[], Awaitable[Any]],
+                             cacheable: Callable[[Any], bool] = lambda value: value is not None) -> Any:
+        """
+        Valor guardado o el resultado de `await factory()`; solo se guarda si
+        `cacheable(valor)`. Un error se propaga a todas las llamadas que esperaban
+        """
+        value = self.namespace.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            # shield: cancelar a quien espera no cancela la llamada compartida
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marcar la excepción como recuperada si nadie más esperaba
+            future.exception()
+            raise
+        else:
+            if cacheable(value):
+                self.namespace.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+
+_cache: Optional[AppCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_app_cache() -> AppCache:
+    """Caché compartido de la aplicación, creado la primera vez que se usa"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AppCache()
+    return _cache
+
+
+def get_cache_namespace(name: str) -> CacheNamespace:
+    """Espacio de nombres del caché compartido"""
+    return get_app_cache().namespace(name)
@@ -0,0 +1,119 @@
+"""
+Memoria de conversación acotada por tokens para los asistentes con Gemini.
+
+Guarda solo el texto del usuario y la respuesta de cada turno (las
+instrucciones que envuelven el mensaje se aplican al enviarlo) y, cuando el
+historial supera su presupuesto de tokens, mueve los turnos más antiguos a
+un resumen compacto que viaja como un único mensaje de memoria. Así el
+contexto enviado en cada turno deja de crecer con la duración de la sesión.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from codeparts.cv_processor.rate_limiter import estimate_tokens
+
+MEMORY_HEADER = "MEMORIA DE LA CONVERSACIÓN (resumen de los turnos anteriores, solo como contexto):"
+MEMORY_ACK = "Entendido, tendré en cuenta ese contexto."
+
+# Caracteres máximos de cada lado de un turno dentro del resumen
+SUMMARY_SNIPPET_CHARS = 160
+
+
+@dataclass
+class Turn:
+    user: str  # Texto original del usuario, sin envoltura
+    model: str
+    tokens: int
+
+
+def _snippet(text: str, limit: int = SUMMARY_SNIPPET_CHARS) -> str:
+    """Oraciones iniciales del texto en una sola línea, hasta `limit` caracteres"""
+    text = re.sub(r'\s+', ' ', text).strip()
+    if len(text) <= limit:
+        return text
+    snippet = ""
+    for sentence in re.findall(r'[^.!?]+[.!?]*\s*', text):
+        if len(snippet) + len(sentence.rstrip()) > limit:
+            break
+        snippet += sentence
+    return snippet.rstrip() or text[:limit - 1].rstrip() + "…"
+
+
+class ConversationMemory:
+    """
+    Turnos recientes dentro de `token_budget` más un resumen de los
+    desalojados dentro de `summary_budget` (ambos en tokens estimados)
+    """
+
+    def __init__(self, token_budget: int, summary_budget: int, max_turns: Optional[int] = None,
+                 token_counter: Callable[[str], int] = estimate_tokens):
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.max_turns = max_turns
+        self.count_tokens = token_counter
+        self.turns: List[Turn] = []
+        self.summary: List[str] = []
+        # Tokens de cada línea del resumen: cada línea se cuenta una sola vez
+        self.summary_tokens: List[int] = []
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    @property
+    def tokens(self) -> int:
+        """Tokens estimados de los turnos y del resumen"""
+        return sum(turn.tokens for turn in self.turns) + sum(self.summary_tokens)
+
+    def clear(self) -> None:
+        self.turns = []
+        self.summary = []
+        self.summary_tokens = []
+        self.evicted = 0
+
+    def add_turn(self, user_text: str, model_text: str) -> None:
+        """Agrega un turno y desaloja los más antiguos que no quepan"""
+        tokens = self.count_tokens(user_text) + self.count_tokens(model_text)
+        self.turns.append(Turn(user_text, model_text, tokens))
+        self.trim()
+
+    def trim(self) -> None:
+        """Pasa al resumen los turnos más antiguos hasta respetar el presupuesto"""
+        total = sum(turn.tokens for turn in self.turns)
+        # El turno más reciente se conserva aunque por sí solo exceda el presupuesto
+        while len(self.turns) > 1 and (total > self.token_budget or
+                                       (self.max_turns and len(self.turns) > self.max_turns)):
+            turn = self.turns.pop(0)
+            total -= turn.tokens
+            self._summarize(turn)
+
+    def _summarize(self, turn: Turn) -> None:
+        self.evicted += 1
+        line = f"- Usuario: {_snippet(turn.user)} | Respuesta: {_snippet(turn.model)}"
+        self.summary.append(line)
+        self.summary_tokens.append(self.count_tokens(line))
+        # Si el resumen excede su presupuesto se olvidan las líneas más antiguas
+        total = sum(self.summary_tokens)
+        while len(self.summary) > 1 and total > self.summary_budget:
+            self.summary.pop(0)
+            total -= self.summary_tokens.pop(0)
+
+    def history(self, system_messages: List[Dict]) -> List[Dict]:
+        """
+        Historial para `start_chat`: mensajes de sistema, el mensaje de
+        memoria (si hay turnos resumidos) y los turnos recientes
+        """
+        history = list(system_messages)
+        if self.summary:
+            history.extend([
+                {"role": "user", "parts": [MEMORY_HEADER + "\n" + "\n".join(self.summary)]},
+                {"role": "model", "parts": [MEMORY_ACK]}
+            ])
+        for turn in self.turns:
+            history.extend([
+                {"role": "user", "parts": [turn.user]},
+                {"role": "model", "parts": [turn.model]}
+            ])
+        return history
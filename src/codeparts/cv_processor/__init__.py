@@ -39,6 +39,7 @@ async def process_cvs_menu():
         category_choices = [Separator()]
         for category in MENU_CONFIG['cv_processor_menu']['categories'].keys():
             category_choices.append(Choice(category, f"Puestos de {category}"))
+        category_choices.append(Choice("todas", "Evaluar todas las vacantes a la vez"))
         category_choices.append(Separator("\n"))
         category_choices.append(Choice("volver", "Volver al menú principal"))
         category_choices.append(Separator())
@@ -57,6 +58,20 @@ async def process_cvs_menu():
             set_console_title(f'CJR Toolkit v{LASTVERSION} - Menú Principal')
             return
 
+        if selected_category == "todas":
+            clear_screen()
+            Ascii_logo()
+            print("\n   Iniciando procesamiento de CVs para todas las vacantes...")
+
+            # Cada CV se analiza una vez y se evalúa contra todas las vacantes
+            processor = CVProcessor(os.path.dirname(CURRICULUMS_FOLDER))
+            vacancy_results = processor.process_all_vacancies()
+            if vacancy_results:
+                processor.display_vacancy_results(vacancy_results)
+
+            await inquirer.text(message="Presione Enter para continuar...", qmark='   >', style=style).execute_async()
+            continue
+
         # Segundo nivel: Selección de puesto dentro de la categoría
         clear_screen()
         Ascii_logo()
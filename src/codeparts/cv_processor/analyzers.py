@@ -1,15 +1,70 @@
-from typing import Dict, List
+import bisect
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from system.config import CV_PROCESSOR_CONFIG
 
+from .keyword_automaton import KeywordAutomaton, KeywordMatch, tokenize
+
+# Tokens que separan elementos de una lista; un nivel del otro lado de un
+# separador se considera más lejano que cualquiera del mismo lado
+LIST_SEPARATORS = frozenset(",;|•·/().")
+SEPARATOR_PENALTY = 1000
+# Tokens máximos entre un idioma y su nivel
+LEVEL_WINDOW = 6
+
+_automaton: Optional[KeywordAutomaton] = None
+# Tokens del nivel más largo de la configuración; un nivel antes del idioma
+# puede empezar hasta LEVEL_WINDOW + _level_tokens tokens antes que este
+_level_tokens = 0
+
+
+def _get_automaton() -> KeywordAutomaton:
+    """
+    Un solo autómata con las keywords profesionales, habilidades blandas,
+    certificaciones, idiomas y niveles; se compila la primera vez que se usa
+    """
+    global _automaton, _level_tokens
+    if _automaton is None:
+        keywords = CV_PROCESSOR_CONFIG["keywords"]
+        entries = []
+        for area, subareas in keywords["professional"].items():
+            for subarea, terms in subareas.items():
+                entries.extend((kw, ("professional", area, subarea)) for kw in terms)
+        entries.extend((skill, ("soft_skills",)) for skill in keywords["soft_skills"])
+        for area, certs in keywords["certifications"].items():
+            entries.extend((cert, ("certifications", area)) for cert in certs)
+        entries.extend((lang, ("languages",)) for lang in keywords["languages"]["idiomas"])
+        entries.extend((nivel, ("levels",)) for nivel in keywords["languages"]["niveles"])
+        _automaton = KeywordAutomaton(entries)
+        _level_tokens = max((len(tokenize(nivel.lower())) for nivel in keywords["languages"]["niveles"]), default=0)
+    return _automaton
+
+
+@lru_cache(maxsize=32)
+def _matches(text: str) -> Tuple[Tuple[str, ...], Tuple[KeywordMatch, ...]]:
+    """
+    Tokens en minúsculas y coincidencias; las cuatro funciones de análisis
+    suelen recibir el mismo texto, así que se busca una sola vez
+    """
+    tokens = tokenize(text.lower())
+    return tuple(tokens), tuple(_get_automaton().find_tokens(tokens))
+
+
+def _found(text: str, kind: str) -> set:
+    """(término, payload) encontrados de un tipo"""
+    return {(match.term, match.payload) for match in _matches(text)[1] if match.payload[0] == kind}
+
+
 def analyze_professional_keywords(text: str) -> Dict:
     """Analiza las palabras clave profesionales en el texto"""
     results = {}
     keywords = CV_PROCESSOR_CONFIG["keywords"]["professional"]
-    
+    found = _found(text, "professional")
+
     for area, subareas in keywords.items():
         area_matches = {}
         for subarea, keywords in subareas.items():
-            matches = [kw for kw in keywords if kw.lower() in text.lower()]
+            matches = [kw for kw in keywords if (kw, ("professional", area, subarea)) in found]
             if matches:
                 area_matches[subarea] = matches
         if area_matches:
@@ -19,29 +74,66 @@ def analyze_professional_keywords(text: str) -> Dict:
 def analyze_soft_skills(text: str) -> List[str]:
     """Analiza las habilidades blandas en el texto"""
     skills = CV_PROCESSOR_CONFIG["keywords"]["soft_skills"]
-    return [skill for skill in skills if skill.lower() in text.lower()]
+    found = _found(text, "soft_skills")
+    return [skill for skill in skills if (skill, ("soft_skills",)) in found]
 
 def analyze_certifications(text: str) -> Dict[str, List[str]]:
     """Analiza las certificaciones en el texto"""
     results = {}
     certifications = CV_PROCESSOR_CONFIG["keywords"]["certifications"]
-    
+    found = _found(text, "certifications")
+
     for area, certs in certifications.items():
-        matches = [cert for cert in certs if cert.upper() in text.upper()]
+        matches = [cert for cert in certs if (cert, ("certifications", area)) in found]
         if matches:
             results[area] = matches
     return results
 
+def _nearest_level(tokens: Tuple[str, ...], language: KeywordMatch, levels: List[KeywordMatch],
+                   level_starts: List[int]) -> Optional[str]:
+    """
+    Nivel más cercano (en tokens) a una mención del idioma, en la misma
+    línea; los que quedan tras un separador de lista solo cuentan si no hay
+    otro más cerca
+    """
+    best, best_distance = None, None
+    # Solo los niveles dentro de la ventana (ordenados por posición)
+    first = bisect.bisect_left(level_starts, language.start - LEVEL_WINDOW - _level_tokens)
+    last = bisect.bisect_right(level_starts, language.end + LEVEL_WINDOW)
+    for level in levels[first:last]:
+        if level.end <= language.start:
+            between = tokens[level.end:language.start]
+        elif level.start >= language.end:
+            between = tokens[language.end:level.start]
+        else:
+            continue
+        if len(between) > LEVEL_WINDOW or "\n" in between:
+            continue
+        distance = len(between)
+        if any(token in LIST_SEPARATORS for token in between):
+            distance += SEPARATOR_PENALTY
+        if best_distance is None or distance < best_distance:
+            best, best_distance = level.term, distance
+    return best
+
 def analyze_languages(text: str) -> Dict[str, str]:
     """Analiza los idiomas y sus niveles en el texto"""
     results = {}
     languages = CV_PROCESSOR_CONFIG["keywords"]["languages"]
-    
+    tokens, matches = _matches(text)
+    levels = sorted(match for match in matches if match.payload[0] == "levels")
+    level_starts = [level.start for level in levels]
+    mentions: Dict[str, List[KeywordMatch]] = {}
+    for match in matches:
+        if match.payload[0] == "languages":
+            mentions.setdefault(match.term, []).append(match)
+
     for lang in languages["idiomas"]:
-        if lang.lower() in text.lower():
-            # Buscar el nivel del idioma
-            for nivel in languages["niveles"]:
-                if nivel.lower() in text.lower():
+        if lang in mentions:
+            # Buscar el nivel más cercano a alguna mención del idioma
+            for mention in mentions[lang]:
+                nivel = _nearest_level(tokens, mention, levels, level_starts)
+                if nivel:
                     results[lang] = nivel
                     break
             if lang not in results:
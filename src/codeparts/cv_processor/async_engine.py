@@ -0,0 +1,186 @@
+"""
+Motor asíncrono de análisis de CVs con Gemini
+"""
+
+import time
+import asyncio
+import logging
+import random
+import threading
+from typing import Callable, Dict, List, Optional
+from system.config import CV_PROCESSOR_CONFIG
+
+from .rate_limiter import RateLimiter, estimate_tokens, is_rate_limit_error
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+
+def run_coroutine(coro):
+    """
+    Ejecuta una corrutina desde código síncrono, aun si ya hay un loop activo
+    (los menús corren dentro de asyncio)
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+class AnalysisEngine:
+    """
+    Ejecuta GeminiProcessor.analyze_cv_async con concurrencia acotada y un
+    limitador de solicitudes/tokens por minuto, reintentando los 429 con
+    una pausa global en lugar de que cada tarea choque contra la cuota.
+    """
+
+    def __init__(self, gemini_processor, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_concurrency: Optional[int] = None,
+                 max_retries: Optional[int] = None, batch_size: Optional[int] = None,
+                 latency_observer: Optional[Callable[[float], None]] = None):
+        config = CV_PROCESSOR_CONFIG["gemini"]
+        self.gemini_processor = gemini_processor
+        self.limiter = RateLimiter(
+            requests_per_minute or config["requests_per_minute"],
+            tokens_per_minute or config["tokens_per_minute"]
+        )
+        self.max_concurrency = max_concurrency or CV_PROCESSOR_CONFIG["max_workers"]["analysis"]
+        self.max_retries = max_retries if max_retries is not None else config["max_retries"]
+        self.output_tokens = config["estimated_output_tokens"]
+
+        # El lote no puede pedir más salida de la que el modelo entrega en una respuesta
+        batch_size = batch_size or config["batch_size"]
+        self.batch_size = max(1, min(batch_size, config["max_output_tokens"] // self.output_tokens))
+        self.batch_token_budget = config["batch_token_budget"]
+
+        # Contadores de la corrida
+        self.requests_sent = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.batch_fallbacks = 0
+        # Recibe la duración de cada solicitud a Gemini (métricas de progreso)
+        self.latency_observer = latency_observer
+
+    async def _call_with_quota(self, tokens: int, call, default):
+        """
+        Ejecuta `call()` cuando hay cupo, reintentando los 429 con una pausa
+        global; retorna `default` si se agotan los reintentos o hay otro error
+        """
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(tokens)
+            self.requests_sent += 1
+            started_at = time.perf_counter()
+            try:
+                return await call()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    logger.error(f"Error al analizar CV: {str(e)}")
+                    return default
+                self.rate_limited += 1
+                # Pausar a todos los trabajadores, no solo a esta tarea
+                self.limiter.penalize(backoff + random.uniform(0, backoff / 2))
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if self.latency_observer:
+                    self.latency_observer(time.perf_counter() - started_at)
+        return default
+
+    async def analyze(self, cv_text: str) -> dict:
+        """
+        Analiza un CV respetando la cuota; retorna {} si no se pudo analizar
+        """
+        prompt = self.gemini_processor._build_prompt(cv_text)
+        tokens = estimate_tokens(prompt) + self.output_tokens
+        analysis = await self._call_with_quota(
+            tokens, lambda: self.gemini_processor.analyze_cv_async(cv_text), {}
+        )
+        if not analysis:
+            self.failed += 1
+        return analysis
+
+    async def analyze_batch(self, batch: Dict[str, str]) -> Dict[str, dict]:
+        """
+        Analiza un lote en una sola solicitud; los CVs que no vengan bien en
+        la respuesta se reintentan de forma individual
+        """
+        if len(batch) == 1:
+            key, cv_text = next(iter(batch.items()))
+            return {key: await self.analyze(cv_text)}
+
+        prompt = self.gemini_processor._build_batch_prompt(batch)
+        tokens = estimate_tokens(prompt) + self.output_tokens * len(batch)
+        results = await self._call_with_quota(
+            tokens, lambda: self.gemini_processor.analyze_cv_batch_async(batch), {}
+        )
+
+        missing = [key for key in batch if not results.get(key)]
+        if missing:
+            self.batch_fallbacks += len(missing)
+            analyses = await asyncio.gather(*(self.analyze(batch[key]) for key in missing))
+            results.update(zip(missing, analyses))
+        return results
+
+    def plan_batches(self, texts: Dict[str, str]) -> List[Dict[str, str]]:
+        """
+        Agrupa los CVs en lotes de hasta `batch_size` CVs sin exceder el
+        presupuesto de tokens de entrada por solicitud
+        """
+        batches = []
+        current = {}
+        current_tokens = 0
+        for key, cv_text in texts.items():
+            tokens = estimate_tokens(cv_text)
+            if current and (len(current) >= self.batch_size or current_tokens + tokens > self.batch_token_budget):
+                batches.append(current)
+                current = {}
+                current_tokens = 0
+            current[key] = cv_text
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def analyze_many(self, texts: Dict[str, str],
+                           on_result: Optional[Callable[[str, dict], None]] = None) -> Dict[str, dict]:
+        """
+        Analiza varios CVs ({clave: texto}) y retorna {clave: análisis}.
+        `on_result` se invoca en cuanto termina cada CV.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = {}
+
+        async def worker(batch: Dict[str, str]):
+            async with semaphore:
+                analyses = await self.analyze_batch(batch)
+            for key in batch:
+                analysis = analyses.get(key) or {}
+                results[key] = analysis
+                if on_result:
+                    on_result(key, analysis)
+
+        await asyncio.gather(*(worker(batch) for batch in self.plan_batches(texts)))
+        return results
+
+    def run(self, texts: Dict[str, str],
+            on_result: Optional[Callable[[str, dict], None]] = None) -> Dict[str, dict]:
+        """
+        Punto de entrada síncrono para analyze_many
+        """
+        return run_coroutine(self.analyze_many(texts, on_result))
@@ -0,0 +1,98 @@
+"""
+Caché persistente de extracciones de CVs direccionada por contenido
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Optional
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+# Versión del formato de las entradas; cambiarla invalida las entradas anteriores
+CACHE_FORMAT_VERSION = 1
+
+
+def hash_pdf(pdf_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calcula el SHA-256 de los bytes del PDF
+    """
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CVCache:
+    """
+    Guarda el texto extraído y el análisis de Gemini de cada CV una sola vez,
+    indexado por el hash del PDF e independiente del puesto evaluado.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, pdf_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{pdf_hash}.json")
+
+    def contains(self, pdf_hash: str) -> bool:
+        """
+        Indica si hay una entrada válida para el hash (la misma validación que `get`)
+        """
+        return self.get(pdf_hash) is not None
+
+    def get(self, pdf_hash: str) -> Optional[dict]:
+        """
+        Retorna la entrada guardada para el hash o None si no existe o es inválida
+        """
+        entry_path = self._entry_path(pdf_hash)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"Error al cargar caché {pdf_hash}: {str(e)}")
+            return None
+
+        if not isinstance(entry, dict) or entry.get('version') != CACHE_FORMAT_VERSION:
+            return None
+        if not isinstance(entry.get('analysis'), dict) or not entry['analysis']:
+            return None
+        return entry
+
+    def get_analysis(self, pdf_hash: str) -> Optional[dict]:
+        """
+        Retorna una copia del análisis estructurado guardado para el hash
+        """
+        entry = self.get(pdf_hash)
+        if not entry:
+            return None
+        return dict(entry['analysis'])
+
+    def put(self, pdf_hash: str, text: str, analysis: dict, filename: str = "") -> None:
+        """
+        Guarda el texto y el análisis de un CV de forma atómica
+        """
+        entry = {
+            'version': CACHE_FORMAT_VERSION,
+            'sha256': pdf_hash,
+            'filename': filename,
+            'text': text,
+            'analysis': analysis
+        }
+        entry_path = self._entry_path(pdf_hash)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            logger.warning(f"Error al guardar caché para {filename or pdf_hash}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -6,17 +6,22 @@ import re
 import urllib.parse
 import requests
 
-def _generate_short_url(long_url: str) -> str:
-    """
-    Genera una URL corta usando TinyURL
-    """
+from codeparts.app_cache import get_cache_namespace
+
+def _request_short_url(long_url: str):
     try:
         response = requests.get(f'http://tinyurl.com/api-create.php?url={long_url}')
         if response.status_code == 200:
             return response.text.strip()
-        return long_url
     except:
-        return long_url
+        pass
+    return None
+
+def _generate_short_url(long_url: str) -> str:
+    """
+    Genera una URL corta usando TinyURL; las ya generadas se toman del caché
+    """
+    return get_cache_namespace("short_urls").get_or_set(long_url, lambda: _request_short_url(long_url)) or long_url
 
 def generate_whatsapp_link(telefono: str, recruiter_name: str = "Recursos Humanos", nombre: str = "Candidato") -> str:
     """
@@ -38,11 +43,4 @@ def generate_whatsapp_link(telefono: str, recruiter_name: str = "Recursos Humano
     url = f"https://wa.me/{telefono}?text={urllib.parse.quote(mensaje)}"
     
     # Acortar enlace usando tinyurl
-    try:
-        response = requests.get(f'http://tinyurl.com/api-create.php?url={url}')
-        if response.status_code == 200:
-            return response.text
-    except:
-        pass
-        
-    return url
+    return _generate_short_url(url)
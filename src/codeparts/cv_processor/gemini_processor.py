@@ -2,17 +2,65 @@ import time
 import logging
 import google.generativeai as genai
 from google.api_core import retry
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 import os
 from dotenv import load_dotenv
+from .rate_limiter import is_rate_limit_error
 
 # Configurar logger para que solo muestre errores
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
 
+# Instrucciones y esquema comunes al prompt de un CV y al de un lote: los
+# análisis de ambos se guardan en el mismo caché y deben ser equivalentes
+CV_INSTRUCTIONS = """INSTRUCCIONES:
+1. Extrae todas las habilidades mencionadas
+2. Infiere habilidades adicionales de la experiencia
+3. Identifica habilidades específicas del sector
+4. Evalúa nivel de experiencia
+
+HABILIDADES A IDENTIFICAR:
+- Habilidades técnicas (software, herramientas)
+- Habilidades profesionales (gestión, análisis)
+- Habilidades blandas (comunicación, trabajo en equipo)
+- Microsoft Office (Excel, Word)
+- Atención al cliente
+- Organización y planificación"""
+
+CV_SCHEMA = {
+    "nombre": "nombre del candidato",
+    "correo": "email",
+    "telefono": "teléfono",
+    "ubicacion": "ciudad",
+    "habilidades": ["habilidad1", "habilidad2"],
+    "idiomas": ["idioma1 (nivel)", "idioma2 (nivel)"],
+    "educacion": ["educación1", "educación2"],
+    "experiencia": [
+        {
+            "puesto": "cargo",
+            "empresa": "empresa",
+            "periodo": "fechas",
+            "responsabilidades": ["responsabilidad1", "responsabilidad2"]
+        }
+    ]
+}
+
+JSON_RULES = """2. Asegúrate de que el JSON esté correctamente formateado con todas las comas necesarias.
+3. Verifica que todos los corchetes y llaves estén correctamente cerrados."""
+
+
+def _json_format(schema: Any) -> str:
+    return json.dumps(schema, indent=4, ensure_ascii=False)
+
+
 class GeminiProcessor:
-    def __init__(self):
+    def __init__(self, model=None):
+        # Permite inyectar un modelo compatible (p. ej. el servidor falso de tools/)
+        if model is not None:
+            self.model = model
+            return
+
         load_dotenv()
         
         api_key = os.environ.get("GEMINI_API_KEY")
@@ -37,6 +85,14 @@ class GeminiProcessor:
             logger.error(f"Error al generar contenido con Gemini: {str(e)}")
             raise
 
+    async def _generate_async(self, prompt: str) -> str:
+        """
+        Genera contenido sin bloquear el loop; los reintentos por 429 los
+        maneja el motor de análisis asíncrono junto con el limitador de tasa
+        """
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
     def verify_api_key(self) -> bool:
         """
         Verifica si la API key de Gemini está configurada y es válida
@@ -59,6 +115,64 @@ class GeminiProcessor:
             logger.error(f"Error al verificar API key: {str(e)}")
             return False
 
+    def _build_prompt(self, cv_text: str) -> str:
+        """
+        Construye el prompt de análisis para un CV
+        """
+        return f"""
+Analiza el siguiente CV y extrae la información en formato JSON.
+
+{CV_INSTRUCTIONS}
+
+FORMATO JSON:
+{_json_format(CV_SCHEMA)}
+
+CV:
+{cv_text}
+
+IMPORTANTE:
+1. Responde SOLO con el JSON.
+{JSON_RULES}
+"""
+
+    def _parse_response(self, response_text: str) -> dict:
+        """
+        Extrae el objeto JSON de la respuesta de Gemini
+        """
+        # Intentar extraer el JSON de la respuesta
+        try:
+            # Limpiar la respuesta antes de intentar parsear el JSON
+            json_str = response_text.strip()
+
+            # Encontrar el primer '{' y el último '}'
+            start = json_str.find('{')
+            end = json_str.rfind('}') + 1
+
+            if start >= 0 and end > start:
+                json_str = json_str[start:end]
+
+                # Intentar parsear el JSON
+                try:
+                    return json.loads(json_str)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Error al decodificar JSON: {str(e)}")
+                    logger.error(f"JSON malformado: {json_str}")
+                    # Intento de recuperación básico: eliminar caracteres problemáticos
+                    json_str = json_str.replace('\n', ' ').replace('\r', '')
+                    try:
+                        return json.loads(json_str)
+                    except:
+                        logger.error("No se pudo recuperar el JSON incluso después de la limpieza")
+                        return {}
+            else:
+                logger.error("No se encontró JSON válido en la respuesta")
+                logger.error(f"Respuesta recibida: {response_text}")
+                return {}
+
+        except Exception as e:
+            logger.error(f"Error al procesar la respuesta: {str(e)}")
+            return {}
+
     def analyze_cv(self, cv_text: str) -> dict:
         """
         Analiza un CV usando Gemini y retorna la información estructurada
@@ -68,87 +182,113 @@ class GeminiProcessor:
                 logger.error("El texto del CV está vacío")
                 return {}
 
-            prompt = f"""
-            Analiza el siguiente CV y extrae la información en formato JSON.
-            
-            INSTRUCCIONES:
-            1. Extrae todas las habilidades mencionadas
-            2. Infiere habilidades adicionales de la experiencia
-            3. Identifica habilidades específicas del sector
-            4. Evalúa nivel de experiencia
-            
-            HABILIDADES A IDENTIFICAR:
-            - Habilidades técnicas (software, herramientas)
-            - Habilidades profesionales (gestión, análisis)
-            - Habilidades blandas (comunicación, trabajo en equipo)
-            - Microsoft Office (Excel, Word)
-            - Atención al cliente
-            - Organización y planificación
-            
-            FORMATO JSON:
-            {{
-                "nombre": "nombre del candidato",
-                "correo": "email",
-                "telefono": "teléfono",
-                "ubicacion": "ciudad",
-                "habilidades": ["habilidad1", "habilidad2"],
-                "idiomas": ["idioma1 (nivel)", "idioma2 (nivel)"],
-                "educacion": ["educación1", "educación2"],
-                "experiencia": [
-                    {{
-                        "puesto": "cargo",
-                        "empresa": "empresa",
-                        "periodo": "fechas",
-                        "responsabilidades": ["responsabilidad1", "responsabilidad2"]
-                    }}
-                ]
-            }}
-
-            CV:
-            {cv_text}
-
-            IMPORTANTE: 
-            1. Responde SOLO con el JSON.
-            2. Asegúrate de que el JSON esté correctamente formateado con todas las comas necesarias.
-            3. Verifica que todos los corchetes y llaves estén correctamente cerrados.
-            """
-            
+            prompt = self._build_prompt(cv_text)
             response_text = self._generate_with_retry(prompt)
-
-            # Intentar extraer el JSON de la respuesta
-            try:
-                # Limpiar la respuesta antes de intentar parsear el JSON
-                json_str = response_text.strip()
-                
-                # Encontrar el primer '{' y el último '}'
-                start = json_str.find('{')
-                end = json_str.rfind('}') + 1
-                
-                if start >= 0 and end > start:
-                    json_str = json_str[start:end]
-                    
-                    # Intentar parsear el JSON
-                    try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Error al decodificar JSON: {str(e)}")
-                        logger.error(f"JSON malformado: {json_str}")
-                        # Intento de recuperación básico: eliminar caracteres problemáticos
-                        json_str = json_str.replace('\n', ' ').replace('\r', '')
-                        try:
-                            return json.loads(json_str)
-                        except:
-                            logger.error("No se pudo recuperar el JSON incluso después de la limpieza")
-                            return {}
-                else:
-                    logger.error("No se encontró JSON válido en la respuesta")
-                    logger.error(f"Respuesta recibida: {response_text}")
-                    return {}
-                    
-            except Exception as e:
-                logger.error(f"Error al procesar la respuesta: {str(e)}")
-                return {}
+            return self._parse_response(response_text)
             
         except Exception as e:
             logger.error(f"Error al analizar CV: {str(e)}")
             return {}
+
+    async def analyze_cv_async(self, cv_text: str) -> dict:
+        """
+        Versión asíncrona de analyze_cv. Los errores 429 se propagan para que
+        el llamador pueda reintentar respetando la cuota.
+        """
+        if not cv_text or not cv_text.strip():
+            logger.error("El texto del CV está vacío")
+            return {}
+
+        prompt = self._build_prompt(cv_text)
+        try:
+            response_text = await self._generate_async(prompt)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise
+            logger.error(f"Error al analizar CV: {str(e)}")
+            return {}
+        return self._parse_response(response_text)
+
+    def _build_batch_prompt(self, items: Dict[str, str]) -> str:
+        """
+        Construye un solo prompt para varios CVs delimitados por su ID; las
+        instrucciones y el esquema de cada CV son los del prompt individual
+        """
+        cv_blocks = "\n\n".join(
+            f'<<<CV id="{cv_id}">>>\n{cv_text}\n<<<FIN CV id="{cv_id}">>>'
+            for cv_id, cv_text in items.items()
+        )
+        schema = {"id": "id del CV tal como aparece en el delimitador", **CV_SCHEMA}
+        return f"""
+Analiza cada uno de los siguientes {len(items)} CVs y extrae la información en formato JSON.
+Cada CV está delimitado por <<<CV id="...">>> y <<<FIN CV id="...">>>.
+Analiza cada CV de forma independiente; no mezcles información entre CVs.
+
+{CV_INSTRUCTIONS}
+
+FORMATO JSON (un arreglo con un objeto por CV, en el mismo orden):
+{_json_format([schema])}
+
+CVs:
+{cv_blocks}
+
+IMPORTANTE:
+1. Responde SOLO con el arreglo JSON, con exactamente {len(items)} objetos.
+{JSON_RULES}
+"""
+
+    def _parse_batch_response(self, response_text: str, expected_ids) -> Optional[Dict[str, dict]]:
+        """
+        Separa la respuesta de un lote en {id: análisis}. Retorna None si la
+        respuesta está malformada; los IDs ausentes simplemente no aparecen.
+        """
+        try:
+            json_str = response_text.strip()
+            start = json_str.find('[')
+            end = json_str.rfind(']') + 1
+            if start < 0 or end <= start:
+                logger.error("No se encontró un arreglo JSON en la respuesta del lote")
+                return None
+
+            data = json.loads(json_str[start:end])
+            if not isinstance(data, list):
+                return None
+
+            expected_ids = set(expected_ids)
+            results = {}
+            for entry in data:
+                if not isinstance(entry, dict):
+                    return None
+                cv_id = str(entry.pop('id', ''))
+                if cv_id not in expected_ids or cv_id in results:
+                    logger.error(f"ID inesperado o duplicado en la respuesta del lote: {cv_id}")
+                    return None
+                results[cv_id] = entry
+            return results
+
+        except Exception as e:
+            logger.error(f"Error al procesar la respuesta del lote: {str(e)}")
+            return None
+
+    @staticmethod
+    def _batch_ids(items: Dict[str, str]) -> Dict[str, str]:
+        """Asigna IDs cortos a los CVs del lote ({id: clave original})"""
+        return {f"cv{i}": key for i, key in enumerate(items, 1)}
+
+    async def analyze_cv_batch_async(self, items: Dict[str, str]) -> Dict[str, dict]:
+        """
+        Analiza varios CVs ({clave: texto}) en una sola solicitud. Retorna solo
+        los CVs que vinieron bien en la respuesta ({} si está malformada) para
+        que el llamador reintente el resto de forma individual. Los 429 se propagan.
+        """
+        ids = self._batch_ids(items)
+        prompt = self._build_batch_prompt({cv_id: items[key] for cv_id, key in ids.items()})
+        try:
+            response_text = await self._generate_async(prompt)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise
+            logger.error(f"Error al analizar lote de CVs: {str(e)}")
+            return {}
+        parsed = self._parse_batch_response(response_text, ids) or {}
+        return {ids[cv_id]: analysis for cv_id, analysis in parsed.items()}
@@ -532,125 +532,50 @@ def is_candidate_suitable(cv_data: dict, puesto: str) -> tuple[bool, float]:
     """
     Determina si un candidato es apto para el puesto y calcula su puntaje
     """
+    from .profile_index import get_compiled_profile, candidate_features
+
     if not cv_data or not isinstance(cv_data, dict):
         return False, 0
     
-    # Obtener perfil del puesto
-    perfil = JOB_PROFILES.get(puesto.lower(), {})
-    if not perfil:
+    # Obtener perfil compilado del puesto
+    compiled = get_compiled_profile(puesto.lower())
+    if not compiled:
         return False, 0
+    index, perfil = compiled
 
-    # Obtener y normalizar habilidades del candidato
-    habilidades = cv_data.get('habilidades', [])
-    if isinstance(habilidades, str):
-        habilidades = [habilidades]
-    
-    # Convertir a minúsculas y normalizar
-    habilidades = [h.lower().strip() for h in habilidades if isinstance(h, str)]
-    
-    # Obtener experiencia del candidato
-    experiencia = cv_data.get('experiencia', [])
-    experiencia_str = []
-    años_experiencia = 0
-    
-    if isinstance(experiencia, list):
-        for exp in experiencia:
-            if isinstance(exp, dict):
-                # Extraer años de experiencia
-                periodo = exp.get('periodo', '').lower()
-                if 'presente' in periodo or 'actual' in periodo:
-                    try:
-                        año_inicio = int(''.join(filter(str.isdigit, periodo.split('-')[0])))
-                        años_experiencia += 2024 - año_inicio
-                    except:
-                        pass
-                
-                # Agregar puesto y responsabilidades como habilidades potenciales
-                puesto_exp = exp.get('puesto', '').lower().strip()
-                if puesto_exp:
-                    experiencia_str.append(puesto_exp)
-                for resp in exp.get('responsabilidades', []):
-                    if isinstance(resp, str):
-                        experiencia_str.append(resp.lower().strip())
-    
-    # Combinar habilidades explícitas y de experiencia
-    todas_habilidades = habilidades + experiencia_str
-    
-    # Obtener habilidades requeridas y deseables
-    requeridas = [h.lower().strip() for h in perfil.get('required_skills', [])]
-    deseables = [h.lower().strip() for h in perfil.get('preferred_skills', [])]
+    # Habilidades explícitas y de experiencia, idiomas y años de experiencia
+    todas_habilidades, idiomas_candidato, años_experiencia = candidate_features(cv_data)
+
+    # Mejor coincidencia por habilidad, solo para las que comparten palabras con el candidato
+    mejores = index.best_matches(todas_habilidades)
     
     # Calcular puntaje base (50%)
     puntaje = 0
-    total_requeridas = len(requeridas) if requeridas else 1
+    total_requeridas = len(perfil.required) if perfil.required else 1
     
     # Puntaje por habilidades requeridas (50%)
-    for hab in requeridas:
-        # Buscar coincidencias parciales
-        palabras_hab = set(hab.split())
-        mejor_coincidencia = 0
-        
-        for h in todas_habilidades:
-            palabras_h = set(h.split())
-            # Calcular porcentaje de coincidencia
-            if palabras_hab:
-                # Buscar coincidencias por palabras individuales
-                coincidencia = len(palabras_hab & palabras_h) / len(palabras_hab)
-                mejor_coincidencia = max(mejor_coincidencia, coincidencia)
-                
-                # Buscar coincidencias por subcadenas
-                if any(p in h for p in palabras_hab):
-                    mejor_coincidencia = max(mejor_coincidencia, 0.75)
-        
-        # Asignar puntaje proporcional a la mejor coincidencia
-        puntaje += (50 / total_requeridas) * mejor_coincidencia
+    for hab in perfil.required:
+        puntaje += (50 / total_requeridas) * mejores.get(hab, 0)
     
     # Puntaje por habilidades deseables (30%)
-    if deseables:
-        for hab in deseables:
-            palabras_hab = set(hab.split())
-            mejor_coincidencia = 0
-            
-            for h in todas_habilidades:
-                palabras_h = set(h.split())
-                if palabras_hab:
-                    # Buscar coincidencias por palabras individuales
-                    coincidencia = len(palabras_hab & palabras_h) / len(palabras_hab)
-                    mejor_coincidencia = max(mejor_coincidencia, coincidencia)
-                    
-                    # Buscar coincidencias por subcadenas
-                    if any(p in h for p in palabras_hab):
-                        mejor_coincidencia = max(mejor_coincidencia, 0.75)
-            
-            puntaje += (30 / len(deseables)) * mejor_coincidencia
-    
-    # Puntaje por idiomas (10%)
-    idiomas_candidato = []
-    idiomas = cv_data.get('idiomas', [])
-    if isinstance(idiomas, list):
-        for idioma in idiomas:
-            if isinstance(idioma, str):
-                idiomas_candidato.append(idioma.lower())
-            elif isinstance(idioma, dict):
-                idiomas_candidato.append(idioma.get('idioma', '').lower())
-    
-    idiomas_requeridos = [i.lower() for i in perfil.get('required_languages', [])]
-    idiomas_deseables = [i.lower() for i in perfil.get('preferred_languages', [])]
+    if perfil.preferred:
+        for hab in perfil.preferred:
+            puntaje += (30 / len(perfil.preferred)) * mejores.get(hab, 0)
     
     # Verificar idiomas requeridos (7%)
-    if idiomas_requeridos:
-        for idioma in idiomas_requeridos:
+    if perfil.required_languages:
+        for idioma in perfil.required_languages:
             if any(idioma in i for i in idiomas_candidato):
-                puntaje += 7 / len(idiomas_requeridos)
+                puntaje += 7 / len(perfil.required_languages)
     
     # Verificar idiomas deseables (3%)
-    if idiomas_deseables:
-        for idioma in idiomas_deseables:
+    if perfil.preferred_languages:
+        for idioma in perfil.preferred_languages:
             if any(idioma in i for i in idiomas_candidato):
-                puntaje += 3 / len(idiomas_deseables)
+                puntaje += 3 / len(perfil.preferred_languages)
     
     # Bonus por experiencia (hasta 10% extra)
-    años_minimos = perfil.get('min_experience_years', 2)
+    años_minimos = perfil.min_experience_years
     if años_experiencia >= años_minimos:
         # Dar bonus proporcional a los años de experiencia extra
         bonus = min(10, (años_experiencia - años_minimos + 1) * 2.5)
@@ -664,5 +589,4 @@ def is_candidate_suitable(cv_data: dict, puesto: str) -> tuple[bool, float]:
     puntaje = round(puntaje, 1)
     
     # Determinar si es apto (más flexible)
-    min_score = perfil.get('min_score', 40)  # Bajamos el mínimo predeterminado a 40
-    return puntaje >= min_score, puntaje
+    return puntaje >= perfil.min_score, puntaje
@@ -0,0 +1,93 @@
+"""
+Autómata de Aho-Corasick para buscar muchas keywords en una sola pasada
+sobre el texto, con coincidencias solo en límites de palabra y sus posiciones.
+
+El autómata recorre tokens (palabras y signos sueltos) en lugar de
+caracteres: el texto se tokeniza con una sola expresión regular y una
+keyword solo puede coincidir con palabras completas. Las posiciones de las
+coincidencias son índices de tokens.
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+# Palabras (letras, dígitos y _), signos sueltos ("c++" -> c, +, +) y saltos de
+# línea, que cortan las coincidencias igual que en el texto original
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]|\n')
+
+
+class KeywordMatch(NamedTuple):
+    start: int  # Primer token de la coincidencia
+    end: int  # Token siguiente al último
+    term: str  # Término tal como se registró
+    payload: Any
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text)
+
+
+class KeywordAutomaton:
+    """
+    Compila términos (en minúsculas) en un trie de tokens con enlaces de
+    falla, completado como autómata determinista: la búsqueda hace una
+    consulta por token sin importar cuántos términos haya.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        # Nodo = índice; transiciones, enlace de falla y salidas por nodo
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str, Any]]] = [[]]
+
+        for term, payload in entries:
+            tokens = tokenize(term.lower())
+            if not tokens:
+                continue
+            node = 0
+            for token in tokens:
+                next_node = goto[node].get(token)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][token] = next_node
+                    goto.append({})
+                    fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append((len(tokens), term, payload))
+
+        # Enlaces de falla por anchura; cada nodo hereda las salidas y las
+        # transiciones de su falla
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            self._delta[node] = {**self._delta[fail[node]], **goto[node]}
+            for token, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(token, 0)
+                fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[fail[child]]
+
+    def find_tokens(self, tokens: List[str]) -> List[KeywordMatch]:
+        """
+        Coincidencias de todos los términos en una lista de tokens en
+        minúsculas, en el orden en que terminan
+        """
+        delta, output = self._delta, self._output
+        matches = []
+        node = 0
+        for end, token in enumerate(tokens, 1):
+            node = delta[node].get(token, 0)
+            if output[node]:
+                for size, term, payload in output[node]:
+                    matches.append(KeywordMatch(end - size, end, term, payload))
+        return matches
+
+    def find(self, text: str) -> List[KeywordMatch]:
+        """Coincidencias de todos los términos en un texto"""
+        return self.find_tokens(tokenize(text.lower()))
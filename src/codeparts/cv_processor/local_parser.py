@@ -0,0 +1,339 @@
+"""
+Parser local y determinista de CVs: extrae con reglas el mismo esquema JSON
+que Gemini (nombre, correo, telefono, ubicacion, habilidades, idiomas,
+educacion, experiencia) a partir de los vocabularios de system/keywords.py,
+los analizadores de analyzers.py y TextProcessor, junto con una confianza
+de 0 a 1. Solo los CVs por debajo del umbral se envían a Gemini.
+"""
+
+import re
+import logging
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from system.config import CV_PROCESSOR_CONFIG
+
+from .analyzers import analyze_certifications, analyze_professional_keywords, analyze_soft_skills
+from .text_processor import TextProcessor
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE_PATTERN = re.compile(r'(?<!\d)\+?\d[\d\s().-]{8,18}\d(?!\d)')
+PHONE_LABEL = re.compile(r'\b(?:tel|teléfono|telefono|cel|celular|móvil|movil|whatsapp)\b', re.IGNORECASE)
+LOCATION_PATTERN = re.compile(r'^(?:ubicación|ubicacion|ciudad|residencia|domicilio|dirección|direccion)\s*:\s*(.+)$',
+                              re.IGNORECASE)
+LABEL_PATTERN = re.compile(r'^[\w\sáéíóúñ]{2,25}:')
+BULLET_PATTERN = re.compile(r'^[\s•·\-*–—▪►●○◦]+')
+ITEM_SEPARATORS = re.compile(r'\s*[,;•|·▪]\s*')
+MONTH = r'(?:[a-záéíóú]{3,10}\.?\s+(?:de\s+)?)?(?:\d{1,2}/)?'
+PERIOD_PATTERN = re.compile(
+    r'\(?\s*' + MONTH + r'(\d{4})\s*(?:-|–|—|\ba\b|\bal\b|\bhasta\b)\s*(?:' + MONTH +
+    r'(\d{4})|(presente|actual(?:idad|mente)?|la\s+fecha))\s*\)?',
+    re.IGNORECASE
+)
+ROLE_SEPARATOR = re.compile(r'\s+(?:en|@|-|–|—|\|)\s+|\s*,\s*')
+DEGREE_PATTERN = re.compile(
+    r'\b(?:licenciatura|licenciado|licenciada|ingeniería|ingeniero|maestría|doctorado|técnico|'
+    r'bachillerato|preparatoria|universidad|diplomado|carrera)\b',
+    re.IGNORECASE
+)
+NAME_WORD = re.compile(r"^[A-Za-zÁÉÍÓÚÑÜáéíóúñü'.]+$")
+
+# Peso de cada señal en la confianza
+CONFIDENCE_WEIGHTS = {
+    "nombre": 0.25,
+    "contacto": 0.15,
+    "habilidades": 0.3,
+    "cobertura": 0.3
+}
+# Habilidades explícitas a partir de las cuales la señal vale 1
+MIN_EXPLICIT_SKILLS = 3
+
+
+def _fold(text: str) -> str:
+    """Minúsculas y sin acentos, para comparar encabezados e idiomas"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def _strip_bullet(line: str) -> Tuple[str, bool]:
+    stripped = BULLET_PATTERN.sub('', line)
+    return stripped.strip(), stripped != line
+
+
+@dataclass
+class LocalParseResult:
+    """Resultado del parser local"""
+    cv_data: Dict = field(default_factory=dict)
+    confidence: float = 0.0
+    missing: List[str] = field(default_factory=list)  # Campos que no se encontraron
+
+
+class LocalCVParser:
+    """
+    Divide el texto en secciones por sus encabezados (CV_SECTIONS), toma los
+    datos de contacto con expresiones regulares y completa las habilidades con
+    las keywords, habilidades blandas y certificaciones que aparecen en el texto.
+    """
+
+    def __init__(self):
+        keywords = CV_PROCESSOR_CONFIG["keywords"]
+        self.text_processor = TextProcessor()
+        self.titles = {_fold(title) for title in CV_PROCESSOR_CONFIG["titles"]}
+        self.common_names = {_fold(name) for name in CV_PROCESSOR_CONFIG["common_names"]}
+        self.languages = {_fold(lang): lang for lang in keywords["languages"]["idiomas"]}
+        self.levels = {_fold(level): level for level in keywords["languages"]["niveles"]}
+
+        # Encabezado sin acentos -> sección; los más largos primero
+        headers = {_fold(term): section for section, terms in keywords["sections"].items() for term in terms}
+        self.headers = sorted(headers.items(), key=lambda item: -len(item[0]))
+
+    def _match_header(self, line: str) -> Optional[Tuple[str, str]]:
+        """
+        (sección, contenido en la misma línea) si la línea es un encabezado,
+        por ejemplo "Habilidades" o "Idiomas: inglés avanzado"
+        """
+        text, _ = _strip_bullet(line)
+        head, sep, rest = text.partition(':')
+        folded = _fold(head).strip()
+        if not folded or len(folded.split()) > 4:
+            return None
+        # Sin dos puntos solo cuenta el encabezado exacto o escrito en mayúsculas
+        prefix_allowed = bool(sep) or head.isupper()
+        for term, section in self.headers:
+            if folded == term or (prefix_allowed and folded.startswith(term + ' ')):
+                return section, rest.strip()
+        return None
+
+    def _split_sections(self, lines: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Líneas antes del primer encabezado y líneas de cada sección"""
+        head: List[str] = []
+        sections: Dict[str, List[str]] = {}
+        current = None
+        for line in lines:
+            header = self._match_header(line)
+            if header:
+                current, rest = header
+                sections.setdefault(current, [])
+                if rest:
+                    sections[current].append(rest)
+            elif current is None:
+                head.append(line)
+            else:
+                sections[current].append(line)
+        return head, sections
+
+    def _parse_name(self, lines: List[str]) -> Tuple[Optional[str], float]:
+        """Primera línea con forma de nombre propio, sin títulos, y su confianza"""
+        for line in lines[:6]:
+            words = [w for w in line.replace(',', ' ').split() if _fold(w).rstrip('.') not in self.titles]
+            if not 2 <= len(words) <= 6 or not all(NAME_WORD.match(w) for w in words):
+                continue
+            if not all(w[0].isupper() or w.lower() in ('de', 'del', 'la', 'las', 'los', 'y') for w in words):
+                continue
+            name = ' '.join(words)
+            if name.isupper():
+                name = name.title()
+            known = any(_fold(w) in self.common_names for w in words)
+            return name, 1.0 if known else 0.8
+        return None, 0.0
+
+    @staticmethod
+    def _parse_phone(lines: List[str]) -> Optional[str]:
+        """Teléfono de 10 a 13 dígitos; se prefieren las líneas con etiqueta"""
+        found = None
+        for line in lines:
+            for match in PHONE_PATTERN.finditer(line):
+                digits = re.sub(r'\D', '', match.group())
+                if 10 <= len(digits) <= 13 and not PERIOD_PATTERN.search(match.group()):
+                    if PHONE_LABEL.search(line):
+                        return match.group().strip()
+                    found = found or match.group().strip()
+        return found
+
+    @staticmethod
+    def _split_items(lines: List[str]) -> List[str]:
+        """Elementos de una sección de lista (viñetas, comas o punto y coma)"""
+        items = []
+        for line in lines:
+            text, _ = _strip_bullet(line)
+            for item in ITEM_SEPARATORS.split(text):
+                item = item.strip(' .')
+                if item and len(item.split()) <= 8:
+                    items.append(item)
+        return items
+
+    def _inferred_skills(self, text: str) -> List[str]:
+        """
+        Keywords profesionales, habilidades blandas y certificaciones que
+        aparecen en el texto como palabras completas
+        """
+        terms = []
+        for subareas in analyze_professional_keywords(text).values():
+            for matches in subareas.values():
+                terms.extend(matches)
+        terms.extend(analyze_soft_skills(text))
+        for certs in analyze_certifications(text).values():
+            terms.extend(certs)
+        terms.extend(skill.replace('_', ' ') for skill in self.text_processor.extract_all(text).soft_skills)
+        return list(dict.fromkeys(terms))
+
+    def _parse_languages(self, lines: List[str]) -> List[str]:
+        """
+        "Idioma (nivel)" por cada idioma mencionado; el nivel se toma del
+        mismo elemento de la lista y se compara sin acentos ("ingles avanzado")
+        """
+        languages: Dict[str, str] = {}
+        for line in lines:
+            for item in ITEM_SEPARATORS.split(_strip_bullet(line)[0]):
+                words = re.findall(r'\w+', _fold(item))
+                level = next((self.levels[w] for w in words if w in self.levels), None)
+                for word in words:
+                    if word in self.languages and word not in languages:
+                        name = self.languages[word].capitalize()
+                        languages[word] = f"{name} ({level})" if level else name
+        return list(languages.values())
+
+    @staticmethod
+    def _parse_period(match: re.Match) -> str:
+        """Periodo normalizado a "inicio - fin" en años (o "presente")"""
+        end = match.group(2) or 'presente'
+        return f"{match.group(1)} - {end}"
+
+    @staticmethod
+    def _split_role(parts: List[str]) -> Tuple[str, str]:
+        """Puesto y empresa de un encabezado de experiencia"""
+        parts = [p.strip(' -–—|,.:()') for p in parts if p.strip(' -–—|,.:()')]
+        if not parts:
+            return '', ''
+        if len(parts) >= 2:
+            return parts[0], parts[1]
+        role = ROLE_SEPARATOR.split(parts[0], maxsplit=1)
+        return role[0].strip(), (role[1].strip(' -–—|,.:()') if len(role) > 1 else '')
+
+    @staticmethod
+    def _precedes_period(lines: List[str], i: int, lookahead: int = 2) -> bool:
+        """Indica si una de las siguientes líneas (sin viñeta) trae un periodo"""
+        for line in lines[i + 1:i + 1 + lookahead]:
+            text, bullet = _strip_bullet(line)
+            if bullet:
+                return False
+            if PERIOD_PATTERN.search(text):
+                return True
+        return False
+
+    def _parse_experience(self, lines: List[str]) -> List[dict]:
+        """
+        Una entrada por cada línea con periodo; las líneas sin periodo que la
+        preceden son su puesto/empresa y las siguientes, sus responsabilidades
+        """
+        entries = []
+        pending: List[str] = []
+        for i, line in enumerate(lines):
+            text, bullet = _strip_bullet(line)
+            match = None if bullet else PERIOD_PATTERN.search(text)
+            if match:
+                rest = (text[:match.start()] + ' ' + text[match.end():]).strip()
+                puesto, empresa = self._split_role(pending + ([rest] if rest else []))
+                entries.append({
+                    "puesto": puesto,
+                    "empresa": empresa,
+                    "periodo": self._parse_period(match),
+                    "responsabilidades": []
+                })
+                pending = []
+                continue
+            if entries and not pending and (bullet or not self._precedes_period(lines, i)):
+                entries[-1]["responsabilidades"].append(text.rstrip('.'))
+            else:
+                pending.append(text)
+        return entries
+
+    def parse(self, text: str) -> LocalParseResult:
+        """Analiza el texto de un CV y calcula la confianza del resultado"""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines:
+            return LocalParseResult(missing=["nombre", "correo", "telefono", "habilidades"])
+
+        head, sections = self._split_sections(lines)
+        recognized = sum(1 for line in lines if self._match_header(line))
+
+        correo = next((m.group() for m in map(EMAIL_PATTERN.search, lines) if m), None)
+        telefono = self._parse_phone(head or lines)
+        ubicacion = next((m.group(1).strip() for m in map(LOCATION_PATTERN.match, head) if m), None)
+        nombre, name_score = self._parse_name([line for line in head
+                                                if not EMAIL_PATTERN.search(line) and not LABEL_PATTERN.match(line)])
+
+        # Líneas del encabezado que se reconocieron (nombre, contacto, etiquetas)
+        for line in head:
+            if (EMAIL_PATTERN.search(line) or LABEL_PATTERN.match(line) or
+                    (telefono and telefono in line) or (nombre and line.endswith(nombre.split()[-1]))):
+                recognized += 1
+
+        explicit = self._split_items(sections.get("habilidades", []))
+        seen = [_fold(item) for item in explicit]
+        habilidades = list(explicit)
+        for term in self._inferred_skills(text):
+            folded = _fold(term)
+            if not any(folded in item for item in seen):
+                habilidades.append(term)
+                seen.append(folded)
+
+        idiomas = self._parse_languages(sections.get("idiomas") or lines)
+        educacion = [_strip_bullet(line)[0] for line in sections.get("educacion", [])]
+        if not educacion:
+            educacion = [line for line in lines if DEGREE_PATTERN.search(line)][:5]
+        experiencia = self._parse_experience(sections.get("experiencia", []))
+        recognized += sum(len(section_lines) for section_lines in sections.values())
+
+        cv_data = {
+            "nombre": nombre,
+            "correo": correo,
+            "telefono": telefono,
+            "ubicacion": ubicacion,
+            "habilidades": habilidades,
+            "idiomas": idiomas,
+            "educacion": educacion,
+            "experiencia": experiencia
+        }
+        missing = [name for name, value in cv_data.items() if not value]
+
+        # Confianza: nombre, contacto, habilidades explícitas y líneas reconocidas
+        coverage = min(1.0, recognized / len(lines))
+        if sections.get("experiencia") and not experiencia:
+            coverage *= 0.5  # Hay experiencia, pero no se pudo estructurar
+        skills_score = min(1.0, len(explicit) / MIN_EXPLICIT_SKILLS) if explicit else (0.3 if habilidades else 0.0)
+        signals = {
+            "nombre": name_score,
+            "contacto": (0.5 if correo else 0.0) + (0.5 if telefono else 0.0),
+            "habilidades": skills_score,
+            "cobertura": coverage
+        }
+        confidence = sum(CONFIDENCE_WEIGHTS[name] * value for name, value in signals.items())
+        if not nombre or not habilidades:
+            # Sin los campos requeridos el resultado no se puede usar tal cual
+            confidence = min(confidence, 0.5)
+        return LocalParseResult(cv_data=cv_data, confidence=round(confidence, 3), missing=missing)
+
+
+_parser: Optional[LocalCVParser] = None
+
+
+def get_local_parser() -> LocalCVParser:
+    """Parser compartido por el proceso, creado la primera vez que se usa"""
+    global _parser
+    if _parser is None:
+        _parser = LocalCVParser()
+    return _parser
+
+
+def parse_cv_text(text: str) -> LocalParseResult:
+    """Analiza un CV con el parser local compartido"""
+    try:
+        return get_local_parser().parse(text)
+    except Exception as e:
+        logger.error(f"Error en el parser local: {str(e)}")
+        return LocalParseResult()
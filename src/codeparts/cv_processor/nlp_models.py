@@ -0,0 +1,58 @@
+"""
+Registro de modelos de spaCy compartido por todo el proceso: cada modelo se
+carga una sola vez, la primera vez que se necesita, sin los componentes que
+no se usan
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from system.config import CV_PROCESSOR_CONFIG
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+_models: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_lock = threading.Lock()
+
+
+def get_nlp(model_name: Optional[str] = None, exclude: Optional[List[str]] = None):
+    """
+    Retorna el modelo `model_name` (por defecto CV_PROCESSOR_CONFIG["nlp_model"]),
+    cargándolo solo la primera vez
+    """
+    model_name = model_name or CV_PROCESSOR_CONFIG["nlp_model"]
+    exclude = tuple(CV_PROCESSOR_CONFIG["nlp"]["exclude"] if exclude is None else exclude)
+    key = (model_name, exclude)
+
+    nlp = _models.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _models.get(key)
+            if nlp is None:
+                import spacy
+                nlp = spacy.load(model_name, exclude=list(exclude))
+                _models[key] = nlp
+    return nlp
+
+
+def is_loaded(model_name: Optional[str] = None) -> bool:
+    """Indica si el modelo ya se cargó en este proceso"""
+    model_name = model_name or CV_PROCESSOR_CONFIG["nlp_model"]
+    return any(name == model_name for name, _ in _models)
+
+
+def pipe(texts: Iterable[str], model_name: Optional[str] = None, batch_size: Optional[int] = None,
+         n_process: Optional[int] = None) -> Iterator:
+    """
+    Procesa varios textos en streaming con nlp.pipe, por lotes y opcionalmente
+    en varios procesos; los Doc salen en el mismo orden que los textos
+    """
+    config = CV_PROCESSOR_CONFIG["nlp"]
+    nlp = get_nlp(model_name)
+    return nlp.pipe(
+        texts,
+        batch_size=batch_size or config["batch_size"],
+        n_process=n_process or config["n_process"]
+    )
@@ -0,0 +1,63 @@
+"""
+Backends de extracción de texto de PDFs para el procesador de CVs
+"""
+
+import logging
+from typing import Iterator, List, Optional
+from system.config import CV_PROCESSOR_CONFIG, VALIDATION_RULES
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+
+def _pages_pymupdf(pdf_path: str, max_pages: int) -> Iterator[str]:
+    import fitz
+    with fitz.open(pdf_path) as document:
+        for page_number in range(min(max_pages, document.page_count)):
+            yield document.load_page(page_number).get_text()
+
+
+def _pages_pypdf2(pdf_path: str, max_pages: int) -> Iterator[str]:
+    import PyPDF2
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages[:max_pages]:
+            yield page.extract_text() or ""
+
+
+def _pages_pdfplumber(pdf_path: str, max_pages: int) -> Iterator[str]:
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as document:
+        for page in document.pages[:max_pages]:
+            yield page.extract_text() or ""
+
+
+# Backends disponibles, del más rápido al más lento
+EXTRACTION_BACKENDS = {
+    'pymupdf': _pages_pymupdf,
+    'pypdf2': _pages_pypdf2,
+    'pdfplumber': _pages_pdfplumber
+}
+
+
+def extract_text(pdf_path: str, backends: Optional[List[str]] = None, max_pages: Optional[int] = None) -> str:
+    """
+    Extrae el texto de un PDF con el primer backend disponible que entregue
+    texto, leyendo como máximo `max_pages` páginas
+    """
+    backends = backends or CV_PROCESSOR_CONFIG["pdf_backends"]
+    max_pages = max_pages or VALIDATION_RULES['pdf']['max_pages']
+
+    for backend in backends:
+        pages = EXTRACTION_BACKENDS[backend]
+        try:
+            text = "\n".join(pages(pdf_path, max_pages))
+        except ImportError:
+            continue
+        except Exception as e:
+            logger.error(f"Error al procesar {pdf_path} con {backend}: {str(e)}")
+            continue
+        if text.strip():
+            return text
+    return ""
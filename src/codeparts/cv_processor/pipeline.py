@@ -0,0 +1,275 @@
+"""
+Pipeline de dos etapas para el procesamiento de CVs:
+extracción en un pool de procesos y análisis con Gemini en asyncio
+"""
+
+import os
+import math
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from system.config import CV_PROCESSOR_CONFIG
+
+from .async_engine import AnalysisEngine, run_coroutine
+from .local_parser import LocalParseResult, parse_cv_text
+from .prescreen import PreScreen
+from .pdf_extractors import extract_text
+from .rate_limiter import estimate_tokens
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+# Tiempo máximo de espera para completar un lote con CVs que siguen llegando
+BATCH_LINGER_SECONDS = 0.5
+
+
+def normalize_cv_text(text: str) -> str:
+    """
+    Normaliza el texto extraído: espacios colapsados y sin líneas vacías
+    """
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def prepare_cv(pdf_path: str, backends: Optional[List[str]] = None) -> str:
+    """
+    Trabajo de la etapa de extracción (se ejecuta en otro proceso)
+    """
+    return normalize_cv_text(extract_text(pdf_path, backends))
+
+
+def prepare_and_parse(pdf_path: str, backends: Optional[List[str]] = None) -> Tuple[str, Optional[LocalParseResult]]:
+    """
+    Extracción más el parser local, ambos en el proceso de extracción
+    """
+    cv_text = prepare_cv(pdf_path, backends)
+    return cv_text, (parse_cv_text(cv_text) if cv_text else None)
+
+
+@dataclass
+class StageStats:
+    """Contadores de throughput de una etapa del pipeline"""
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+    def record(self, ok: bool = True) -> None:
+        if ok:
+            self.processed += 1
+        else:
+            self.failed += 1
+        self.finished_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """CVs por segundo desde el inicio de la etapa"""
+        return (self.processed + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.name}: {self.processed} CVs ({self.failed} con error) en {self.elapsed:0.1f} s, "
+                f"{self.throughput:0.2f} CVs/s con {self.workers} trabajadores")
+
+
+@dataclass
+class PipelineStats:
+    extraction: StageStats
+    analysis: StageStats
+    local: Optional[StageStats] = None
+    escalated: int = 0  # CVs que el parser local envió a Gemini
+    skipped: int = 0  # CVs descartados por el pre-filtro
+    skipped_escalations: int = 0  # De ellos, los que habrían ido a Gemini
+    batch_size: int = 1  # CVs por solicitud a Gemini, para estimar las solicitudes evitadas
+
+    @property
+    def calls_saved(self) -> int:
+        """Solicitudes a Gemini estimadas que el pre-filtro evitó"""
+        return math.ceil(self.skipped_escalations / max(1, self.batch_size))
+
+    def summary(self) -> str:
+        lines = [self.extraction.summary()]
+        if self.skipped:
+            lines.append(f"Pre-filtro: {self.skipped} CVs descartados sin analizar "
+                         f"({self.skipped_escalations} iban a Gemini, ~{self.calls_saved} solicitudes evitadas)")
+        if self.local:
+            lines.append(f"{self.local.name}: {self.local.processed} CVs resueltos sin Gemini, "
+                         f"{self.escalated} enviados a Gemini")
+        if self.analysis.processed or self.analysis.failed:
+            lines.append(self.analysis.summary())
+        return "\n".join(lines)
+
+
+class CVPipeline:
+    """
+    Etapa 1: un ProcessPoolExecutor extrae y normaliza el texto de los PDFs.
+    Si el parser local está activo, se ejecuta junto a la extracción y los CVs
+    con confianza suficiente se entregan sin pasar por Gemini.
+    Etapa 2: trabajadores asyncio envían los textos a Gemini con AnalysisEngine.
+    Una cola acotada entre ambas etapas detiene la extracción cuando el
+    análisis (limitado por la cuota) se queda atrás.
+    """
+
+    def __init__(self, gemini_processor, extraction_workers: Optional[int] = None,
+                 analysis_workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 latency_observer: Optional[Callable[[float], None]] = None,
+                 use_local_parser: Optional[bool] = None, confidence_threshold: Optional[float] = None,
+                 escalate: bool = True, prescreen: Optional[PreScreen] = None):
+        workers = CV_PROCESSOR_CONFIG["max_workers"]
+        local = CV_PROCESSOR_CONFIG["local_parser"]
+        self.use_local_parser = local["enabled"] if use_local_parser is None else use_local_parser
+        self.confidence_threshold = (local["confidence_threshold"] if confidence_threshold is None
+                                     else confidence_threshold)
+        # Sin escalar (modo sin conexión) se acepta el resultado local con cualquier confianza
+        self.escalate = escalate
+        self.prescreen = prescreen
+        self.extraction_workers = extraction_workers or workers["extraction"] or os.cpu_count() or 1
+        self.analysis_workers = analysis_workers or workers["analysis"]
+        self.queue_size = queue_size or CV_PROCESSOR_CONFIG["queue_size"]
+        self.engine = AnalysisEngine(gemini_processor, max_concurrency=self.analysis_workers,
+                                     latency_observer=latency_observer)
+        self.stats = PipelineStats(
+            extraction=StageStats("Extracción", self.extraction_workers),
+            analysis=StageStats("Análisis", self.analysis_workers),
+            local=StageStats("Parser local", self.extraction_workers) if self.use_local_parser else None,
+            batch_size=self.engine.batch_size
+        )
+
+    def run(self, pdf_paths: Dict[str, str],
+            on_extracted: Optional[Callable[[str, str], None]] = None,
+            on_result: Optional[Callable[[str, str, dict], None]] = None,
+            on_local: Optional[Callable[[str, str, LocalParseResult], None]] = None,
+            on_skipped: Optional[Callable[[str], None]] = None) -> PipelineStats:
+        """
+        Procesa {clave: ruta del PDF}. `on_extracted(clave, texto)` se invoca al
+        terminar la extracción y `on_result(clave, texto, análisis)` al terminar
+        el análisis; un texto vacío o un análisis {} indican que el CV falló.
+        Los CVs que resuelve el parser local se entregan con
+        `on_local(clave, texto, resultado)` y los que descarta el pre-filtro,
+        con `on_skipped(clave)`.
+        """
+        return run_coroutine(self._run(pdf_paths, on_extracted, on_result, on_local, on_skipped))
+
+    def _accepts(self, parsed: Optional[LocalParseResult]) -> bool:
+        """Indica si el resultado local se usa en lugar de consultar a Gemini"""
+        if parsed is None or not parsed.cv_data:
+            return False
+        return not self.escalate or parsed.confidence >= self.confidence_threshold
+
+    async def _run(self, pdf_paths, on_extracted, on_result, on_local, on_skipped) -> PipelineStats:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def extract_stage():
+            loop = asyncio.get_running_loop()
+            # Máximo de extracciones en vuelo: mantiene ocupados a los procesos sin adelantarse a la cola
+            in_flight = asyncio.Semaphore(self.extraction_workers * 2)
+            with ProcessPoolExecutor(max_workers=self.extraction_workers) as pool:
+
+                async def extract_one(key: str, pdf_path: str):
+                    try:
+                        parsed = None
+                        try:
+                            if self.use_local_parser:
+                                cv_text, parsed = await loop.run_in_executor(pool, prepare_and_parse, pdf_path)
+                            else:
+                                cv_text = await loop.run_in_executor(pool, prepare_cv, pdf_path)
+                        except Exception as e:
+                            logger.error(f"Error al extraer {os.path.basename(pdf_path)}: {str(e)}")
+                            cv_text = ""
+                        self.stats.extraction.record(bool(cv_text))
+                        if on_extracted:
+                            on_extracted(key, cv_text)
+                        if cv_text and self.prescreen and not self.prescreen.passes(cv_text):
+                            # No puede alcanzar el puntaje mínimo: no se analiza
+                            self.stats.skipped += 1
+                            if self.escalate and not self._accepts(parsed):
+                                self.stats.skipped_escalations += 1
+                            if on_skipped:
+                                on_skipped(key)
+                        elif cv_text and self._accepts(parsed):
+                            self.stats.local.record()
+                            if on_local:
+                                on_local(key, cv_text, parsed)
+                        elif cv_text and not self.escalate:
+                            # Sin Gemini no hay a quién enviar el CV
+                            if on_result:
+                                on_result(key, cv_text, {})
+                        elif cv_text:
+                            if parsed is not None:
+                                self.stats.escalated += 1
+                            # Se bloquea mientras la cola esté llena (backpressure)
+                            await queue.put((key, cv_text))
+                    finally:
+                        in_flight.release()
+
+                self.stats.extraction.start()
+                if self.stats.local:
+                    self.stats.local.start()
+                tasks = []
+                for key, pdf_path in pdf_paths.items():
+                    await in_flight.acquire()
+                    tasks.append(asyncio.create_task(extract_one(key, pdf_path)))
+                await asyncio.gather(*tasks)
+
+            for _ in range(self.analysis_workers):
+                await queue.put(None)
+
+        async def analysis_worker():
+            loop = asyncio.get_running_loop()
+            carry = None
+            finished = False
+            while not finished or carry:
+                # Armar un lote que respete el tamaño y el presupuesto de tokens
+                if carry:
+                    batch, carry = [carry], None
+                else:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    batch = [item]
+                tokens = sum(estimate_tokens(cv_text) for _, cv_text in batch)
+                deadline = loop.time() + BATCH_LINGER_SECONDS
+                while not finished and len(batch) < self.engine.batch_size:
+                    # Esperar el siguiente CV solo lo que queda de la ventana del lote
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        finished = True
+                        break
+                    tokens += estimate_tokens(item[1])
+                    if tokens > self.engine.batch_token_budget:
+                        # No cabe en este lote; pasa al siguiente
+                        carry = item
+                        break
+                    batch.append(item)
+
+                self.stats.analysis.start()
+                analyses = await self.engine.analyze_batch(dict(batch))
+                for key, cv_text in batch:
+                    analysis = analyses.get(key) or {}
+                    self.stats.analysis.record(bool(analysis))
+                    if on_result:
+                        on_result(key, cv_text, analysis)
+
+        await asyncio.gather(extract_stage(), *(analysis_worker() for _ in range(self.analysis_workers)))
+        return self.stats
@@ -0,0 +1,143 @@
+"""
+Pre-filtro de CVs antes del análisis: cota superior del puntaje de
+`is_candidate_suitable` calculada sobre el texto extraído contra el perfil
+compilado. Un CV cuya cota no alcanza el piso del puesto (su `min_score`, o
+el puntaje mínimo del ranking si es menor) no puede aparecer en los
+resultados aunque el análisis fuera perfecto, así que no se envía a Gemini.
+"""
+
+import re
+import logging
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .profile_index import CompiledProfile, ProfileIndex, get_compiled_profile
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+
+def _fold(text: str) -> str:
+    """Minúsculas y sin acentos: Gemini puede normalizar la ortografía del CV"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def skill_upper_bound(words: FrozenSet[str], present: FrozenSet[str]) -> float:
+    """
+    Mejor coincidencia posible de una habilidad si sus palabras presentes en
+    el texto llegaran todas a una misma frase: fracción de palabras en común,
+    o 0.75 si alguna es subcadena
+    """
+    found = len(words & present)
+    if not found:
+        return 0.0
+    return max(0.75, found / len(words))
+
+
+def profile_upper_bound(index: ProfileIndex, compiled: CompiledProfile, present: FrozenSet[str]) -> float:
+    """
+    Cota superior del puntaje de un perfil, con el mismo orden de cálculo que
+    `is_candidate_suitable`. Idiomas y experiencia se suponen al máximo
+    porque Gemini los puede inferir aunque el texto no los mencione.
+    """
+    puntaje = 0.0
+    total_requeridas = len(compiled.required) if compiled.required else 1
+    for skill_id in compiled.required:
+        puntaje += (50 / total_requeridas) * skill_upper_bound(index.skill_words[skill_id], present)
+    for skill_id in compiled.preferred:
+        puntaje += (30 / len(compiled.preferred)) * skill_upper_bound(index.skill_words[skill_id], present)
+    if compiled.required_languages:
+        puntaje += 7
+    if compiled.preferred_languages:
+        puntaje += 3
+
+    # Bonus máximo por experiencia y por coincidencias parciales
+    puntaje = min(100, puntaje + 10)
+    if puntaje >= 40:
+        puntaje = min(100, puntaje + 10)
+    return puntaje
+
+
+class PreScreen:
+    """
+    Pre-filtro para uno o varios puestos: un CV pasa si su cota alcanza el
+    piso de alguno de ellos (menos un margen de seguridad). El piso es el
+    `min_score` del puesto o `floor` si es menor, para no descartar CVs que
+    el ranking sí mostraría
+    """
+
+    def __init__(self, puestos: List[str], margin: float = 0.0, floor: Optional[float] = None):
+        self.margin = margin
+        self.floor = floor
+        self.profiles: List[Tuple[ProfileIndex, CompiledProfile]] = []
+        for puesto in puestos:
+            compiled = get_compiled_profile(puesto.lower())
+            if compiled is None:
+                raise ValueError(f"Puesto no válido: {puesto}")
+            self.profiles.append(compiled)
+
+        # Palabras de las habilidades sin acentos; cada palabra del texto que
+        # contenga una de ellas como subcadena la marca como presente
+        vocabulary: Dict[str, set] = {}
+        for index, _ in self.profiles:
+            for word in index.vocabulary:
+                vocabulary.setdefault(_fold(word), set()).add(word)
+        alternatives = sorted(vocabulary, key=len, reverse=True)
+        self._pattern = re.compile(
+            "(?=(" + "|".join(re.escape(word) for word in alternatives) + "))"
+        ) if alternatives else None
+        self._closure: Dict[str, FrozenSet[str]] = {
+            folded: frozenset(word for other, words in vocabulary.items() if other in folded for word in words)
+            for folded in vocabulary
+        }
+
+        self.checked = 0
+        self.skipped = 0
+
+    def threshold(self, compiled: CompiledProfile) -> float:
+        """Puntaje que la cota debe alcanzar para el puesto"""
+        return compiled.min_score if self.floor is None else min(self.floor, compiled.min_score)
+
+    def present_words(self, text: str) -> FrozenSet[str]:
+        """Palabras del vocabulario de los perfiles que aparecen en el texto"""
+        if self._pattern is None:
+            return frozenset()
+        found = set()
+        seen = set()
+        for match in self._pattern.finditer(_fold(text)):
+            word = match.group(1)
+            if word not in seen:
+                seen.add(word)
+                found.update(self._closure[word])
+        return frozenset(found)
+
+    def upper_bounds(self, text: str) -> Dict[str, float]:
+        """Cota superior del puntaje por puesto"""
+        present = self.present_words(text)
+        return {compiled.name: profile_upper_bound(index, compiled, present) for index, compiled in self.profiles}
+
+    def passes(self, text: str) -> bool:
+        """Indica si el CV todavía puede ser apto para alguno de los puestos"""
+        try:
+            bounds = self.upper_bounds(text)
+        except Exception as e:
+            # Ante un error el CV sigue su camino normal
+            logger.error(f"Error en el pre-filtro: {str(e)}")
+            return True
+        self.checked += 1
+        ok = any(bounds[compiled.name] + self.margin >= self.threshold(compiled) for _, compiled in self.profiles)
+        if not ok:
+            self.skipped += 1
+        return ok
+
+
+def build_prescreen(puestos: List[str], config: dict, floor: Optional[float] = None) -> Optional[PreScreen]:
+    """
+    Pre-filtro según CV_PROCESSOR_CONFIG["prescreen"], o None si está
+    desactivado; `floor` es el puntaje mínimo con el que se rankea
+    """
+    if not config.get("enabled"):
+        return None
+    return PreScreen(puestos, config.get("margin", 0.0), floor)
@@ -1,13 +1,11 @@
 import os
+import csv
 import json
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Optional, Tuple
-import PyPDF2
+from typing import Callable, List, Dict, Optional, Tuple
 from tabulate import tabulate
 from tqdm import tqdm
-import requests
 
 # Configurar logger para que solo muestre errores
 logger = logging.getLogger(__name__)
@@ -15,7 +13,16 @@ logger.setLevel(logging.ERROR)
 
 from .gemini_processor import GeminiProcessor
 from .job_profiles import is_candidate_suitable, JOB_PROFILES
-from .contact_generator import generate_whatsapp_link
+from .contact_generator import generate_whatsapp_link, _generate_short_url
+from .cache import CVCache, hash_pdf
+from .pdf_extractors import extract_text
+from .pipeline import CVPipeline
+from .local_parser import LocalParseResult, parse_cv_text
+from .prescreen import PreScreen, build_prescreen
+from .ranking import TopK
+from .scoring import get_scoring_engine
+from .progress import ProgressTracker, ConsoleProgressSink, JsonLinesProgressSink
+from system.config import CV_PROCESSOR_CONFIG, MENU_CONFIG
 
 class CVProcessor:
     def __init__(self, base_dir: str):
@@ -25,7 +32,15 @@ class CVProcessor:
         self.curriculums_dir = CURRICULUMS_FOLDER
         self.results_dir = CV_PROCESSOR_FOLDER
         self.top3_dir = CV_PROCESSOR_TOP3_FOLDER
-        self.gemini_processor = GeminiProcessor()
+        try:
+            self.gemini_processor = GeminiProcessor()
+        except ValueError as e:
+            # Sin API key solo queda el parser local (si el modo sin conexión está activo)
+            logger.error(f"Gemini no disponible: {str(e)}")
+            self.gemini_processor = None
+        self.cache = CVCache(os.path.join(self.results_dir, "cache"))
+        self.logs_dir = os.path.join(self.results_dir, "logs")
+        self.reports_dir = os.path.join(self.results_dir, "reportes")
         
         # Crear directorios si no existen
         os.makedirs(self.curriculums_dir, exist_ok=True)
@@ -34,186 +49,346 @@ class CVProcessor:
 
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-                return text
+            return extract_text(pdf_path)
         except Exception as e:
             logger.error(f"Error al procesar {pdf_path}: {str(e)}")
             return ""
 
-    def process_cv(self, pdf_path: str, puesto: str) -> Tuple[dict, float]:
+    def analyze_file(self, pdf_path: str, pdf_hash: Optional[str] = None) -> Optional[dict]:
+        """
+        Retorna la información estructurada de un CV, usando el caché por hash
+        del PDF y consultando a Gemini solo si el archivo no se ha analizado antes
+        """
+        filename = os.path.basename(pdf_path)
+        if not pdf_hash:
+            try:
+                pdf_hash = hash_pdf(pdf_path)
+            except Exception as e:
+                logger.error(f"No se pudo leer el archivo {filename}: {str(e)}")
+                return None
+
+        cv_data = self.cache.get_analysis(pdf_hash)
+        if cv_data:
+            return cv_data
+
+        # Extraer texto del PDF
+        cv_text = self.extract_text_from_pdf(pdf_path)
+        if not cv_text:
+            logger.error(f"No se pudo extraer texto del archivo {filename}")
+            return None
+
+        # Parser local primero; Gemini solo si la confianza no alcanza el umbral
+        cv_data = self._local_analysis(cv_text)
+        if cv_data is None:
+            if self.gemini_processor is None:
+                logger.error(f"Gemini no disponible para analizar {filename}")
+                return None
+            cv_data = self.gemini_processor.analyze_cv(cv_text)
+        cv_data = self._normalize_cv_data(cv_data, filename)
+        if not cv_data:
+            return None
+
+        self.cache.put(pdf_hash, cv_text, cv_data, filename)
+        return dict(cv_data)
+
+    @staticmethod
+    def _local_analysis(cv_text: str) -> Optional[dict]:
+        """
+        Resultado del parser local si está activo y su confianza alcanza el
+        umbral configurado
+        """
+        config = CV_PROCESSOR_CONFIG["local_parser"]
+        if not config["enabled"]:
+            return None
+        parsed = parse_cv_text(cv_text)
+        if parsed.cv_data and parsed.confidence >= config["confidence_threshold"]:
+            return parsed.cv_data
+        return None
+
+    def _normalize_cv_data(self, cv_data: dict, filename: str) -> Optional[dict]:
+        """
+        Valida la respuesta de Gemini y completa los campos opcionales
+        """
+        if not cv_data or not isinstance(cv_data, dict):
+            logger.error(f"Gemini no pudo analizar el CV {filename}")
+            return None
+
+        # Asegurar que los campos existan y tengan valores válidos
+        required_fields = ['nombre', 'habilidades']
+        if not all(field in cv_data for field in required_fields):
+            logger.error(f"CV incompleto: faltan campos requeridos en {filename}")
+            return None
+
+        # Normalizar campos que podrían ser None
+        cv_data['ubicacion'] = cv_data.get('ubicacion') or 'No especificada'
+        cv_data['telefono'] = cv_data.get('telefono') or 'No especificado'
+        cv_data['correo'] = cv_data.get('correo') or 'No especificado'
+        cv_data['idiomas'] = cv_data.get('idiomas') or []
+        cv_data['educacion'] = cv_data.get('educacion') or ['No especificada']
+        cv_data['experiencia'] = cv_data.get('experiencia') or []
+        cv_data.pop('score', None)
+        return cv_data
+
+    def score_cv(self, cv_data: dict, puesto: str) -> Tuple[dict, float]:
+        """
+        Evalúa la información estructurada de un CV contra un puesto
+        """
+        is_suitable, score = is_candidate_suitable(cv_data, puesto)
+
+        # Guardar score en los datos del CV
+        cv_data['score'] = score
+        return cv_data, score
+
+    def process_cv(self, pdf_path: str, puesto: str, pdf_hash: Optional[str] = None) -> Tuple[dict, float]:
         """
         Procesa un CV y retorna la información estructurada y su puntaje
         """
         try:
-            # Extraer texto del PDF
-            cv_text = self.extract_text_from_pdf(pdf_path)
-            if not cv_text:
-                logger.error(f"No se pudo extraer texto del archivo {os.path.basename(pdf_path)}")
-                return None, 0
-            
-            # Analizar CV con Gemini
-            cv_data = self.gemini_processor.analyze_cv(cv_text)
-            if not cv_data or not isinstance(cv_data, dict):
-                logger.error(f"Gemini no pudo analizar el CV {os.path.basename(pdf_path)}")
-                return None, 0
-            
-            # Asegurar que los campos existan y tengan valores válidos
-            required_fields = ['nombre', 'habilidades']
-            if not all(field in cv_data for field in required_fields):
-                logger.error(f"CV incompleto: faltan campos requeridos en {os.path.basename(pdf_path)}")
+            cv_data = self.analyze_file(pdf_path, pdf_hash)
+            if not cv_data:
                 return None, 0
 
-            # Normalizar campos que podrían ser None
-            cv_data['ubicacion'] = cv_data.get('ubicacion') or 'No especificada'
-            cv_data['telefono'] = cv_data.get('telefono') or 'No especificado'
-            cv_data['correo'] = cv_data.get('correo') or 'No especificado'
-            cv_data['idiomas'] = cv_data.get('idiomas') or []
-            cv_data['educacion'] = cv_data.get('educacion') or ['No especificada']
-            cv_data['experiencia'] = cv_data.get('experiencia') or []
-            
-            # Evaluar si el candidato es apto
-            is_suitable, score = is_candidate_suitable(cv_data, puesto)
-            
-            # Guardar score en los datos del CV
-            cv_data['score'] = score
-            
-            return cv_data, score
-            
+            return self.score_cv(cv_data, puesto)
+
         except Exception as e:
             logger.error(f"Error procesando {os.path.basename(pdf_path)}: {str(e)}")
             return None, 0
             
-    def process_all_cvs(self, puesto: str, recruiter_name: str = "Recursos Humanos") -> List[Tuple[dict, float]]:
+    def _analyze_folder(self, consume: Callable[[str, dict, ProgressTracker], None],
+                        prescreen: Optional[PreScreen] = None) -> int:
         """
-        Procesa todos los CVs en el directorio de currículums
+        Analiza cada PDF del directorio de currículums una sola vez (caché por
+        hash, parser local o pipeline con Gemini) y entrega cada análisis a
+        `consume(archivo, análisis, tracker)` en cuanto está listo. Con
+        `prescreen`, los CVs sin analizar que no pueden ser aptos se descartan
+        antes del análisis.
+        Retorna el número de PDFs encontrados.
         """
-        # Verificar que el puesto sea válido
-        if not puesto or puesto.lower() not in JOB_PROFILES:
-            raise ValueError(f"Puesto no válido. Opciones disponibles: {', '.join(JOB_PROFILES.keys())}")
-            
-        # Verificar API key silenciosamente
-        if not self.gemini_processor.verify_api_key():
-            raise ValueError("Error: API key de Gemini no válida o no configurada")
-            
         # Buscar archivos PDF
         pdf_files = [f for f in os.listdir(self.curriculums_dir) if f.lower().endswith('.pdf')]
         
         if not pdf_files:
-            print("\nNo se encontraron archivos PDF en el directorio.")
-            return []
-        
-        print("\nIniciando procesamiento de CVs...")
-        
-        # Lista para almacenar resultados
-        results = []
-        cache_dir = os.path.join(self.results_dir, "cache")
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        # Limpiar caché anterior del puesto actual
-        for cache_file in os.listdir(cache_dir):
-            if f"_{puesto.lower()}_cache.json" in cache_file.lower():
-                try:
-                    os.remove(os.path.join(cache_dir, cache_file))
-                except Exception as e:
-                    logger.warning(f"No se pudo eliminar archivo de caché {cache_file}: {str(e)}")
-        
-        # Configurar barra de progreso ASCII
-        total_files = len(pdf_files)
-        progress_width = 40
-        
-        def process_cv_file(pdf_file):
+            return 0
+
+        # Calcular el hash de cada PDF para consultar el caché
+        pdf_hashes = {}
+        for pdf_file in pdf_files:
             try:
-                pdf_path = os.path.join(self.curriculums_dir, pdf_file)
-                # Incluir el puesto en el nombre del archivo de caché
-                cache_file = os.path.join(cache_dir, f"{os.path.splitext(pdf_file)[0]}_{puesto.lower()}_cache.json")
-                
-                # Intentar cargar del caché primero
-                if os.path.exists(cache_file):
-                    try:
-                        with open(cache_file, 'r', encoding='utf-8') as f:
-                            cv_data = json.load(f)
-                            if cv_data and isinstance(cv_data, dict):
-                                score = cv_data.get("score", 0)
-                                return cv_data, score
-                    except Exception as e:
-                        logger.warning(f"Error al cargar caché para {pdf_file}: {str(e)}")
-                
-                # Procesar CV
-                cv_data, score = self.process_cv(pdf_path, puesto)
-                if cv_data and isinstance(cv_data, dict) and score > 0:
-                    # Guardar en caché
-                    try:
-                        with open(cache_file, 'w', encoding='utf-8') as f:
-                            json.dump(cv_data, f, indent=4, ensure_ascii=False)
-                    except Exception as e:
-                        logger.warning(f"Error al guardar caché para {pdf_file}: {str(e)}")
-                    return cv_data, score
-                
-                return None, 0
-                
+                pdf_hashes[pdf_file] = hash_pdf(os.path.join(self.curriculums_dir, pdf_file))
             except Exception as e:
-                logger.error(f"Error procesando {pdf_file}: {str(e)}")
-                return None, 0
-        
-        # Procesar CVs en paralelo con ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = []
-            for pdf_file in pdf_files:
-                future = executor.submit(process_cv_file, pdf_file)
-                futures.append(future)
-            
-            # Mostrar barra de progreso mientras se procesan los CVs
-            completed = 0
-            while completed < total_files:
-                completed = sum(1 for f in futures if f.done())
-                progress = int((completed / total_files) * progress_width)
-                bar = "█" * progress + "░" * (progress_width - progress)
-                percentage = (completed / total_files) * 100
-                print(f"\rProcesando: [{bar}] {percentage:0.1f}%", end="", flush=True)
-                time.sleep(0.1)
-            
-            # Recolectar resultados
-            for future in futures:
-                cv_data, score = future.result()
-                if cv_data and isinstance(cv_data, dict) and score >= 50:  # Solo incluir candidatos con puntaje >= 50%
-                    results.append((cv_data, score))
-        
-        print("\n\nProcesamiento completado.")
-        
-        if not results:
-            print("\nNo se encontraron candidatos aptos para el puesto.")
-            return []
-        
-        # Ordenar por score descendente
-        results.sort(key=lambda x: x[1], reverse=True)
+                logger.error(f"No se pudo leer el archivo {pdf_file}: {str(e)}")
+        pdf_files = [f for f in pdf_files if f in pdf_hashes]
+
+        # Análisis guardados; las entradas inválidas o de otra versión cuentan como pendientes
+        cached = {f: self.cache.get_analysis(pdf_hashes[f]) for f in pdf_files}
+        pending = [f for f in pdf_files if not cached[f]]
+
+        # Verificar API key silenciosamente solo si hay CVs sin analizar
+        local_config = CV_PROCESSOR_CONFIG["local_parser"]
+        escalate = True
+        if pending and (self.gemini_processor is None or not self.gemini_processor.verify_api_key()):
+            if not (local_config["enabled"] and local_config["offline_fallback"]):
+                raise ValueError("Error: API key de Gemini no válida o no configurada")
+            # Sin conexión: todos los CVs se resuelven con el parser local
+            print("\nAPI key de Gemini no disponible: se usará solo el parser local.")
+            escalate = False
         
-        # Tomar los 3 mejores resultados
-        top_results = results[:3]
+        print("\nIniciando procesamiento de CVs...")
         
-        # Guardar top 3 en archivos separados
+        # Progreso por eventos: consola y, opcionalmente, log en JSON lines
+        tracker = ProgressTracker(len(pdf_files), self._progress_sinks(),
+                                  CV_PROCESSOR_CONFIG["progress"]["refresh_interval"])
+
+        # Los CVs ya analizados se toman del caché sin volver a Gemini
+        for pdf_file in pdf_files:
+            if cached[pdf_file]:
+                tracker.cached(pdf_file)
+                consume(pdf_file, cached[pdf_file], tracker)
+
+        # Pipeline: extracción en procesos -> cola acotada -> análisis con Gemini
+        def on_extracted(pdf_file: str, cv_text: str):
+            if not cv_text:
+                logger.error(f"No se pudo extraer texto del archivo {pdf_file}")
+                tracker.completed_file(pdf_file, False)
+
+        def on_analysis(pdf_file: str, cv_text: str, cv_data: dict, cacheable: bool = True):
+            cv_data = self._normalize_cv_data(cv_data, pdf_file)
+            if cv_data:
+                if cacheable:
+                    self.cache.put(pdf_hashes[pdf_file], cv_text, cv_data, pdf_file)
+                consume(pdf_file, cv_data, tracker)
+            tracker.completed_file(pdf_file, bool(cv_data))
+
+        def on_local(pdf_file: str, cv_text: str, parsed: LocalParseResult):
+            cv_data = dict(parsed.cv_data)
+            cv_data['nombre'] = cv_data.get('nombre') or os.path.splitext(pdf_file)[0]
+            # Un resultado bajo el umbral (modo sin conexión) no se guarda para analizarlo después con Gemini
+            on_analysis(pdf_file, cv_text, cv_data, parsed.confidence >= local_config["confidence_threshold"])
+
+        stats = None
+        try:
+            if pending:
+                tracker.started()
+                pipeline = CVPipeline(self.gemini_processor, latency_observer=tracker.record_latency,
+                                      escalate=escalate, prescreen=prescreen)
+                stats = pipeline.run(
+                    {pdf_file: os.path.join(self.curriculums_dir, pdf_file) for pdf_file in pending},
+                    on_extracted, on_analysis, on_local, tracker.skipped_file
+                )
+        finally:
+            tracker.close()
+        if stats:
+            print(stats.summary())
+
+        print("\nProcesamiento completado.")
+        return len(pdf_files)
+
+    @staticmethod
+    def _report_leaders(tracker: ProgressTracker, ranking: TopK) -> None:
+        tracker.leaders([(cv_data.get('nombre', pdf_file), score) for (pdf_file, cv_data), score in ranking.leaders()])
+
+    def _save_top(self, puesto: str, top_results: List[Tuple[dict, float]]) -> None:
+        """
+        Guarda los mejores candidatos de un puesto en archivos separados
+        """
         for i, (cv_data, score) in enumerate(top_results, 1):
             filename = f"top{i}_{puesto.lower()}_{cv_data.get('nombre', 'candidato').replace(' ', '_')}.json"
             filepath = os.path.join(self.top3_dir, filename)
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(cv_data, f, indent=4, ensure_ascii=False)
+
+    def process_all_cvs(self, puesto: str, recruiter_name: str = "Recursos Humanos") -> List[Tuple[dict, float]]:
+        """
+        Procesa todos los CVs en el directorio de currículums
+        """
+        # Verificar que el puesto sea válido
+        if not puesto or puesto.lower() not in JOB_PROFILES:
+            raise ValueError(f"Puesto no válido. Opciones disponibles: {', '.join(JOB_PROFILES.keys())}")
+
+        # Solo se conservan los K mejores candidatos; el resto se descarta al evaluarlo
+        ranking = TopK(CV_PROCESSOR_CONFIG["top_k"])
+        min_rank_score = CV_PROCESSOR_CONFIG["ranking_min_score"]
+
+        def rank(pdf_file: str, cv_data: dict, tracker: ProgressTracker):
+            # Evaluar contra el puesto; el puntaje no se guarda en el caché
+            try:
+                cv_data, score = self.score_cv(cv_data, puesto)
+            except Exception as e:
+                logger.error(f"Error procesando {pdf_file}: {str(e)}")
+                return
+            if score >= min_rank_score and ranking.push(score, (pdf_file, cv_data)):
+                self._report_leaders(tracker, ranking)
+
+        # Los CVs que no pueden alcanzar el puntaje mínimo del ranking no se analizan
+        prescreen = build_prescreen([puesto], CV_PROCESSOR_CONFIG["prescreen"], min_rank_score)
+        if not self._analyze_folder(rank, prescreen):
+            print("\nNo se encontraron archivos PDF en el directorio.")
+            return []
+
+        # Mejores resultados, ya ordenados por score descendente
+        top_results = [(cv_data, score) for (_, cv_data), score in ranking.leaders()]
+        if not top_results:
+            print("\nNo se encontraron candidatos aptos para el puesto.")
+            return []
         
+        self._save_top(puesto, top_results)
         return top_results
 
+    def process_all_vacancies(self, puestos: Optional[List[str]] = None) -> Dict[str, List[Tuple[dict, float]]]:
+        """
+        Analiza cada CV una sola vez y lo evalúa contra todas las vacantes del
+        menú (o las indicadas). Guarda el top K de cada vacante, un reporte
+        JSON por vacante y una matriz CSV candidato -> puntaje por vacante con
+        su mejor vacante. Retorna {puesto: [(cv_data, score)]}.
+        """
+        if puestos is None:
+            puestos = [p for category in MENU_CONFIG['cv_processor_menu']['categories'].values() for p in category]
+        puestos = list(dict.fromkeys(p.lower() for p in puestos))
+        invalid = [p for p in puestos if p not in JOB_PROFILES]
+        if not puestos or invalid:
+            raise ValueError(f"Puesto no válido. Opciones disponibles: {', '.join(JOB_PROFILES.keys())}")
+
+        engine = get_scoring_engine()
+        columns = [engine.profile_column(p) for p in puestos]
+        rankings = {puesto: TopK(CV_PROCESSOR_CONFIG["top_k"]) for puesto in puestos}
+        batch_size = CV_PROCESSOR_CONFIG["scoring_batch_size"]
+        pending_batch: List[Tuple[str, dict]] = []
+
+        os.makedirs(self.reports_dir, exist_ok=True)
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        matrix_path = os.path.join(self.reports_dir, f"matriz_vacantes_{timestamp}.csv")
+        min_scores = [engine.index.profiles[p].min_score for p in puestos]
+
+        def score_pending():
+            # Un solo cálculo NumPy por lote: candidatos × vacantes
+            if not pending_batch:
+                return
+            scores = engine.score_batch([cv_data for _, cv_data in pending_batch])[:, columns]
+            for (pdf_file, cv_data), row in zip(pending_batch, scores.tolist()):
+                best = max(range(len(puestos)), key=lambda i: row[i])
+                matrix.writerow([pdf_file, cv_data.get('nombre', ''), puestos[best], row[best],
+                                 row[best] >= min_scores[best]] + row)
+                for puesto, score in zip(puestos, row):
+                    if score >= CV_PROCESSOR_CONFIG["ranking_min_score"]:  # Mismo umbral que al evaluar un solo puesto
+                        rankings[puesto].push(score, (pdf_file, cv_data))
+            pending_batch.clear()
+
+        def collect(pdf_file: str, cv_data: dict, tracker: ProgressTracker):
+            pending_batch.append((pdf_file, cv_data))
+            if len(pending_batch) >= batch_size:
+                score_pending()
+
+        with open(matrix_path, 'w', newline='', encoding='utf-8-sig') as matrix_file:
+            matrix = csv.writer(matrix_file)
+            matrix.writerow(["archivo", "nombre", "mejor_vacante", "mejor_puntaje", "apto"] + puestos)
+            found = self._analyze_folder(collect)
+            score_pending()
+
+        if not found:
+            os.remove(matrix_path)
+            print("\nNo se encontraron archivos PDF en el directorio.")
+            return {}
+
+        results = {}
+        report = {}
+        for puesto, ranking in rankings.items():
+            top_results = []
+            for (pdf_file, cv_data), score in ranking.leaders():
+                # Cada vacante guarda su propio puntaje sin modificar el análisis compartido
+                top_results.append(({**cv_data, 'score': score}, score))
+            results[puesto] = top_results
+            report[puesto] = [{"archivo": pdf_file, "nombre": cv_data.get('nombre', ''), "score": score}
+                              for (pdf_file, cv_data), score in ranking.leaders()]
+            self._save_top(puesto, top_results)
+
+        report_path = os.path.join(self.reports_dir, f"reporte_vacantes_{timestamp}.json")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+
+        print(f"\nReporte por vacante: {report_path}")
+        print(f"Matriz candidato -> vacante: {matrix_path}")
+        return results
+
+    def _progress_sinks(self) -> list:
+        """
+        Sinks del progreso: la barra de consola y el log de métricas en JSON lines
+        """
+        config = CV_PROCESSOR_CONFIG["progress"]
+        sinks = [ConsoleProgressSink()]
+        if config["log_metrics"]:
+            try:
+                os.makedirs(self.logs_dir, exist_ok=True)
+                log_path = os.path.join(self.logs_dir, f"progress_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+                sinks.append(JsonLinesProgressSink(log_path, config["snapshot_interval"]))
+            except OSError as e:
+                logger.error(f"No se pudo crear el log de progreso: {str(e)}")
+        return sinks
+
     def _generate_short_url(self, long_url: str) -> str:
         """
         Genera una URL corta usando TinyURL
         """
-        try:
-            response = requests.get(f'http://tinyurl.com/api-create.php?url={long_url}')
-            if response.status_code == 200:
-                return response.text
-            return long_url
-        except:
-            return long_url
+        return _generate_short_url(long_url)
 
     def _format_candidate_info(self, cv_data: dict, score: float, recruiter_name: str = "Recursos Humanos") -> str:
         """
@@ -348,3 +523,16 @@ class CVProcessor:
             print(self._format_candidate_info(cv_data, score, recruiter_name))
         
         print("\nResultados guardados en la carpeta 'Results/CV Processor'")
+
+    def display_vacancy_results(self, results: Dict[str, List[Tuple[dict, float]]]) -> None:
+        """
+        Muestra el resumen de los mejores candidatos de cada vacante
+        """
+        rows = []
+        for puesto, candidates in results.items():
+            nombres = ", ".join(f"{cv_data.get('nombre', 'Candidato')} ({score}%)" for cv_data, score in candidates)
+            rows.append([puesto.replace('_', ' ').title(), nombres or "Sin candidatos aptos"])
+
+        print("\n=== MEJORES CANDIDATOS POR VACANTE ===\n")
+        print(tabulate(rows, headers=["Vacante", f"Top {CV_PROCESSOR_CONFIG['top_k']}"], tablefmt="fancy_grid"))
+        print("\nResultados guardados en la carpeta 'Results/CV Processor'")
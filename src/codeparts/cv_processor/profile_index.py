@@ -0,0 +1,229 @@
+"""
+Índice compilado de JOB_PROFILES: habilidades normalizadas, sus conjuntos de
+palabras y un índice invertido palabra -> habilidades, para que evaluar a un
+candidato solo toque las habilidades que comparten palabras con él
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .job_profiles import JOB_PROFILES
+
+
+# Los años de experiencia se acotan para operar en int64; fuera de este rango
+# el bono ya es el máximo (o nulo) y el resultado no cambia
+MAX_EXPERIENCE_YEARS = 10 ** 6
+
+
+def candidate_features(cv_data: dict) -> Tuple[List[str], List[str], int]:
+    """
+    Frases de habilidades (habilidades + puestos y responsabilidades), idiomas
+    y años de experiencia de un candidato, normalizados para el puntaje
+    """
+    habilidades = cv_data.get('habilidades', [])
+    if isinstance(habilidades, str):
+        habilidades = [habilidades]
+    frases = [h.lower().strip() for h in habilidades if isinstance(h, str)]
+
+    años_experiencia = 0
+    experiencia = cv_data.get('experiencia', [])
+    if isinstance(experiencia, list):
+        for exp in experiencia:
+            if isinstance(exp, dict):
+                periodo = exp.get('periodo', '').lower()
+                if 'presente' in periodo or 'actual' in periodo:
+                    try:
+                        año_inicio = int(''.join(filter(str.isdigit, periodo.split('-')[0])))
+                        años_experiencia += 2024 - año_inicio
+                    except:
+                        pass
+
+                puesto_exp = exp.get('puesto', '').lower().strip()
+                if puesto_exp:
+                    frases.append(puesto_exp)
+                for resp in exp.get('responsabilidades', []):
+                    if isinstance(resp, str):
+                        frases.append(resp.lower().strip())
+
+    idiomas_candidato = []
+    idiomas = cv_data.get('idiomas', [])
+    if isinstance(idiomas, list):
+        for idioma in idiomas:
+            if isinstance(idioma, str):
+                idiomas_candidato.append(idioma.lower())
+            elif isinstance(idioma, dict):
+                idiomas_candidato.append(idioma.get('idioma', '').lower())
+
+    años_experiencia = max(-MAX_EXPERIENCE_YEARS, min(MAX_EXPERIENCE_YEARS, años_experiencia))
+    return frases, idiomas_candidato, años_experiencia
+
+
+def profile_signature(perfil: dict) -> tuple:
+    """
+    Huella de los campos de un perfil que afectan el puntaje; si cambia, el
+    índice se reconstruye
+    """
+    return (
+        tuple(perfil.get('required_skills', ())),
+        tuple(perfil.get('preferred_skills', ())),
+        tuple(perfil.get('required_languages', ())),
+        tuple(perfil.get('preferred_languages', ())),
+        perfil.get('min_experience_years', 2),
+        perfil.get('min_score', 40)
+    )
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    name: str
+    required: Tuple[int, ...]  # IDs de habilidades requeridas, en el orden del perfil
+    preferred: Tuple[int, ...]
+    required_languages: Tuple[str, ...]
+    preferred_languages: Tuple[str, ...]
+    min_experience_years: int
+    min_score: float
+    signature: tuple
+
+
+class ProfileIndex:
+    """
+    Compila un diccionario de perfiles. Los IDs de habilidad son globales:
+    una habilidad que aparece en varios perfiles se evalúa una sola vez.
+    """
+
+    def __init__(self, profiles: Dict[str, dict], phrase_cache_size: int = 8192):
+        skill_ids: Dict[str, int] = {}
+        self.profiles: Dict[str, CompiledProfile] = {}
+        for name, perfil in profiles.items():
+            requeridas = [h.lower().strip() for h in perfil.get('required_skills', [])]
+            deseables = [h.lower().strip() for h in perfil.get('preferred_skills', [])]
+            self.profiles[name] = CompiledProfile(
+                name=name,
+                required=tuple(skill_ids.setdefault(h, len(skill_ids)) for h in requeridas),
+                preferred=tuple(skill_ids.setdefault(h, len(skill_ids)) for h in deseables),
+                required_languages=tuple(i.lower() for i in perfil.get('required_languages', [])),
+                preferred_languages=tuple(i.lower() for i in perfil.get('preferred_languages', [])),
+                min_experience_years=perfil.get('min_experience_years', 2),
+                min_score=perfil.get('min_score', 40),
+                signature=profile_signature(perfil)
+            )
+
+        self.skills: List[str] = list(skill_ids)
+        self.skill_words: List[FrozenSet[str]] = [frozenset(skill.split()) for skill in self.skills]
+
+        # Índice invertido: palabra -> habilidades que la contienen
+        self.word_to_skills: Dict[str, Tuple[int, ...]] = {}
+        postings: Dict[str, List[int]] = {}
+        for skill_id, words in enumerate(self.skill_words):
+            for word in words:
+                postings.setdefault(word, []).append(skill_id)
+        self.word_to_skills = {word: tuple(ids) for word, ids in postings.items()}
+        self.vocabulary: List[str] = list(self.word_to_skills)
+
+        # Habilidad -> [(perfil, posición)] donde se usa
+        self.skill_postings: Dict[int, List[Tuple[str, int]]] = {}
+        for name, compiled in self.profiles.items():
+            for position, skill_id in enumerate(compiled.required + compiled.preferred):
+                self.skill_postings.setdefault(skill_id, []).append((name, position))
+
+        # Búsqueda de palabras del vocabulario como subcadenas: en cada posición el
+        # lookahead captura la palabra más larga que empieza ahí; las más cortas que
+        # empiezan en la misma posición son subcadenas suyas y salen de la cerradura
+        alternatives = sorted(self.vocabulary, key=len, reverse=True)
+        self._substring_pattern = re.compile(
+            "(?=(" + "|".join(re.escape(word) for word in alternatives) + "))"
+        ) if alternatives else None
+        self._substring_closure: Dict[str, Tuple[str, ...]] = {
+            word: tuple(other for other in self.vocabulary if other in word)
+            for word in self.vocabulary
+        }
+
+        self.best_matches_for_phrase = lru_cache(maxsize=phrase_cache_size)(self._phrase_matches)
+
+    def words_in(self, phrase: str) -> FrozenSet[str]:
+        """Palabras del vocabulario que aparecen como subcadena de la frase"""
+        if self._substring_pattern is None:
+            return frozenset()
+        found = set()
+        for match in self._substring_pattern.finditer(phrase):
+            word = match.group(1)
+            if word not in found:
+                found.update(self._substring_closure[word])
+        return frozenset(found)
+
+    def _phrase_matches(self, phrase: str) -> Tuple[Tuple[int, float], ...]:
+        """
+        Coincidencia de una frase con cada habilidad que comparte palabras con
+        ella: fracción de palabras en común, o 0.75 si alguna es subcadena
+        """
+        matches: Dict[int, float] = {}
+        overlap: Dict[int, int] = {}
+        for word in set(phrase.split()):
+            for skill_id in self.word_to_skills.get(word, ()):
+                overlap[skill_id] = overlap.get(skill_id, 0) + 1
+        for skill_id, count in overlap.items():
+            matches[skill_id] = count / len(self.skill_words[skill_id])
+        for word in self.words_in(phrase):
+            for skill_id in self.word_to_skills[word]:
+                if matches.get(skill_id, 0) < 0.75:
+                    matches[skill_id] = 0.75
+        return tuple(matches.items())
+
+    def best_matches(self, phrases: Iterable[str]) -> Dict[int, float]:
+        """
+        Mejor coincidencia de cada habilidad tocada por alguna frase; las
+        habilidades ausentes valen 0
+        """
+        best: Dict[int, float] = {}
+        for phrase in phrases:
+            for skill_id, value in self.best_matches_for_phrase(phrase):
+                if value > best.get(skill_id, 0):
+                    best[skill_id] = value
+        return best
+
+    def is_current(self, profiles: Dict[str, dict]) -> bool:
+        """Indica si el índice corresponde a todos los perfiles actuales"""
+        return (profiles.keys() == self.profiles.keys() and
+                all(self.profiles[name].signature == profile_signature(perfil) for name, perfil in profiles.items()))
+
+
+_index: Optional[ProfileIndex] = None
+_index_lock = threading.Lock()
+
+
+def _rebuild() -> ProfileIndex:
+    global _index
+    with _index_lock:
+        if _index is None or not _index.is_current(JOB_PROFILES):
+            _index = ProfileIndex(JOB_PROFILES)
+        return _index
+
+
+def get_profile_index() -> ProfileIndex:
+    """
+    Índice de JOB_PROFILES, compilado la primera vez y reconstruido si algún
+    perfil cambió
+    """
+    index = _index
+    if index is None or not index.is_current(JOB_PROFILES):
+        index = _rebuild()
+    return index
+
+
+def get_compiled_profile(puesto: str) -> Optional[Tuple[ProfileIndex, CompiledProfile]]:
+    """
+    Índice y perfil compilado de un puesto; solo compara la huella de ese
+    perfil, así que la verificación no depende de cuántos perfiles haya
+    """
+    perfil = JOB_PROFILES.get(puesto)
+    if not perfil:
+        return None
+    index = _index
+    compiled = index.profiles.get(puesto) if index is not None else None
+    if compiled is None or compiled.signature != profile_signature(perfil):
+        index = _rebuild()
+        compiled = index.profiles[puesto]
+    return index, compiled
@@ -0,0 +1,256 @@
+"""
+Progreso y métricas del procesamiento de CVs, alimentados por eventos de
+finalización en lugar de consultar el estado de todas las tareas
+"""
+
+import json
+import math
+import time
+import bisect
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Tuple
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """
+    Percentil por rango más cercano de una lista ya ordenada
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+@dataclass
+class ProgressSnapshot:
+    """Estado del procesamiento en un instante"""
+    total: int
+    completed: int
+    cache_hits: int
+    failed: int
+    skipped: int
+    elapsed: float
+    files_per_second: float
+    eta_seconds: Optional[float]
+    cache_hit_ratio: float
+    gemini_requests: int
+    latency_p50: Optional[float]
+    latency_p90: Optional[float]
+    latency_p99: Optional[float]
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+    def to_dict(self) -> dict:
+        return {key: round(value, 4) if isinstance(value, float) else value
+                for key, value in asdict(self).items()}
+
+
+class ProgressTracker:
+    """
+    Cuenta los CVs terminados a medida que llegan los callbacks y notifica a
+    los sinks. Cada evento es O(1) salvo la latencia (inserción ordenada), así
+    que el costo no crece con el número de CVs pendientes.
+    """
+
+    def __init__(self, total: int, sinks: Optional[list] = None, refresh_interval: float = 0.1):
+        self.total = total
+        self.sinks = sinks or []
+        self.refresh_interval = refresh_interval
+
+        self.completed = 0
+        self.cache_hits = 0
+        self.failed = 0
+        self.skipped = 0
+        self._latencies: List[float] = []
+        self._started_at = time.perf_counter()
+        # Inicio del trabajo real (el primer CV que no viene del caché)
+        self._work_started_at: Optional[float] = None
+        self._work_completed = 0
+        self._last_refresh = 0.0
+        self._last_drawn = -1
+        self._lock = threading.Lock()
+
+    def _emit(self, record: dict) -> None:
+        for sink in self.sinks:
+            try:
+                sink.event(record)
+            except Exception as e:
+                logger.error(f"Error en el registro de progreso: {str(e)}")
+
+    def _refresh(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if self.completed == self._last_drawn:
+            return
+        if not force and now - self._last_refresh < self.refresh_interval and self.completed < self.total:
+            return
+        self._last_refresh = now
+        self._last_drawn = self.completed
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            try:
+                sink.update(snapshot)
+            except Exception as e:
+                logger.error(f"Error en el registro de progreso: {str(e)}")
+
+    def cached(self, key: str) -> None:
+        """Un CV se resolvió desde el caché"""
+        with self._lock:
+            self.completed += 1
+            self.cache_hits += 1
+            self._emit({"event": "file", "file": key, "status": "cached"})
+            self._refresh()
+
+    def started(self) -> None:
+        """Marca el inicio del trabajo que no viene del caché (para la tasa y el ETA)"""
+        with self._lock:
+            if self._work_started_at is None:
+                self._work_started_at = time.perf_counter()
+
+    def completed_file(self, key: str, ok: bool) -> None:
+        """Un CV terminó su procesamiento, con o sin éxito"""
+        with self._lock:
+            if self._work_started_at is None:
+                self._work_started_at = self._started_at
+            self.completed += 1
+            self._work_completed += 1
+            if not ok:
+                self.failed += 1
+            self._emit({"event": "file", "file": key, "status": "ok" if ok else "error"})
+            self._refresh()
+
+    def skipped_file(self, key: str) -> None:
+        """El pre-filtro descartó un CV antes de analizarlo"""
+        with self._lock:
+            if self._work_started_at is None:
+                self._work_started_at = self._started_at
+            self.completed += 1
+            self._work_completed += 1
+            self.skipped += 1
+            self._emit({"event": "file", "file": key, "status": "skipped"})
+            self._refresh()
+
+    def leaders(self, leaders: List[Tuple[str, float]]) -> None:
+        """Cambió el ranking de candidatos: [(nombre, puntaje)] de mayor a menor"""
+        with self._lock:
+            self._emit({"event": "leaders", "leaders": [{"nombre": name, "score": score} for name, score in leaders]})
+
+    def record_latency(self, seconds: float) -> None:
+        """Latencia de una solicitud a Gemini"""
+        with self._lock:
+            bisect.insort(self._latencies, seconds)
+
+    def snapshot(self) -> ProgressSnapshot:
+        now = time.perf_counter()
+        work_elapsed = now - self._work_started_at if self._work_started_at is not None else 0.0
+        rate = self._work_completed / work_elapsed if work_elapsed > 0 else 0.0
+        remaining = self.total - self.completed
+        if remaining == 0:
+            eta = 0.0
+        else:
+            eta = remaining / rate if rate else None
+        return ProgressSnapshot(
+            total=self.total,
+            completed=self.completed,
+            cache_hits=self.cache_hits,
+            failed=self.failed,
+            skipped=self.skipped,
+            elapsed=now - self._started_at,
+            files_per_second=rate,
+            eta_seconds=eta,
+            cache_hit_ratio=self.cache_hits / self.completed if self.completed else 0.0,
+            gemini_requests=len(self._latencies),
+            latency_p50=percentile(self._latencies, 0.50),
+            latency_p90=percentile(self._latencies, 0.90),
+            latency_p99=percentile(self._latencies, 0.99)
+        )
+
+    def close(self) -> ProgressSnapshot:
+        """Envía el estado final a los sinks y los cierra"""
+        with self._lock:
+            self._refresh(force=True)
+            snapshot = self.snapshot()
+            for sink in self.sinks:
+                try:
+                    sink.close(snapshot)
+                except Exception as e:
+                    logger.error(f"Error al cerrar el registro de progreso: {str(e)}")
+            return snapshot
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def _format_latency(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds:0.2f}s"
+
+
+class ConsoleProgressSink:
+    """Barra de progreso ASCII con tasa, ETA, aciertos del caché y líder actual"""
+
+    def __init__(self, width: int = 40):
+        self.width = width
+        self.leader = ""
+
+    def event(self, record: dict) -> None:
+        if record["event"] == "leaders" and record["leaders"]:
+            best = record["leaders"][0]
+            self.leader = f" | líder: {best['nombre']} ({best['score']}%)"
+
+    def update(self, snapshot: ProgressSnapshot) -> None:
+        progress = int(snapshot.fraction * self.width)
+        bar = "█" * progress + "░" * (self.width - progress)
+        print(f"\rProcesando: [{bar}] {snapshot.fraction * 100:0.1f}% "
+              f"{snapshot.completed}/{snapshot.total} | {snapshot.files_per_second:0.1f} CVs/s | "
+              f"ETA {_format_seconds(snapshot.eta_seconds)} | caché {snapshot.cache_hit_ratio:0.0%}{self.leader}   ",
+              end="", flush=True)
+
+    def close(self, snapshot: ProgressSnapshot) -> None:
+        print(f"\n\nTiempo total: {_format_seconds(snapshot.elapsed)} | "
+              f"{snapshot.cache_hits} del caché | {snapshot.failed} con error | {snapshot.skipped} descartados | "
+              f"Gemini: {snapshot.gemini_requests} solicitudes, latencia p50 {_format_latency(snapshot.latency_p50)} "
+              f"p90 {_format_latency(snapshot.latency_p90)} p99 {_format_latency(snapshot.latency_p99)}")
+
+
+class JsonLinesProgressSink:
+    """
+    Escribe un registro JSON por línea (eventos por CV y métricas periódicas)
+    para corridas desatendidas
+    """
+
+    def __init__(self, path: str, snapshot_interval: float = 5.0):
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self._last_snapshot = 0.0
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _write(self, record: dict) -> None:
+        record = {"ts": round(time.time(), 3), **record}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def event(self, record: dict) -> None:
+        self._write(record)
+
+    def update(self, snapshot: ProgressSnapshot) -> None:
+        now = time.perf_counter()
+        if now - self._last_snapshot < self.snapshot_interval:
+            return
+        self._last_snapshot = now
+        self._write({"event": "progress", **snapshot.to_dict()})
+        self._file.flush()
+
+    def close(self, snapshot: ProgressSnapshot) -> None:
+        self._write({"event": "summary", **snapshot.to_dict()})
+        self._file.close()
@@ -0,0 +1,56 @@
+"""
+Selección de los mejores candidatos en streaming con un heap acotado
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Any, List, Tuple
+
+
+class TopK:
+    """
+    Conserva solo los `k` elementos con mayor puntaje vistos hasta ahora.
+    Los que salen del heap (o nunca entran) se descartan, así que la memoria
+    es O(k) sin importar cuántos candidatos se evalúen. En empates gana el
+    que llegó primero, igual que un sort estable descendente.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(1, k)
+        # Min-heap de (puntaje, -orden de llegada, elemento): la raíz es el peor líder
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def would_accept(self, score: float) -> bool:
+        """
+        Indica si un puntaje entraría al heap; permite descartar un candidato
+        antes de construir sus datos
+        """
+        return len(self._heap) < self.k or score > self._heap[0][0]
+
+    def push(self, score: float, item: Any) -> bool:
+        """
+        Ofrece un candidato; retorna True si quedó entre los líderes
+        """
+        with self._lock:
+            if not self.would_accept(score):
+                return False
+            entry = (score, -next(self._counter), item)
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            else:
+                heapq.heapreplace(self._heap, entry)
+        return True
+
+    def _sorted(self) -> List[Tuple[Any, float]]:
+        return [(item, score) for score, _, item in sorted(self._heap, reverse=True)]
+
+    def leaders(self) -> List[Tuple[Any, float]]:
+        """Líderes actuales de mayor a menor puntaje"""
+        with self._lock:
+            return self._sorted()
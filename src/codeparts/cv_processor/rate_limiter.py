@@ -0,0 +1,101 @@
+"""
+Limitador de tasa para las llamadas a Gemini
+"""
+
+import time
+import asyncio
+from collections import deque
+from typing import Optional
+
+# Ventana de las cuotas por minuto, en segundos (con 1 s de margen para la latencia de red)
+QUOTA_WINDOW = 61.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estima los tokens de un texto (aprox. 4 caracteres por token)
+    """
+    return max(1, len(text or "") // 4)
+
+
+def is_rate_limit_error(exc: Exception) -> bool:
+    """
+    Indica si la excepción corresponde a un 429 / cuota agotada
+    """
+    return getattr(exc, 'code', None) == 429 or '429' in str(exc) or 'ResourceExhausted' in type(exc).__name__
+
+
+class RateLimiter:
+    """
+    Limita solicitudes por minuto y tokens por minuto. Cada solicitud consume
+    cupo de una ventana deslizante de 60 s (el mismo criterio con el que se
+    aplican las cuotas por minuto), así que las solicitudes esperan a tener
+    cupo antes de salir en lugar de reaccionar a los 429 después de recibirlos.
+    Un bucket que se rellena de forma continua pero arranca lleno permitiría
+    hasta el doble de la cuota durante el primer minuto.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None):
+        self.requests_per_minute = int(requests_per_minute)
+        self.tokens_per_minute = int(tokens_per_minute) if tokens_per_minute else None
+
+        # (instante, tokens) de cada solicitud dentro de la ventana
+        self._window = deque()
+        self._window_tokens = 0
+        self._paused_until = 0.0
+        self._lock = None
+        self._lock_loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # El lock se crea dentro del loop que lo usa (cada corrida puede usar un loop nuevo)
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _expire(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= QUOTA_WINDOW:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """Segundos que faltan para poder enviar una solicitud con `tokens`"""
+        wait = max(0.0, self._paused_until - now)
+        if len(self._window) >= self.requests_per_minute:
+            oldest = self._window[len(self._window) - self.requests_per_minute][0]
+            wait = max(wait, oldest + QUOTA_WINDOW - now)
+        if self.tokens_per_minute and self._window_tokens + tokens > self.tokens_per_minute:
+            # Liberar las solicitudes más antiguas hasta que quepa la nueva
+            excess = self._window_tokens + tokens - self.tokens_per_minute
+            for timestamp, used in self._window:
+                excess -= used
+                if excess <= 0:
+                    wait = max(wait, timestamp + QUOTA_WINDOW - now)
+                    break
+        return wait
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """
+        Espera hasta que haya cupo para una solicitud de `tokens` tokens y lo consume
+        """
+        if self.tokens_per_minute:
+            # Una solicitud mayor que la cuota completa se permite con la ventana vacía
+            tokens = min(tokens, self.tokens_per_minute)
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                wait = self._wait_time(tokens, now)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            self._window.append((time.monotonic(), tokens))
+            self._window_tokens += tokens
+
+    def penalize(self, delay: float) -> None:
+        """
+        Pausa todas las solicitudes durante `delay` segundos (p. ej. tras un 429)
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
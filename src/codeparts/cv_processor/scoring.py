@@ -0,0 +1,205 @@
+"""
+Motor de puntaje vectorizado: evalúa un lote de candidatos contra todos los
+perfiles de JOB_PROFILES en una sola pasada con NumPy.
+
+Reproduce exactamente `is_candidate_suitable` (ver tools/check_scoring_parity.py).
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .profile_index import ProfileIndex, candidate_features, get_profile_index
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+
+def _positions(lists: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Matriz perfiles × posición con los IDs de cada lista (-1 de relleno) y su máscara
+    """
+    width = max((len(items) for items in lists), default=0)
+    ids = np.full((len(lists), width), -1, dtype=np.int64)
+    for row, items in enumerate(lists):
+        ids[row, :len(items)] = items
+    return ids, ids >= 0
+
+
+class ScoringEngine:
+    """
+    Compila un ProfileIndex en matrices de IDs de tokens:
+    - habilidades × vocabulario (palabras de cada habilidad)
+    - perfiles × posición para habilidades requeridas/deseables e idiomas
+    y puntúa candidatos × perfiles con productos de matrices.
+    """
+
+    def __init__(self, index: Optional[ProfileIndex] = None):
+        self.index = index or get_profile_index()
+        profiles = list(self.index.profiles.values())
+        self.profile_names = [perfil.name for perfil in profiles]
+        self._profile_column = {name: column for column, name in enumerate(self.profile_names)}
+
+        language_ids: Dict[str, int] = {}
+        required_languages = [[language_ids.setdefault(i, len(language_ids)) for i in p.required_languages]
+                              for p in profiles]
+        preferred_languages = [[language_ids.setdefault(i, len(language_ids)) for i in p.preferred_languages]
+                               for p in profiles]
+        self.skills = self.index.skills
+        self.languages = list(language_ids)
+
+        # Vocabulario de palabras de las habilidades
+        self.vocabulary = self.index.vocabulary
+        self._word_ids = {word: i for i, word in enumerate(self.vocabulary)}
+        self._skill_words = np.zeros((len(self.skills), len(self.vocabulary)), dtype=np.float64)
+        for row, words in enumerate(self.index.skill_words):
+            self._skill_words[row, [self._word_ids[w] for w in words]] = 1.0
+        self._skill_sizes = self._skill_words.sum(axis=1)
+
+        # Peso de cada posición, calculado igual que en la referencia
+        required = [list(p.required) for p in profiles]
+        preferred = [list(p.preferred) for p in profiles]
+        self._required, self._required_mask = _positions(required)
+        self._preferred, self._preferred_mask = _positions(preferred)
+        self._required_weight = np.array([50 / (len(r) if r else 1) for r in required])
+        self._preferred_weight = np.array([30 / len(p) if p else 0.0 for p in preferred])
+        self._required_languages, self._required_languages_mask = _positions(required_languages)
+        self._preferred_languages, self._preferred_languages_mask = _positions(preferred_languages)
+        self._required_language_weight = np.array([7 / len(i) if i else 0.0 for i in required_languages])
+        self._preferred_language_weight = np.array([3 / len(i) if i else 0.0 for i in preferred_languages])
+
+        self._min_years = np.array([p.min_experience_years for p in profiles], dtype=np.int64)
+        self._min_score = np.array([p.min_score for p in profiles], dtype=np.float64)
+
+    def _phrase_features(self, phrase: str) -> Tuple[List[int], List[int]]:
+        """
+        Para una frase del candidato: IDs de las palabras del vocabulario que
+        contiene y de las que aparecen como subcadena
+        """
+        words = [self._word_ids[w] for w in set(phrase.split()) if w in self._word_ids]
+        substrings = [self._word_ids[w] for w in self.index.words_in(phrase)]
+        return words, substrings
+
+    def profile_column(self, puesto: str) -> int:
+        return self._profile_column[puesto.lower()]
+
+    def _best_skill_matches(self, candidates_phrases: List[List[str]]) -> np.ndarray:
+        """
+        Mejor coincidencia (0 a 1) de cada habilidad de los perfiles: candidatos × habilidades
+        """
+        best = np.zeros((len(candidates_phrases), len(self.skills)))
+        unique = {}
+        for phrases in candidates_phrases:
+            for phrase in phrases:
+                unique.setdefault(phrase, len(unique))
+        if not unique or not self.skills:
+            return best
+
+        words = np.zeros((len(unique), len(self.vocabulary)))
+        substrings = np.zeros((len(unique), len(self.vocabulary)))
+        for phrase, row in unique.items():
+            word_ids, substring_ids = self._phrase_features(phrase)
+            words[row, word_ids] = 1.0
+            substrings[row, substring_ids] = 1.0
+
+        # Fracción de palabras de la habilidad presentes en la frase, o 0.75 si alguna es subcadena
+        sizes = np.where(self._skill_sizes > 0, self._skill_sizes, 1.0)
+        overlap = (words @ self._skill_words.T) / sizes
+        partial = np.where((substrings @ self._skill_words.T) > 0, 0.75, 0.0)
+        matches = np.maximum(overlap, partial)
+
+        rows = [unique[phrase] for phrases in candidates_phrases for phrase in phrases]
+        counts = np.array([len(phrases) for phrases in candidates_phrases])
+        has_phrases = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has_phrases]
+        best[has_phrases] = np.maximum.reduceat(matches[rows], starts, axis=0)
+        return best
+
+    @staticmethod
+    def _accumulate(scores: np.ndarray, values: np.ndarray, ids: np.ndarray, mask: np.ndarray,
+                    weights: np.ndarray) -> None:
+        """
+        Suma posición por posición, en el mismo orden que la referencia,
+        para obtener exactamente los mismos flotantes
+        """
+        for position in range(ids.shape[1]):
+            columns = np.flatnonzero(mask[:, position])
+            if columns.size:
+                scores[:, columns] += weights[columns] * values[:, ids[columns, position]]
+
+    def score_batch(self, cv_datas: Sequence[dict], chunk_size: int = 1024) -> np.ndarray:
+        """
+        Puntajes candidatos × perfiles (en el orden de `profile_names`),
+        procesados en bloques para acotar el tamaño de las matrices intermedias
+        """
+        cv_datas = list(cv_datas)
+        if len(cv_datas) <= chunk_size:
+            return self._score_chunk(cv_datas)
+        return np.vstack([self._score_chunk(cv_datas[start:start + chunk_size])
+                          for start in range(0, len(cv_datas), chunk_size)])
+
+    def _score_chunk(self, cv_datas: List[dict]) -> np.ndarray:
+        valid = np.zeros(len(cv_datas), dtype=bool)
+        features = []
+        for row, cv_data in enumerate(cv_datas):
+            if not cv_data or not isinstance(cv_data, dict):
+                features.append(([], [], 0))
+                continue
+            try:
+                features.append(candidate_features(cv_data))
+                valid[row] = True
+            except Exception as e:
+                logger.error(f"Error al leer los datos del candidato: {str(e)}")
+                features.append(([], [], 0))
+
+        scores = np.zeros((len(cv_datas), len(self.profile_names)))
+
+        # Habilidades requeridas (50%) y deseables (30%)
+        best = self._best_skill_matches([phrases for phrases, _, _ in features])
+        self._accumulate(scores, best, self._required, self._required_mask, self._required_weight)
+        self._accumulate(scores, best, self._preferred, self._preferred_mask, self._preferred_weight)
+
+        # Idiomas requeridos (7%) y deseables (3%)
+        spoken = np.array([
+            [any(idioma in i for i in idiomas) for idioma in self.languages]
+            for _, idiomas, _ in features
+        ], dtype=np.float64).reshape(len(cv_datas), len(self.languages))
+        self._accumulate(scores, spoken, self._required_languages, self._required_languages_mask,
+                         self._required_language_weight)
+        self._accumulate(scores, spoken, self._preferred_languages, self._preferred_languages_mask,
+                         self._preferred_language_weight)
+
+        # Bonus por experiencia (hasta 10% extra)
+        years = np.array([años for _, _, años in features], dtype=np.int64)[:, None]
+        bonus = np.minimum(10, (years - self._min_years + 1) * 2.5)
+        scores = np.where(years >= self._min_years, np.minimum(100, scores + bonus), scores)
+
+        # Bonus por coincidencias parciales (hasta 10% extra)
+        scores = np.where(scores >= 40, np.minimum(100, scores + 10), scores)
+
+        # round() de Python redondea distinto a np.round en algunos casos
+        scores = np.array([[round(value, 1) for value in row] for row in scores.tolist()],
+                          dtype=np.float64).reshape(scores.shape)
+        scores[~valid] = 0.0
+        return scores
+
+    def suitable(self, scores: np.ndarray) -> np.ndarray:
+        """Matriz booleana de candidatos aptos por perfil"""
+        return scores >= self._min_score
+
+
+_engine: Optional[ScoringEngine] = None
+
+
+def get_scoring_engine() -> ScoringEngine:
+    """
+    Motor compartido, compilado la primera vez que se usa y de nuevo cuando
+    el índice de perfiles se reconstruye
+    """
+    global _engine
+    index = get_profile_index()
+    if _engine is None or _engine.index is not index:
+        _engine = ScoringEngine(index)
+    return _engine
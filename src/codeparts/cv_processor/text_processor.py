@@ -1,14 +1,59 @@
 import re
-import spacy
-from typing import Set
+import bisect
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Set
 from system.config import CV_PROCESSOR_CONFIG
 
+from . import nlp_models
+
+
+@lru_cache(maxsize=None)
+def _compile_terms(terms: frozenset, suffix: str = "") -> re.Pattern:
+    """
+    Compila una sola alternancia para un vocabulario; las alternativas más
+    largas van primero para que una frase gane sobre una palabra que la inicia
+    """
+    alternatives = sorted(terms, key=lambda term: (-len(term), term))
+    return re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in alternatives) + r')\b' + suffix,
+                      flags=re.IGNORECASE)
+
+
+def _terms_pattern(*vocabularies: Iterable[str], suffix: str = "") -> re.Pattern:
+    terms = frozenset(term for vocabulary in vocabularies for term in vocabulary if term)
+    return _compile_terms(terms, suffix)
+
+
+@dataclass
+class CVFeatures:
+    """Resultado de TextProcessor.extract_all"""
+    keywords: Dict[str, List[str]] = field(default_factory=dict)
+    soft_skills: List[str] = field(default_factory=list)
+    certifications: Dict[str, List[str]] = field(default_factory=dict)
+    languages: Dict[str, str] = field(default_factory=dict)
+    token_count: int = 0
+
+    @property
+    def match_count(self) -> int:
+        """Total de términos encontrados"""
+        return (sum(len(terms) for terms in self.keywords.values()) + len(self.soft_skills) +
+                sum(len(certs) for certs in self.certifications.values()) + len(self.languages))
+
+
 class TextProcessor:
-    def __init__(self):
-        self.nlp = spacy.load(CV_PROCESSOR_CONFIG["nlp_model"])
+    def __init__(self, cache_size: int = 64):
         self.blocked_patterns = CV_PROCESSOR_CONFIG["blocked_patterns"]
         self.titles = CV_PROCESSOR_CONFIG["titles"]
         self.common_names = CV_PROCESSOR_CONFIG["common_names"]
+
+        # Patrones precompilados: uno por vocabulario y uno combinado para process_text
+        self._blocked_pattern = _terms_pattern(self.blocked_patterns)
+        self._names_pattern = _terms_pattern(self.common_names)
+        self._titles_pattern = _terms_pattern(self.titles, suffix=r'\.?')
+        self._removal_pattern = _terms_pattern(self.blocked_patterns, self.common_names, self.titles, suffix=r'\.?')
+
+        # Cada extract_* procesa el mismo texto; se memoriza por texto de entrada
+        self._process_cached = lru_cache(maxsize=cache_size)(self._process_text)
         
         # Keywords profesionales por área
         self.professional_keywords = {
@@ -42,6 +87,30 @@ class TextProcessor:
             'portugués', 'chino', 'japonés', 'coreano'
         ]
 
+        # Diccionario combinado para extract_all, memorizado por texto de entrada
+        self._build_dictionary()
+        self._extract_cached = lru_cache(maxsize=cache_size)(self._extract_all)
+
+    @property
+    def nlp(self):
+        """Modelo de spaCy compartido; se carga la primera vez que se usa"""
+        return nlp_models.get_nlp()
+
+    def extract_entities_many(self, texts: Iterable[str]) -> Iterator[Dict[str, List[str]]]:
+        """
+        Entidades nombradas ({etiqueta: [textos]}) de varios textos, procesados
+        en streaming por lotes con nlp.pipe
+        """
+        for doc in nlp_models.pipe(texts):
+            entities: Dict[str, List[str]] = {}
+            for ent in doc.ents:
+                entities.setdefault(ent.label_, []).append(ent.text)
+            yield entities
+
+    def extract_entities(self, text: str) -> Dict[str, List[str]]:
+        """Entidades nombradas de un texto"""
+        return next(self.extract_entities_many([text]))
+
     def clean_text(self, text: str) -> str:
         """Limpia el texto eliminando caracteres especiales y normalizando espacios"""
         # Convertir a minúsculas
@@ -57,92 +126,114 @@ class TextProcessor:
 
     def remove_blocked_patterns(self, text: str) -> str:
         """Elimina patrones bloqueados del texto"""
-        for pattern in self.blocked_patterns:
-            text = re.sub(r'\b' + re.escape(pattern) + r'\b', '', text, flags=re.IGNORECASE)
-        return text
+        return self._blocked_pattern.sub('', text)
 
     def remove_common_names(self, text: str) -> str:
         """Elimina nombres comunes del texto"""
-        for name in self.common_names:
-            text = re.sub(r'\b' + re.escape(name) + r'\b', '', text, flags=re.IGNORECASE)
-        return text
+        return self._names_pattern.sub('', text)
 
     def remove_titles(self, text: str) -> str:
         """Elimina títulos académicos y profesionales del texto"""
-        for title in self.titles:
-            text = re.sub(r'\b' + re.escape(title) + r'\b\.?', '', text, flags=re.IGNORECASE)
-        return text
+        return self._titles_pattern.sub('', text)
 
-    def process_text(self, text: str) -> str:
-        """Procesa el texto aplicando todas las transformaciones necesarias"""
+    def _process_text(self, text: str) -> str:
         text = self.clean_text(text)
-        text = self.remove_blocked_patterns(text)
-        text = self.remove_common_names(text)
-        text = self.remove_titles(text)
+        # Patrones bloqueados, nombres comunes y títulos en una sola pasada
+        text = self._removal_pattern.sub('', text)
         text = re.sub(r'\s+', ' ', text)  # Normalizar espacios nuevamente
         return text.strip()
 
+    def process_text(self, text: str) -> str:
+        """Procesa el texto aplicando todas las transformaciones necesarias"""
+        return self._process_cached(text)
+
+    def _build_dictionary(self) -> None:
+        """
+        Une keywords, habilidades blandas, certificaciones e idiomas en un solo
+        diccionario frase normalizada (tupla de tokens) -> [(categoría, área, término)]
+        """
+        entries = []
+        for area, keywords in self.professional_keywords.items():
+            entries.extend(('keywords', area, keyword) for keyword in keywords)
+        entries.extend(('soft_skills', None, skill) for skill in self.soft_skills)
+        for area, certs in self.certifications.items():
+            entries.extend(('certifications', area, cert) for cert in certs)
+        entries.extend(('languages', None, lang) for lang in self.languages)
+
+        self._dictionary = {}
+        for entry in entries:
+            # Los guiones bajos de los términos equivalen a espacios en el texto
+            tokens = tuple(self.clean_text(entry[2].replace('_', ' ')).split())
+            if tokens:
+                self._dictionary.setdefault(tokens, []).append(entry)
+        self._max_ngram = max((len(tokens) for tokens in self._dictionary), default=0)
+
+    def _extract_all(self, text: str) -> CVFeatures:
+        # Normalizar y tokenizar una sola vez
+        cleaned = self.clean_text(text)
+        tokens = []
+        starts = []
+        for match in re.finditer(r'\S+', cleaned):
+            tokens.append(match.group())
+            starts.append(match.start())
+
+        # Tokens que process_text eliminaría (patrones bloqueados, nombres y títulos)
+        removed = [False] * len(tokens)
+        for match in self._removal_pattern.finditer(cleaned):
+            first = bisect.bisect_left(starts, match.start())
+            last = bisect.bisect_left(starts, match.end())
+            for i in range(first, last):
+                removed[i] = True
+
+        found = set()
+        for i in range(len(tokens)):
+            for n in range(1, min(self._max_ngram, len(tokens) - i) + 1):
+                for entry in self._dictionary.get(tuple(tokens[i:i + n]), ()):
+                    # Los idiomas también son patrones bloqueados; para ellos se ignora la eliminación
+                    if entry[0] == 'languages' or not any(removed[i:i + n]):
+                        found.add(entry)
+
+        # Mismo orden que los diccionarios de origen
+        keywords = {}
+        for area, terms in self.professional_keywords.items():
+            matched = [term for term in terms if ('keywords', area, term) in found]
+            if matched:
+                keywords[area] = matched
+        certifications = {}
+        for area, certs in self.certifications.items():
+            matched = [cert for cert in certs if ('certifications', area, cert) in found]
+            if matched:
+                certifications[area] = matched
+        return CVFeatures(
+            keywords=keywords,
+            soft_skills=[skill for skill in self.soft_skills if ('soft_skills', None, skill) in found],
+            certifications=certifications,
+            languages={lang: "no especificado" for lang in self.languages if ('languages', None, lang) in found},
+            token_count=len(tokens)
+        )
+
+    def extract_all(self, text: str) -> CVFeatures:
+        """
+        Extrae keywords, habilidades blandas, certificaciones e idiomas en una
+        sola pasada sobre el texto (normalizado y tokenizado una vez)
+        """
+        if not text:
+            return CVFeatures()
+        return self._extract_cached(text)
+
     def extract_keywords(self, text: str) -> dict:
         """Extrae keywords profesionales del texto."""
-        if not text:
-            return {}
-        
-        text = self.process_text(text)
-        found_keywords = {}
-        
-        for area, keywords in self.professional_keywords.items():
-            found = []
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    found.append(keyword)
-            if found:
-                found_keywords[area] = found
-        
-        return found_keywords
+        return self.extract_all(text).keywords
 
     def extract_soft_skills(self, text: str) -> list:
         """Extrae habilidades blandas del texto."""
-        if not text:
-            return []
-        
-        text = self.process_text(text)
-        found_skills = []
-        
-        for skill in self.soft_skills:
-            if skill.lower() in text:
-                found_skills.append(skill)
-        
-        return found_skills
+        return self.extract_all(text).soft_skills
 
     def extract_certifications(self, text: str) -> dict:
         """Extrae certificaciones del texto."""
-        if not text:
-            return {}
-        
-        text = self.process_text(text)
-        found_certs = {}
-        
-        for area, certs in self.certifications.items():
-            found = []
-            for cert in certs:
-                if cert.lower() in text:
-                    found.append(cert)
-            if found:
-                found_certs[area] = found
-        
-        return found_certs
+        return self.extract_all(text).certifications
 
     def extract_languages(self, text: str) -> dict:
         """Extrae idiomas del texto."""
-        if not text:
-            return {}
-        
-        text = self.process_text(text)
-        found_languages = {}
-        
-        for lang in self.languages:
-            if lang.lower() in text:
-                # Por ahora solo marcamos como "encontrado"
-                found_languages[lang] = "no especificado"
-        
-        return found_languages
+        # Por ahora solo marcamos como "encontrado"
+        return self.extract_all(text).languages
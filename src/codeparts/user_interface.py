@@ -1,4 +1,5 @@
 import os
+import time
 import asyncio
 from datetime import datetime
 from InquirerPy import inquirer
@@ -13,6 +14,8 @@ from system.config import (
     UI_SYMBOLS, 
     LASTVERSION, 
     CURRICULUMS_FOLDER,
+    WINDA_CONFIG,
+    WINDA_VALIDATOR_FOLDER,
     Ascii_logo, 
     clear_screen,
     set_console_title,
@@ -21,7 +24,10 @@ from system.config import (
 from codeparts.email_rewriter import rewrite_menu
 from codeparts.sicaru_ia import sicaru_assistant_menu
 from codeparts.get_certificate import download_certificate
-from codeparts.winda_validator import WindaValidator
+from codeparts.winda_validator import (
+    WindaValidator, days_to_expiry, get_cookie_manager, winda_cache, winda_cache_key
+)
+from codeparts.winda_bulk import WindaBulkValidator, expiring_lookups, load_winda_ids
 from codeparts.pdf_converter import PDFConverter
 from termcolor import colored
 import colorama
@@ -47,6 +53,17 @@ class UserInterface:
         f.seek(0)
         return f.read()
 
+    @staticmethod
+    def cache_ttl_text():
+        """Duración legible de WINDA_CONFIG["cache"]["ttl"], p. ej. '1 día' o '12 horas'"""
+        ttl = WINDA_CONFIG["cache"]["ttl"]
+        for seconds, singular, plural in ((86400, "día", "días"), (3600, "hora", "horas"), (60, "minuto", "minutos")):
+            if ttl >= seconds:
+                amount = round(ttl / seconds, 1)
+                amount = int(amount) if amount == int(amount) else amount
+                return f"{amount} {singular if amount == 1 else plural}"
+        return f"{ttl:g} segundos"
+
     @staticmethod
     async def main_menu():
         set_console_title(f'CJR Toolkit v{LASTVERSION} - Menú Principal')
@@ -174,6 +191,7 @@ class UserInterface:
                 Separator(),
                 Choice("Oficina", "Candidatos para puestos administrativos"),
                 Choice("Técnicos", "Candidatos para puestos técnicos"),
+                Choice("todas", "Evaluar todas las vacantes a la vez"),
                 Separator("\n"),
                 Choice("volver", "Volver al menú principal"),
                 Separator()
@@ -187,6 +205,20 @@ class UserInterface:
         if tipo_candidato == "volver":
             return
 
+        if tipo_candidato == "todas":
+            clear_screen()
+            Ascii_logo()
+            print("\n   Iniciando procesamiento de CVs para todas las vacantes...")
+
+            # Cada CV se analiza una vez y se evalúa contra todas las vacantes
+            processor = CVProcessor(os.getcwd())
+            vacancy_results = processor.process_all_vacancies()
+            if vacancy_results:
+                processor.display_vacancy_results(vacancy_results)
+
+            await inquirer.text(message="Presione Enter para continuar...", qmark='   >', style=style).execute_async()
+            return
+
         clear_screen()
         Ascii_logo()
 
@@ -253,6 +285,15 @@ class UserInterface:
 
     @staticmethod
     async def validate_winda_id():
+        # Mantener la sesión vigente mientras el validador está abierto
+        refresher = asyncio.create_task(get_cookie_manager().keep_fresh())
+        try:
+            await UserInterface._validate_winda_id_loop()
+        finally:
+            refresher.cancel()
+
+    @staticmethod
+    async def _validate_winda_id_loop():
         while True:
             clear_screen()
             Ascii_logo()
@@ -278,8 +319,10 @@ class UserInterface:
             clear_screen()
             Ascii_logo()
             print("\n")
+            print(f"   Los resultados se guardan por {UserInterface.cache_ttl_text()}; escriba '!' antes del ID o de la ruta para consultar")
+            print("   de nuevo a Winda, o 'vencer' para ver los certificados por vencer ya consultados.\n")
             winda_id = await inquirer.text(
-                message="Ingrese el Winda ID (o 'q' para volver al menú principal):",
+                message="Ingrese el Winda ID o la ruta de un CSV/XLSX con varios IDs (o 'q' para volver al menú principal):",
                 qmark="   >",
                 validate=EmptyInputValidator("Este campo no puede estar vacío."),
                 style=style
@@ -289,21 +332,30 @@ class UserInterface:
                 set_console_title(f'CJR Toolkit v{LASTVERSION} - Menú Principal')
                 break
 
+            if winda_id.strip().lower() == 'vencer':
+                UserInterface.show_expiring_certificates()
+                await inquirer.text(message="Presione Enter para continuar...", qmark='   >', style=style).execute_async()
+                continue
+
+            force_refresh = winda_id.strip().startswith('!')
+            winda_id = winda_id.strip().lstrip('!').strip()
+            roster_path = winda_id.strip('"')
+            if roster_path.lower().endswith(('.csv', '.xlsx', '.xls')):
+                await UserInterface.validate_winda_roster(roster_path, force_refresh)
+                await inquirer.text(message="Presione Enter para continuar...", qmark='   >', style=style).execute_async()
+                continue
+
             print("\n")
             
-            data = await WindaValidator.fetch_winda_data(winda_id)
+            data = await WindaValidator.fetch_winda_data(winda_id, force_refresh)
             if data:
                 clear_screen()
                 formatted_data = []
                 for entry in data:
                     valid_to = entry.get('ValidTo', 'N/A')
                     if valid_to != 'N/A':
-                        try:
-                            valid_to_date = datetime.strptime(valid_to, '%Y-%m-%d').date()
-                            days_left = (valid_to_date - datetime.now().date()).days
-                            status = f"{days_left} días"
-                        except ValueError:
-                            status = "Fecha inválida"
+                        days_left = days_to_expiry(valid_to)
+                        status = f"{days_left} días" if days_left is not None else "Fecha inválida"
                     else:
                         status = "N/A"
                     
@@ -319,6 +371,10 @@ class UserInterface:
                     formatted_data.append(formatted_entry)
                 Ascii_logo()
                 print("\n    Datos recuperados exitosamente:\n")
+                record = winda_cache().get(winda_cache_key(winda_id))
+                if record and time.time() - record["fetched_at"] >= 60:
+                    fetched_at = datetime.fromtimestamp(record["fetched_at"])
+                    print(f"    Resultado guardado el {fetched_at:%d/%m/%Y %H:%M} (escriba !{winda_id} para actualizarlo)\n")
                 # Acortar los nombres de las columnas para que la tabla sea más angosta
                 formatted_data_compact = []
                 for entry in formatted_data:
@@ -344,7 +400,7 @@ class UserInterface:
                     qmark='',
                     instruction=''
                 ).execute_async():
-                    cookies = WindaValidator.load_cookies()
+                    cookies, _ = get_cookie_manager().get_cookies()
                     person_name = data[0]['Nombre completo']
                     download_certificate(winda_id, cookies, person_name)
             else:
@@ -354,6 +410,64 @@ class UserInterface:
 
             await inquirer.text(message="Presione Enter para continuar...", qmark='   >', style=style).execute_async()
 
+    @staticmethod
+    async def validate_winda_roster(path, force_refresh=False):
+        """Valida todos los Winda IDs de un CSV/XLSX y guarda el reporte consolidado"""
+        try:
+            winda_ids = load_winda_ids(path)
+        except Exception as e:
+            print(f"\n   No se pudo leer la lista de IDs: {str(e)}\n")
+            return
+        if not winda_ids:
+            print("\n   El archivo no contiene Winda IDs.\n")
+            return
+
+        print(f"\n   Validando {len(winda_ids)} Winda IDs...\n")
+        validator = WindaBulkValidator()
+
+        def on_result(lookup, done, total):
+            estado = "error" if lookup.error else f"{len(lookup.certificates)} certificados"
+            origen = " (caché)" if lookup.cached else ""
+            print(f"   [{done}/{total}] {lookup.winda_id}: {estado}{origen}")
+
+        started_at = datetime.now()
+        lookups = await asyncio.to_thread(validator.validate, winda_ids, on_result, force_refresh)
+        report_path = validator.write_report(lookups)
+        elapsed = (datetime.now() - started_at).total_seconds()
+
+        rows = validator.report_rows(lookups)
+        summary = {}
+        for row in rows:
+            status = row["Estatus"] if not row["Estatus"].startswith("Error") else "Error"
+            summary[status] = summary.get(status, 0) + 1
+        cached = sum(1 for lookup in lookups if lookup.cached)
+        print(f"\n   {len(winda_ids)} IDs validados en {elapsed:.1f} s ({cached} desde el caché)")
+        print("   " + ", ".join(f"{status}: {count}" for status, count in summary.items()))
+        print(f"   Reporte guardado en {report_path}\n")
+
+    @staticmethod
+    def show_expiring_certificates():
+        """Certificados por vencer según los resultados guardados, sin consultar a Winda"""
+        within_days = WINDA_CONFIG["cache"]["expiring_days"]
+        lookups = expiring_lookups(within_days)
+        if not lookups:
+            print(f"\n   Ningún certificado consultado vence en los próximos {within_days} días.\n")
+            return
+
+        validator = WindaBulkValidator(expiring_days=within_days)
+        rows = validator.report_rows(lookups)
+        table = tabulate(
+            [{"ID": row["Winda ID"], "Nombre": row["Nombre completo"], "Curso": row["Título del curso"],
+              "Válido hasta": row["Válido hasta"], "Días": row["Días para vencer"],
+              "Consultado el": row["Consultado el"]} for row in rows],
+            headers="keys", tablefmt="heavy_grid"
+        )
+        print(f"\n    Certificados vencidos o por vencer en los próximos {within_days} días:\n")
+        print("\n".join(" " * 4 + line for line in table.split("\n")) + "\n")
+        report_path = validator.write_report(
+            lookups, os.path.join(WINDA_VALIDATOR_FOLDER, f"por_vencer_{datetime.now():%Y%m%d_%H%M%S}.xlsx"))
+        print(f"   Reporte guardado en {report_path}\n")
+
     @staticmethod
     async def run():
         await UserInterface.main_menu()
@@ -0,0 +1,119 @@
+"""
+Archivos cifrados con Fernet que se descifran una sola vez por sesión: el
+contenido queda en memoria y solo se vuelve a leer si el archivo cambia en
+disco (otro proceso, otro inicio de sesión). Las escrituras son atómicas:
+se escribe un archivo temporal en la misma carpeta y se reemplaza el original.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cryptography.fernet import Fernet, InvalidToken
+from system.config import COOKIE_ENCRYPTION_KEY
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+_MISSING = object()
+
+
+class EncryptedFileVault:
+    """
+    Contenido descifrado de un archivo, en memoria. Cada lectura solo hace
+    un `stat` para detectar cambios externos; `generation` aumenta cada vez
+    que el contenido cambia (lectura de una versión nueva o escritura).
+    """
+
+    def __init__(self, path: str, encode: Callable[[Any], str] = json.dumps,
+                 decode: Callable[[str], Any] = json.loads, discard_invalid: bool = False):
+        self.path = path
+        self.encode = encode
+        self.decode = decode
+        # Borrar el archivo si no se puede descifrar (p. ej. cookies con otra clave)
+        self.discard_invalid = discard_invalid
+        self.generation = 0
+        self.decryptions = 0
+        self._fernet = Fernet(COOKIE_ENCRYPTION_KEY)
+        self._value = _MISSING
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self) -> Any:
+        """Contenido descifrado, o None si el archivo no existe o no es válido"""
+        with self._lock:
+            signature = self._stat()
+            if self._value is not _MISSING and signature == self._signature:
+                return self._value
+
+            value = None
+            if signature is not None:
+                try:
+                    with open(self.path, 'rb') as file:
+                        encrypted = file.read()
+                    self.decryptions += 1
+                    value = self.decode(self._fernet.decrypt(encrypted).decode())
+                except (OSError, InvalidToken, ValueError, TypeError) as e:
+                    logger.error(f"   Error al leer {os.path.basename(self.path)}: {str(e) or type(e).__name__}")
+                    if self.discard_invalid:
+                        try:
+                            os.remove(self.path)
+                        except OSError:
+                            pass
+                        signature = None
+            self._value, self._signature = value, signature
+            self.generation += 1
+            return value
+
+    def write(self, value: Any) -> None:
+        """Cifra y reemplaza el archivo de forma atómica"""
+        encrypted = self._fernet.encrypt(self.encode(value).encode())
+        folder = os.path.dirname(self.path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        with self._lock:
+            fd, temp_path = tempfile.mkstemp(dir=folder, prefix='.' + os.path.basename(self.path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(encrypted)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temp_path, self.path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._value, self._signature = value, self._stat()
+            self.generation += 1
+
+    def clear(self) -> None:
+        """Borra el archivo y el contenido en memoria"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._value, self._signature = None, None
+            self.generation += 1
+
+
+_vaults: Dict[str, EncryptedFileVault] = {}
+_vaults_lock = threading.Lock()
+
+
+def get_vault(path: str, **options) -> EncryptedFileVault:
+    """Vault de la sesión para `path` (uno por archivo)"""
+    path = os.path.abspath(path)
+    with _vaults_lock:
+        vault = _vaults.get(path)
+        if vault is None:
+            vault = _vaults[path] = EncryptedFileVault(path, **options)
+        return vault
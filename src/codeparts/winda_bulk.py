@@ -0,0 +1,249 @@
+"""
+Validación masiva de Winda IDs: lee una lista de IDs (CSV o XLSX), consulta
+cada uno en paralelo sobre la sesión HTTP compartida (conexiones keep-alive)
+y genera un reporte consolidado con los días que faltan para cada vencimiento.
+Los IDs consultados recientemente se responden desde el caché de resultados,
+que también alimenta el reporte de certificados por vencer.
+"""
+
+import os
+import csv
+import logging
+from datetime import datetime
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+import requests
+import pandas as pd
+
+from system.config import WINDA_CONFIG, WINDA_VALIDATOR_FOLDER
+from codeparts.winda_validator import (
+    WindaValidator, cached_winda_record, days_to_expiry, get_cookie_manager, get_winda_session,
+    store_winda_results, winda_cache
+)
+
+# Configurar logger para que solo muestre errores
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+REPORT_COLUMNS = ["Winda ID", "Nombre completo", "País", "Título del curso", "Proveedor del curso",
+                  "Válido desde", "Válido hasta", "Días para vencer", "Estatus", "Consultado el"]
+
+
+@dataclass
+class WindaLookup:
+    """Resultado de consultar un Winda ID"""
+    winda_id: str
+    certificates: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    fetched_at: Optional[float] = None  # Instante de la consulta a Winda
+    cached: bool = False  # True si el resultado vino del caché
+
+
+def _csv_separator(path: str) -> str:
+    """Separador del CSV entre los habituales; coma si el archivo tiene una sola columna"""
+    with open(path, newline='', encoding='utf-8-sig', errors='replace') as file:
+        sample = file.read(4096)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return ','
+
+
+def load_winda_ids(path: str) -> List[str]:
+    """
+    IDs de un CSV o XLSX, sin repetir y en el orden del archivo; se usa la
+    columna de WINDA_CONFIG["bulk"]["id_columns"] o, si ningún encabezado
+    coincide, la primera columna leyendo el archivo sin encabezado (una
+    lista simple de IDs)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        separator = _csv_separator(path)
+        read = lambda **options: pd.read_csv(path, dtype=str, sep=separator, **options)
+    elif extension in ('.xlsx', '.xls'):
+        read = lambda **options: pd.read_excel(path, dtype=str, **options)
+    else:
+        raise ValueError(f"Formato no soportado (use CSV o XLSX): {path}")
+    try:
+        frame = read()
+    except pd.errors.EmptyDataError:
+        return []
+
+    columns = {str(column).strip().lower(): column for column in frame.columns}
+    column = next((columns[name] for name in WINDA_CONFIG["bulk"]["id_columns"] if name in columns), None)
+    if column is None:
+        frame = read(header=None)
+        if frame.columns.empty:
+            return []
+        column = frame.columns[0]
+    ids = []
+    seen = set()
+    for value in frame[column].dropna():
+        winda_id = str(value).strip()
+        if winda_id and winda_id not in seen:
+            seen.add(winda_id)
+            ids.append(winda_id)
+    return ids
+
+
+def certificate_status(days: Optional[int], expiring_days: int) -> str:
+    if days is None:
+        return "Fecha inválida"
+    if days < 0:
+        return "Vencido"
+    if days <= expiring_days:
+        return "Por vencer"
+    return "Vigente"
+
+
+def expiring_lookups(within_days: Optional[int] = None, include_expired: bool = True) -> List[WindaLookup]:
+    """
+    Certificados guardados en el caché que vencen dentro de `within_days`
+    días (por defecto WINDA_CONFIG["cache"]["expiring_days"]), sin consultar
+    a Winda. Se ordenan del vencimiento más próximo al más lejano.
+    """
+    within_days = WINDA_CONFIG["cache"]["expiring_days"] if within_days is None else within_days
+    lookups = []
+    for winda_id, record in winda_cache().items().items():
+        certificates = []
+        for certificate in record["certificates"]:
+            days = days_to_expiry(certificate.get("ValidTo"))
+            if days is not None and days <= within_days and (include_expired or days >= 0):
+                certificates.append((days, certificate))
+        if certificates:
+            certificates.sort(key=lambda item: item[0])
+            lookups.append((certificates[0][0], WindaLookup(
+                winda_id, [certificate for _, certificate in certificates], fetched_at=record["fetched_at"], cached=True
+            )))
+    lookups.sort(key=lambda item: item[0])
+    return [lookup for _, lookup in lookups]
+
+
+class WindaBulkValidator:
+    """
+    Consulta muchos Winda IDs con un máximo de consultas simultáneas. Las
+    cookies vienen del administrador compartido: si la sesión expira, un
+    solo refresco atiende a todos los hilos.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, expiring_days: Optional[int] = None):
+        config = WINDA_CONFIG["bulk"]
+        self.max_concurrency = max_concurrency or config["max_concurrency"]
+        self.expiring_days = config["expiring_days"] if expiring_days is None else expiring_days
+        self.cookie_manager = get_cookie_manager()
+        # Una conexión keep-alive por consulta simultánea
+        get_winda_session(self.max_concurrency)
+
+    def lookup(self, winda_id: str, force_refresh: bool = False) -> WindaLookup:
+        """
+        Resultado de un Winda ID: del caché si sigue vigente o, si no, de
+        Winda (reintenta una vez con cookies nuevas si la respuesta no es JSON)
+        """
+        if not force_refresh:
+            record = cached_winda_record(winda_id)
+            if record is not None:
+                return WindaLookup(winda_id, record["certificates"], fetched_at=record["fetched_at"], cached=True)
+
+        cookies, version = self.cookie_manager.get_cookies()
+        for attempt in range(2):
+            if not cookies:
+                return WindaLookup(winda_id, error="No se pudieron obtener las cookies")
+            try:
+                response = WindaValidator.make_request(winda_id, cookies)
+            except requests.RequestException as e:
+                return WindaLookup(winda_id, error=f"Error de conexión: {str(e)}")
+            try:
+                certificates = WindaValidator.parse_results(response.json())
+            except (ValueError, KeyError):
+                # Una respuesta que no es JSON suele indicar que la sesión expiró
+                if attempt == 0:
+                    cookies, version = self.cookie_manager.refresh(version)
+                continue
+            record = store_winda_results(winda_id, certificates)
+            return WindaLookup(winda_id, certificates, fetched_at=record["fetched_at"])
+        return WindaLookup(winda_id, error="Respuesta inválida del servidor")
+
+    def validate(self, winda_ids: List[str],
+                 on_result: Optional[Callable[[WindaLookup, int, int], None]] = None,
+                 force_refresh: bool = False) -> List[WindaLookup]:
+        """
+        Consulta todos los IDs; `on_result(consulta, hechas, total)` recibe el
+        avance. Los que tienen un resultado vigente en el caché se responden
+        sin consultar a Winda (salvo con `force_refresh`) y el resto se consulta
+        en paralelo. Los resultados se retornan en el orden de entrada.
+        """
+        results: Dict[str, WindaLookup] = {}
+        pending = []
+        for winda_id in winda_ids:
+            record = None if force_refresh else cached_winda_record(winda_id)
+            if record is None:
+                pending.append(winda_id)
+                continue
+            results[winda_id] = WindaLookup(winda_id, record["certificates"], fetched_at=record["fetched_at"],
+                                            cached=True)
+            if on_result:
+                on_result(results[winda_id], len(results), len(winda_ids))
+
+        if pending:
+            # Sin sesión guardada se inicia sesión una vez (con las credenciales
+            # guardadas o a mano), antes de repartir las consultas
+            cookies, version = self.cookie_manager.get_cookies()
+            if not cookies and not self.cookie_manager.refresh(version)[0]:
+                WindaValidator.login_and_save_cookies()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {executor.submit(self.lookup, winda_id, True): winda_id for winda_id in pending}
+            for future in as_completed(futures):
+                winda_id = futures[future]
+                try:
+                    lookup = future.result()
+                except Exception as e:
+                    logger.error(f"Error al consultar {winda_id}: {str(e)}")
+                    lookup = WindaLookup(winda_id, error=str(e))
+                results[winda_id] = lookup
+                if on_result:
+                    on_result(lookup, len(results), len(winda_ids))
+        return [results[winda_id] for winda_id in winda_ids]
+
+    def report_rows(self, lookups: List[WindaLookup]) -> List[Dict]:
+        """Una fila por certificado (o por ID sin certificados / con error)"""
+        rows = []
+        for lookup in lookups:
+            fetched_at = f"{datetime.fromtimestamp(lookup.fetched_at):%Y-%m-%d %H:%M}" if lookup.fetched_at else None
+            if lookup.error or not lookup.certificates:
+                rows.append({
+                    "Winda ID": lookup.winda_id,
+                    "Estatus": f"Error: {lookup.error}" if lookup.error else "No encontrado",
+                    "Consultado el": fetched_at
+                })
+                continue
+            for certificate in lookup.certificates:
+                valid_from, _, valid_to = certificate.get("Validez", "").partition(" - ")
+                days = days_to_expiry(certificate.get("ValidTo"))
+                rows.append({
+                    "Winda ID": certificate.get("Winda ID", lookup.winda_id),
+                    "Nombre completo": certificate.get("Nombre completo"),
+                    "País": certificate.get("País"),
+                    "Título del curso": certificate.get("Título del curso"),
+                    "Proveedor del curso": certificate.get("Proveedor del curso"),
+                    "Válido desde": valid_from,
+                    "Válido hasta": valid_to,
+                    "Días para vencer": days,
+                    "Estatus": certificate_status(days, self.expiring_days),
+                    "Consultado el": fetched_at
+                })
+        return rows
+
+    def write_report(self, lookups: List[WindaLookup], path: Optional[str] = None) -> str:
+        """Guarda el reporte consolidado (XLSX, o CSV si `path` termina en .csv) y retorna su ruta"""
+        if path is None:
+            path = os.path.join(WINDA_VALIDATOR_FOLDER, f"reporte_winda_{datetime.now():%Y%m%d_%H%M%S}.xlsx")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        frame = pd.DataFrame(self.report_rows(lookups), columns=REPORT_COLUMNS)
+        frame["Días para vencer"] = frame["Días para vencer"].astype("Int64")
+        if path.lower().endswith('.csv'):
+            frame.to_csv(path, index=False, encoding='utf-8-sig')
+        else:
+            frame.to_excel(path, index=False, sheet_name="Winda")
+        return path
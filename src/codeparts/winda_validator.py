@@ -1,7 +1,12 @@
 import os
-import json
+import time
+import asyncio
 import logging
+import threading
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -11,12 +16,134 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
-from cryptography.fernet import Fernet, InvalidToken
-from system.config import COOKIE_ENCRYPTION_KEY, COOKIES_FILE, LOGIN_URL, SEARCH_URL, ASSETS_DIR
+from system.config import COOKIES_FILE, LOGIN_URL, SEARCH_URL, ASSETS_DIR, WINDA_CONFIG
+from codeparts.vault import get_vault
+from codeparts.app_cache import get_cache_namespace
+
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_winda_session(pool_size=None):
+    """
+    Sesión HTTP compartida con conexiones keep-alive: las consultas
+    reutilizan la conexión TLS en lugar de abrir una nueva cada vez. El pool
+    crece si se pide uno mayor (p. ej. más consultas simultáneas)
+    """
+    global _session, _session_pool_size
+    pool_size = pool_size or WINDA_CONFIG["bulk"]["max_concurrency"]
+    if _session is None or pool_size > _session_pool_size:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+            if pool_size > _session_pool_size:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                _session.mount("https://", adapter)
+                _session.mount("http://", adapter)
+                _session_pool_size = pool_size
+    return _session
+
+
+def _decode_credentials(text):
+    email, password = text.split(':', 1)
+    return email, password
+
+
+def cookie_vault():
+    """Cookies descifradas en memoria (se releen solo si el archivo cambia)"""
+    return get_vault(COOKIES_FILE, discard_invalid=True)
+
+
+def credentials_vault():
+    """Credenciales descifradas en memoria, en el formato "email:contraseña" del archivo"""
+    return get_vault(os.path.join(ASSETS_DIR, "credentials.encrypted"),
+                     encode=lambda credentials: f"{credentials[0]}:{credentials[1]}",
+                     decode=_decode_credentials)
+
+
+class _LoginFormParser(HTMLParser):
+    """Formularios de una página con sus campos (name -> value) y su action"""
+
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'form':
+            self.forms.append({"action": attrs.get('action') or '', "fields": {}})
+        elif tag == 'input' and self.forms and attrs.get('name'):
+            self.forms[-1]["fields"][attrs['name']] = attrs.get('value') or ''
+
+
+def cookies_expiry(cookies, saved_at):
+    """
+    Instante en que vence la sesión: el vencimiento más próximo de las
+    cookies de autenticación o, si no lo declaran, la vida supuesta de la sesión
+    """
+    config = WINDA_CONFIG["cookies"]
+    expiries = [
+        cookie['expiry'] for cookie in cookies
+        if cookie.get('expiry') and any(marker in cookie['name'].lower() for marker in config["auth_cookie_markers"])
+    ]
+    return min(expiries + [saved_at + config["assumed_lifetime"]])
+
+
+def days_to_expiry(valid_to):
+    """Días que faltan para `valid_to` (AAAA-MM-DD), negativos si ya venció; None si no es una fecha"""
+    try:
+        return (datetime.strptime(valid_to, '%Y-%m-%d').date() - datetime.now().date()).days
+    except (TypeError, ValueError):
+        return None
+
+
+def winda_cache():
+    """Resultados de búsqueda guardados por Winda ID: {"fetched_at": instante, "certificates": [...]}"""
+    return get_cache_namespace("winda")
+
+
+def winda_cache_key(winda_id):
+    return winda_id.strip().upper()
+
+
+def is_fresh(record, max_age=None):
+    """
+    Un resultado guardado sigue vigente si tiene menos de `max_age` segundos
+    (por defecto WINDA_CONFIG["cache"]["ttl"]) y ninguno de sus certificados
+    venció después de la consulta, porque pudo haberse renovado
+    """
+    max_age = WINDA_CONFIG["cache"]["ttl"] if max_age is None else max_age
+    if time.time() - record["fetched_at"] > max_age:
+        return False
+    days_since_fetch = (datetime.now().date() - datetime.fromtimestamp(record["fetched_at"]).date()).days
+    for certificate in record["certificates"]:
+        days = days_to_expiry(certificate.get("ValidTo"))
+        if days is not None and days < 0 <= days + days_since_fetch:
+            return False
+    return True
+
+
+def cached_winda_record(winda_id, max_age=None):
+    """Resultado guardado de `winda_id` si sigue vigente, o None si hay que consultar a Winda"""
+    record = winda_cache().get(winda_cache_key(winda_id))
+    if record and is_fresh(record, max_age):
+        return record
+    return None
+
+
+def store_winda_results(winda_id, certificates):
+    """Guarda el resultado de una consulta (también una lista vacía: el ID no existe)"""
+    record = {"fetched_at": time.time(), "certificates": certificates}
+    winda_cache().set(winda_cache_key(winda_id), record)
+    return record
+
 
 class WindaValidator:
-    @staticmethod
-    def setup_driver(headless=False):
+    _driver_path = None
+
+    @classmethod
+    def setup_driver(cls, headless=False):
         chrome_options = Options()
         if headless:
             chrome_options.add_argument("--headless")
@@ -24,7 +151,10 @@ class WindaValidator:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--start-maximized")
         try:
-            service = Service(ChromeDriverManager().install())
+            # ChromeDriverManager consulta la red; basta con hacerlo una vez por sesión
+            if cls._driver_path is None:
+                cls._driver_path = ChromeDriverManager().install()
+            service = Service(cls._driver_path)
             return webdriver.Chrome(service=service, options=chrome_options)
         except Exception as e:
             logging.error(f"   Error al inicializar ChromeDriver: {str(e)}")
@@ -32,61 +162,121 @@ class WindaValidator:
 
     @staticmethod
     def save_cookies(driver):
-        cookies = driver.get_cookies()
-        fernet = Fernet(COOKIE_ENCRYPTION_KEY)
-        encrypted_cookies = fernet.encrypt(json.dumps(cookies).encode())
-        os.makedirs(os.path.dirname(COOKIES_FILE), exist_ok=True)
-        with open(COOKIES_FILE, 'wb') as file:
-            file.write(encrypted_cookies)
+        WindaValidator.store_cookies(driver.get_cookies())
+
+    @staticmethod
+    def store_cookies(cookies):
+        """
+        Guarda cifrada una lista de cookies ({'name', 'value', ...}, como las
+        de Selenium) junto con el instante en que vence la sesión
+        """
+        saved_at = time.time()
+        record = {"saved_at": saved_at, "expires_at": cookies_expiry(cookies, saved_at), "cookies": cookies}
+        cookie_vault().write(record)
         logging.info(f"   Cookies guardadas en {COOKIES_FILE}")
 
+    @staticmethod
+    def load_cookie_record():
+        """
+        Cookies guardadas ({nombre: valor}) y el instante en que vence la
+        sesión, o (None, None); el archivo se descifra solo si cambió
+        """
+        record = cookie_vault().read()
+        if record is None:
+            return None, None
+        try:
+            if isinstance(record, list):
+                # Formato anterior: solo la lista, sin vencimiento
+                saved_at = os.path.getmtime(COOKIES_FILE)
+                record = {"cookies": record, "expires_at": cookies_expiry(record, saved_at)}
+            cookies = {cookie['name']: cookie['value'] for cookie in record["cookies"]}
+            return cookies, record.get("expires_at")
+        except (OSError, KeyError, TypeError) as e:
+            logging.error(f"   Error al cargar las cookies: {str(e)}")
+            cookie_vault().clear()
+        return None, None
+
     @staticmethod
     def load_cookies():
-        if os.path.exists(COOKIES_FILE):
-            try:
-                with open(COOKIES_FILE, 'rb') as file:
-                    encrypted_cookies = file.read()
-                fernet = Fernet(COOKIE_ENCRYPTION_KEY)
-                decrypted_cookies = fernet.decrypt(encrypted_cookies)
-                cookies = json.loads(decrypted_cookies)
-                return {cookie['name']: cookie['value'] for cookie in cookies}
-            except (InvalidToken, json.JSONDecodeError) as e:
-                logging.error(f"   Error al cargar las cookies: {str(e)}")
-                os.remove(COOKIES_FILE)
-        return None
+        return WindaValidator.load_cookie_record()[0]
 
     @staticmethod
     def save_credentials(email, password):
-        fernet = Fernet(COOKIE_ENCRYPTION_KEY)
-        encrypted_credentials = fernet.encrypt(f"{email}:{password}".encode())
-        credentials_file = os.path.join(ASSETS_DIR, "credentials.encrypted")
-        with open(credentials_file, 'wb') as file:
-            file.write(encrypted_credentials)
+        credentials_vault().write((email, password))
         logging.info("   Credenciales guardadas de forma segura")
 
     @staticmethod
     def load_credentials():
-        credentials_file = os.path.join(ASSETS_DIR, "credentials.encrypted")
-        logging.info(f"Intentando cargar credenciales desde: {credentials_file}")
-        if os.path.exists(credentials_file):
-            try:
-                with open(credentials_file, 'rb') as file:
-                    encrypted_credentials = file.read()
-                logging.info("Credenciales encriptadas leídas correctamente")
-                fernet = Fernet(COOKIE_ENCRYPTION_KEY)
-                decrypted_credentials = fernet.decrypt(encrypted_credentials).decode()
-                logging.info("Credenciales desencriptadas correctamente")
-                email, password = decrypted_credentials.split(':')
-                logging.info(f"Credenciales cargadas para el email: {email}")
-                return email, password
-            except Exception as e:
-                logging.error(f"   Error al cargar las credenciales: {str(e)}")
-        else:
-            logging.error(f"El archivo de credenciales no existe: {credentials_file}")
-        return None, None
+        """Email y contraseña guardados, o (None, None); se descifran una vez por sesión"""
+        credentials = credentials_vault().read()
+        if credentials is None:
+            logging.info("No hay credenciales guardadas")
+            return None, None
+        return credentials
+
+    @staticmethod
+    def http_login(email, password):
+        """
+        Inicio de sesión sin navegador: obtiene el formulario de LOGIN_URL,
+        lo envía con el token antiforgery y las credenciales, y retorna las
+        cookies de la sesión (lista como la de Selenium) o None si falla
+        """
+        config = WINDA_CONFIG["login"]
+        session = requests.Session()
+        session.headers['user-agent'] = config["user_agent"]
+        timeout = WINDA_CONFIG["request_timeout"]
+        try:
+            page = session.get(LOGIN_URL, timeout=timeout)
+            page.raise_for_status()
+            parser = _LoginFormParser()
+            parser.feed(page.text)
+            form = next((form for form in parser.forms if config["password_field"] in form["fields"]), None)
+            if form is None:
+                logging.info("   No se encontró el formulario de inicio de sesión")
+                return None
+
+            data = dict(form["fields"])
+            data[config["user_field"]] = email
+            data[config["password_field"]] = password
+            origin = urlparse(page.url)
+            response = session.post(urljoin(page.url, form["action"]), data=data, timeout=timeout,
+                                    headers={'origin': f"{origin.scheme}://{origin.netloc}", 'referer': page.url})
+            response.raise_for_status()
+            if config["success_marker"] not in response.text:
+                logging.info("   El inicio de sesión por HTTP no fue aceptado")
+                return None
+        except requests.RequestException as e:
+            logging.error(f"   Error en el inicio de sesión por HTTP: {str(e)}")
+            return None
+        finally:
+            session.close()
+
+        return [
+            {"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path,
+             **({"expiry": int(cookie.expires)} if cookie.expires else {})}
+            for cookie in session.cookies
+        ]
+
+    @classmethod
+    def _http_login_and_save(cls, email, password):
+        """Cookies por HTTP, guardadas; None si el flujo HTTP está desactivado o falla"""
+        if not (email and password and WINDA_CONFIG["login"]["http_enabled"]):
+            return None
+        cookies = cls.http_login(email, password)
+        if not cookies:
+            return None
+        cls.store_cookies(cookies)
+        logging.info("   Inicio de sesión por HTTP exitoso")
+        return cls.load_cookies()
 
     @classmethod
     def login_and_save_cookies(cls, email=None, password=None):
+        cookies = cls._http_login_and_save(email, password)
+        if cookies:
+            cls.save_credentials(email, password)
+            return cookies
+
+        # Respaldo: inicio de sesión con el navegador (también para hacerlo a mano)
         driver = cls.setup_driver()
         if not driver:
             return None
@@ -119,10 +309,14 @@ class WindaValidator:
             driver.quit()
 
     @classmethod
-    def refresh_cookies(cls):
+    def refresh_cookies(cls, allow_browser=True):
         email, password = cls.load_credentials()
         if email and password:
             logging.info("Credenciales cargadas correctamente")
+            cookies = cls._http_login_and_save(email, password)
+            if cookies or not allow_browser:
+                return cookies
+            logging.info("Usando el navegador para refrescar las cookies")
             driver = cls.setup_driver()
             if not driver:
                 logging.error("No se pudo inicializar el driver de Selenium")
@@ -262,25 +456,63 @@ class WindaValidator:
             'search[regex]': 'false',
             'SearchString': winda_id,
         }
-        response = requests.post(SEARCH_URL, cookies=cookies, headers=headers, data=data)
+        response = get_winda_session().post(SEARCH_URL, cookies=cookies, headers=headers, data=data,
+                                            timeout=WINDA_CONFIG["request_timeout"])
         return response
 
+    @staticmethod
+    def parse_results(json_data):
+        """Certificados de la respuesta de búsqueda"""
+        return [
+            {
+                "Winda ID": result.get('WindaId', 'N/A'),
+                "Nombre completo": f"{result.get('FirstName', '')} {result.get('Surname', '')}".strip() or 'N/A',
+                "País": result.get('Country', 'N/A'),
+                "Título del curso": result.get('CourseTitle', 'N/A'),
+                "Proveedor del curso": result.get('TrainingProviderName', 'N/A'),
+                "Validez": f"{result.get('ValidFrom', 'N/A')} - {result.get('ValidTo', 'N/A')}",
+                "ValidTo": result.get('ValidTo', 'N/A')
+            }
+            for result in json_data['data']
+        ]
+
     @classmethod
-    async def fetch_winda_data(cls, winda_id):
-        cookies = cls.load_cookies()
+    async def fetch_winda_data(cls, winda_id, force_refresh=False):
+        """
+        Certificados de `winda_id`: del caché si la consulta anterior sigue
+        vigente o, con `force_refresh` o sin resultado guardado, de Winda
+        """
+        if not force_refresh:
+            record = cached_winda_record(winda_id)
+            if record is not None:
+                return record["certificates"]
+
+        data = await cls._search_winda(winda_id)
+        if data is not None:
+            store_winda_results(winda_id, data)
+        return data
+
+    @classmethod
+    async def _search_winda(cls, winda_id):
+        manager = get_cookie_manager()
+        cookies, version = await asyncio.to_thread(manager.get_cookies)
         if not cookies:
-            logging.info("   No se encontraron cookies válidas. Iniciando proceso de inicio de sesión.")
-            cookies = cls.login_and_save_cookies()
-            if not cookies:
+            logging.info("   No se encontraron cookies válidas. Iniciando sesión con las credenciales guardadas.")
+            cookies, version = await asyncio.to_thread(manager.refresh, version)
+        if not cookies:
+            # Último recurso: inicio de sesión manual en el navegador
+            if not await asyncio.to_thread(cls.login_and_save_cookies):
                 logging.error("   No se pudieron obtener las cookies. Saliendo.")
                 return None
+            cookies, version = await asyncio.to_thread(manager.get_cookies)
     
         response = cls.make_request(winda_id, cookies)
         try:
             json_data = response.json()
         except requests.exceptions.JSONDecodeError:
             logging.info("   Error al decodificar JSON. Las cookies pueden haber expirado. Refrescando cookies.")
-            cookies = cls.refresh_cookies()
+            # Si otra consulta ya está refrescando, se espera ese mismo refresco
+            cookies, _ = await asyncio.to_thread(manager.refresh, version)
             if not cookies:
                 logging.error("   No se pudieron refrescar las cookies. Saliendo.")
                 return None
@@ -291,17 +523,122 @@ class WindaValidator:
                 logging.error("   Error persistente al decodificar JSON. Verifique la conexión o el estado del servidor.")
                 return None
 
-        current_date = datetime.now().date()
-    
-        return [
-            {
-                "Winda ID": result.get('WindaId', 'N/A'),
-                "Nombre completo": f"{result.get('FirstName', '')} {result.get('Surname', '')}".strip() or 'N/A',
-                "País": result.get('Country', 'N/A'),
-                "Título del curso": result.get('CourseTitle', 'N/A'),
-                "Proveedor del curso": result.get('TrainingProviderName', 'N/A'),
-                "Validez": f"{result.get('ValidFrom', 'N/A')} - {result.get('ValidTo', 'N/A')}",
-                "ValidTo": result.get('ValidTo', 'N/A')
-            }
-            for result in json_data['data']
-        ]
\ No newline at end of file
+        return cls.parse_results(json_data)
+
+
+class WindaCookieManager:
+    """
+    Cookies de Winda en memoria con el vencimiento registrado al guardarlas.
+    Las consultas que encuentran la sesión vencida esperan un único refresco
+    en curso (por versión de las cookies) en lugar de iniciar sesión cada
+    una, y `keep_fresh` las refresca en segundo plano antes de que venzan.
+    """
+
+    def __init__(self):
+        self._cookies = None
+        self._expires_at = None
+        self._generation = None
+        self._version = 0
+        self._retry_after = 0.0
+        self._refreshing = None
+        self._lock = threading.Lock()
+        self.refreshes = 0
+
+    def _load(self):
+        """Toma las cookies del vault si cambiaron (otro inicio de sesión, otro proceso); requiere el lock"""
+        cookies, expires_at = WindaValidator.load_cookie_record()
+        generation = cookie_vault().generation
+        if generation != self._generation:
+            self._generation = generation
+            self._cookies, self._expires_at = cookies, expires_at
+            self._version += 1
+
+    def expires_in(self):
+        """Segundos hasta el vencimiento registrado, o None si no hay cookies"""
+        with self._lock:
+            self._load()
+            if not self._cookies or self._expires_at is None:
+                return None
+            return self._expires_at - time.time()
+
+    def get_cookies(self):
+        """
+        Cookies vigentes y su versión. Si ya vencieron se refrescan por HTTP
+        (una sola vez para todos); si eso falla se retornan las anteriores y
+        el servidor decide
+        """
+        with self._lock:
+            self._load()
+            cookies, version = self._cookies, self._version
+            expired = cookies and self._expires_at is not None and self._expires_at <= time.time()
+            if not expired or time.time() < self._retry_after:
+                return cookies, version
+        refreshed, version = self.refresh(version, allow_browser=False)
+        return refreshed or cookies, version
+
+    def refresh(self, version, allow_browser=True):
+        """
+        Refresca las cookies de la versión `version`. Si otro hilo ya las
+        refrescó se retornan las nuevas; si hay un refresco en curso se espera
+        """
+        with self._lock:
+            self._load()
+            if version != self._version:
+                return self._cookies, self._version
+            event = self._refreshing
+            leader = event is None
+            if leader:
+                event = self._refreshing = threading.Event()
+        if not leader:
+            event.wait()
+            with self._lock:
+                return self._cookies, self._version
+
+        cookies = None
+        try:
+            cookies = WindaValidator.refresh_cookies(allow_browser=allow_browser)
+        except Exception as e:
+            logging.error(f"   Error al refrescar las cookies: {str(e)}")
+        finally:
+            with self._lock:
+                if cookies:
+                    self.refreshes += 1
+                    self._load()
+                else:
+                    self._retry_after = time.time() + WINDA_CONFIG["cookies"]["retry_interval"]
+                self._refreshing = None
+                event.set()
+        with self._lock:
+            return self._cookies, self._version
+
+    async def keep_fresh(self):
+        """
+        Tarea en segundo plano: refresca por HTTP las cookies guardadas
+        `refresh_margin` segundos antes de su vencimiento (cancelarla al salir)
+        """
+        config = WINDA_CONFIG["cookies"]
+        while True:
+            expires_in = await asyncio.to_thread(self.expires_in)
+            delay = config["check_interval"] if expires_in is None else expires_in - config["refresh_margin"]
+            if delay > 0:
+                await asyncio.sleep(min(delay, config["check_interval"]))
+                continue
+            with self._lock:
+                version = self._version
+            cookies, new_version = await asyncio.to_thread(self.refresh, version, False)
+            # Tras un fallo se reintenta más tarde; tras un éxito se espera al
+            # menos un intervalo aunque la sesión dure menos que el margen
+            await asyncio.sleep(config["retry_interval"] if new_version == version else config["check_interval"])
+
+
+_cookie_manager = None
+
+
+def get_cookie_manager():
+    """Administrador de cookies compartido por todas las consultas"""
+    global _cookie_manager
+    if _cookie_manager is None:
+        with _session_lock:
+            if _cookie_manager is None:
+                _cookie_manager = WindaCookieManager()
+    return _cookie_manager
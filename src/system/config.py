@@ -26,6 +26,8 @@ CURRICULUMS_FOLDER: str = os.path.join(BASE_DIR, "Curriculums")
 RESULT_FOLDER: str = os.path.join(BASE_DIR, "results")
 CV_PROCESSOR_FOLDER: str = os.path.join(RESULT_FOLDER, "CV Processor")
 CV_PROCESSOR_TOP3_FOLDER: str = os.path.join(CV_PROCESSOR_FOLDER, "Top 3")
+EMAIL_REWRITER_FOLDER: str = os.path.join(RESULT_FOLDER, "Email Rewriter")
+WINDA_VALIDATOR_FOLDER: str = os.path.join(RESULT_FOLDER, "Winda Validator")
 
 # Directorios de trabajo internos
 LOGS_DIR: str = os.path.join(SRC_DIR, "logs")
@@ -37,6 +39,8 @@ DIRS_TO_CREATE: list = [
     RESULT_FOLDER,
     CV_PROCESSOR_FOLDER,
     CV_PROCESSOR_TOP3_FOLDER,
+    EMAIL_REWRITER_FOLDER,
+    WINDA_VALIDATOR_FOLDER,
     LOGS_DIR
 ]
 
@@ -106,6 +110,7 @@ MENU_CONFIG: Dict = {
         {'key': 'formal', 'name': 'Formal', 'description': 'Tono formal y profesional'},
         {'key': 'casual', 'name': 'Casual', 'description': 'Tono casual y amigable'},
         {'key': 'professional', 'name': 'Profesional', 'description': 'Tono profesional equilibrado'},
+        {'key': 'bulk', 'name': 'Reescritura masiva', 'description': 'Reescribe una carpeta o un CSV de borradores'},
         {'key': 'back', 'name': 'Volver', 'description': 'Volver al menú principal'}
     ]
 }
@@ -158,7 +163,10 @@ AI_CONFIG: Dict = {
 SICARU_CONFIG: Dict = {
     **AI_CONFIG["gemini"],
     "temperature": 0.9,  # Higher temperature for more creative responses
-    "max_history_length": 20,
+    "max_history_length": 20,  # Máximo de mensajes recientes en el historial
+    "history_token_budget": 3000,  # Tokens de los turnos recientes que se reenvían en cada mensaje
+    "memory_token_budget": 500,  # Tokens del resumen de los turnos anteriores
+    "token_counter": "local",  # "local" (estimación) o "gemini" (count_tokens: llamadas extra a la API en cada turno)
     "initial_prompt": "Soy Sicarú, tu asistente personal. ¿En qué puedo ayudarte hoy?",
 }
 
@@ -219,7 +227,16 @@ El texto debe:
 IMPORTANTE: El texto final debe ser significativamente más detallado y completo que el original. Expande la información proporcionada y añade valor profesional al mensaje."""
         }
     },
-    "max_cache_size": 100  # Maximum number of cached email rewrites
+    "max_cache_size": 100,  # Maximum number of cached email rewrites
+    "bulk": {
+        "requests_per_minute": 15,  # Cuota de solicitudes por minuto del modelo
+        "tokens_per_minute": 1000000,  # Cuota de tokens por minuto del modelo
+        "max_concurrency": 5,  # Correos en proceso al mismo tiempo
+        "max_retries": 5,  # Reintentos por correo tras un 429
+        "estimated_output_tokens": 1000,  # Tokens estimados de cada correo reescrito
+        "extensions": [".txt", ".eml", ".md"],  # Borradores que se leen de una carpeta
+        "csv_text_columns": ["email", "correo", "texto", "text", "body", "contenido"]  # Columna del texto en un CSV
+    }
 }
 
 AI_CONFIG: Dict = {
@@ -340,6 +357,15 @@ CACHE_CONFIG: Dict = {
             'enabled': True,
             'max_size_mb': 100
         }
+    },
+    # Vencimiento por espacio de nombres en segundos (None: sin vencimiento)
+    'namespaces': {
+        # Los resultados de Winda se conservan para el reporte de certificados por vencer;
+        # se vuelven a consultar después de WINDA_CONFIG["cache"]["ttl"]
+        'winda': {'timeout': 90 * 24 * 3600},
+        'short_urls': {'timeout': 30 * 24 * 3600},
+        # Desalojo LRU por cantidad de entradas además del límite global en disco
+        'email_rewrites': {'timeout': 7 * 24 * 3600, 'max_entries': EMAIL_REWRITER_CONFIG["max_cache_size"]}
     }
 }
 
@@ -360,6 +386,34 @@ COOKIE_ENCRYPTION_KEY: bytes = get_or_create_key()
 LOGIN_URL: str = os.getenv('LOGIN_URL', "https://winda.globalwindsafety.org/account/")
 SEARCH_URL: str = os.getenv('SEARCH_URL', "https://winda.globalwindsafety.org/organisation/search-bulk-result")
 
+# ============= WINDA VALIDATOR CONFIGURATION =============
+WINDA_CONFIG: Dict = {
+    "request_timeout": 30,  # Segundos máximos por consulta
+    "login": {
+        "http_enabled": True,  # Iniciar sesión con el formulario por HTTP; Selenium queda como respaldo
+        "user_field": "Login",  # Campos del formulario de LOGIN_URL
+        "password_field": "Password",
+        "success_marker": "full-name",  # Texto que solo aparece con la sesión iniciada
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
+    },
+    "cookies": {
+        "assumed_lifetime": 8 * 3600,  # Vida supuesta de la sesión si las cookies no declaran vencimiento
+        "auth_cookie_markers": ["identity", "auth", "session"],  # Cookies cuyo vencimiento marca el de la sesión
+        "refresh_margin": 600,  # Segundos antes del vencimiento en que se refresca en segundo plano
+        "check_interval": 60,  # Segundos entre revisiones del refresco en segundo plano
+        "retry_interval": 300  # Segundos de espera tras un refresco fallido
+    },
+    "cache": {
+        "ttl": 24 * 3600,  # Segundos en que un resultado guardado se usa sin consultar de nuevo a Winda
+        "expiring_days": 60  # Días del reporte de certificados por vencer (desde el caché)
+    },
+    "bulk": {
+        "max_concurrency": 8,  # Consultas simultáneas (y conexiones keep-alive en la sesión)
+        "expiring_days": 30,  # Días antes del vencimiento para marcar un certificado como "Por vencer"
+        "id_columns": ["winda id", "windaid", "winda_id", "winda", "id"]  # Columna de los IDs en el CSV/XLSX
+    }
+}
+
 # ============= APP SETTINGS =============
 MAX_RETRY_ATTEMPTS: int = 3
 CACHE_EXPIRATION_TIME: int = 3600
@@ -387,12 +441,17 @@ PDF_CONVERTER_CONFIG: Dict = {
 
 from .keywords import (
     BLOCKED_PATTERNS, TITLES, COMMON_NAMES, PROFESSIONAL_KEYWORDS,
-    SOFT_SKILLS, CERTIFICATIONS, LANGUAGES
+    SOFT_SKILLS, CERTIFICATIONS, LANGUAGES, CV_SECTIONS
 )
 
 # ============= CV PROCESSOR CONFIGURATION =============
 CV_PROCESSOR_CONFIG: Dict = {
     "nlp_model": "es_core_news_sm",
+    "nlp": {
+        "exclude": ["parser", "lemmatizer", "morphologizer", "attribute_ruler", "senter"],  # Componentes que no se cargan (solo se usa NER)
+        "batch_size": 64,  # Textos por lote en nlp.pipe
+        "n_process": 1  # Procesos de nlp.pipe (-1 usa todos los núcleos)
+    },
     "blocked_patterns": BLOCKED_PATTERNS,
     "titles": TITLES,
     "common_names": COMMON_NAMES,
@@ -400,15 +459,47 @@ CV_PROCESSOR_CONFIG: Dict = {
         "professional": PROFESSIONAL_KEYWORDS,
         "soft_skills": SOFT_SKILLS,
         "certifications": CERTIFICATIONS,
-        "languages": LANGUAGES
+        "languages": LANGUAGES,
+        "sections": CV_SECTIONS
     },
     "ocr_settings": {
         "language": "spa",
         "dpi": 300
     },
     "similarity_threshold": 0.8,
-    "max_workers": 4,
+    "pdf_backends": ["pymupdf", "pypdf2", "pdfplumber"],  # Orden de preferencia para extraer texto
+    "max_workers": {
+        "extraction": os.cpu_count() or 1,  # Procesos que extraen texto de los PDFs
+        "analysis": 8  # Trabajadores asíncronos que consultan a Gemini
+    },
+    "queue_size": 32,  # CVs extraídos en espera de análisis antes de pausar la extracción
+    "progress": {
+        "refresh_interval": 0.1,  # Segundos mínimos entre actualizaciones de la barra
+        "log_metrics": True,  # Registrar eventos y métricas en JSON lines (Results/CV Processor/logs)
+        "snapshot_interval": 5.0  # Segundos entre registros de métricas en el log
+    },
+    "top_k": 3,  # Candidatos que se conservan y se guardan en la carpeta del top
+    "ranking_min_score": 50,  # Puntaje mínimo para entrar al ranking de un puesto
+    "scoring_batch_size": 256,  # CVs por cálculo del puntaje contra todas las vacantes
+    "prescreen": {
+        "enabled": True,  # Descartar antes del análisis los CVs que no pueden alcanzar el puntaje mínimo
+        "margin": 5  # Puntos de tolerancia sobre la cota (habilidades que Gemini infiera sin estar en el texto)
+    },
+    "local_parser": {
+        "enabled": True,  # Analizar primero con el parser local y consultar a Gemini solo si hace falta
+        "confidence_threshold": 0.75,  # Confianza mínima (0 a 1) para aceptar el resultado local
+        "offline_fallback": True  # Sin API key válida, usar el resultado local aunque su confianza sea baja
+    },
     "max_score": 60,  # Puntaje mínimo para considerar un candidato apto
+    "gemini": {
+        "requests_per_minute": 15,  # Cuota de solicitudes por minuto del modelo
+        "tokens_per_minute": 1000000,  # Cuota de tokens por minuto del modelo
+        "max_retries": 5,  # Reintentos por CV tras un 429
+        "estimated_output_tokens": 800,  # Tokens estimados de la respuesta JSON por CV
+        "max_output_tokens": 8192,  # Tokens máximos de una respuesta del modelo
+        "batch_size": 8,  # CVs por solicitud (1 desactiva los lotes)
+        "batch_token_budget": 24000  # Tokens de entrada máximos de los CVs de un lote
+    }
 }
 
 # ============= ASCII ART AND DISPLAY FUNCTIONS =============
@@ -74,3 +74,16 @@ LANGUAGES = {
     "idiomas": ["inglés", "español", "francés", "alemán", "italiano", "portugués", "chino", "japonés"],
     "niveles": ["básico", "intermedio", "avanzado", "nativo", "fluido"]
 }
+
+# Encabezados de sección de un CV (parser local); cada término se compara sin acentos
+CV_SECTIONS = {
+    "habilidades": ["habilidades", "competencias", "conocimientos", "aptitudes", "skills",
+                    "herramientas", "habilidades técnicas", "conocimientos técnicos"],
+    "idiomas": ["idiomas", "lenguas", "languages"],
+    "educacion": ["educación", "formación", "formación académica", "estudios", "escolaridad",
+                  "certificaciones", "cursos", "diplomados", "education"],
+    "experiencia": ["experiencia", "experiencia laboral", "experiencia profesional",
+                    "historial laboral", "trayectoria profesional", "experience"],
+    "otros": ["objetivo", "perfil", "perfil profesional", "resumen", "datos personales",
+              "contacto", "referencias", "logros", "intereses", "pasatiempos"]
+}
@@ -0,0 +1,109 @@
+"""
+Micro-benchmark de analyzers.py sobre CVs largos.
+
+Compara las funciones anteriores (text.lower() por keyword y búsqueda por
+subcadena) con el autómata de Aho-Corasick, y muestra las diferencias: las
+coincidencias dentro de otras palabras ("pe" en "pérez") ya no cuentan y el
+nivel de cada idioma es el más cercano a su mención.
+
+Uso:
+    python tools/benchmark_analyzers.py --paragraphs 200 --repeat 5
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from system.config import CV_PROCESSOR_CONFIG
+from codeparts.cv_processor import analyzers
+
+SAMPLE_LINES = [
+    "Lic. Juan Pablo Pérez López - Ingeniero Industrial",
+    "Experiencia laboral: Analista de costos y presupuesto en Empresa del Norte (2018 - presente)",
+    "Habilidades: liderazgo, trabajo en equipo, gestión de proyectos, Excel avanzado, SQL, Python",
+    "Certificaciones: PMP, Six Sigma, CCNA. Manejo de redes sociales y marketing digital",
+    "Idiomas: inglés avanzado, español nativo, francés básico",
+    "Responsable de auditoría, impuestos, nómina y reclutamiento de personal operativo",
+    "Desarrollo web frontend y backend con javascript, docker y kubernetes en AWS",
+    "Supervisión de producción, calidad, logística y mantenimiento de maquinaria",
+]
+
+
+def legacy_analyze(text: str) -> tuple:
+    """Las cuatro funciones originales de analyzers.py"""
+    keywords = CV_PROCESSOR_CONFIG["keywords"]
+    professional = {}
+    for area, subareas in keywords["professional"].items():
+        area_matches = {}
+        for subarea, terms in subareas.items():
+            matches = [kw for kw in terms if kw.lower() in text.lower()]
+            if matches:
+                area_matches[subarea] = matches
+        if area_matches:
+            professional[area] = area_matches
+    soft_skills = [skill for skill in keywords["soft_skills"] if skill.lower() in text.lower()]
+    certifications = {}
+    for area, certs in keywords["certifications"].items():
+        matches = [cert for cert in certs if cert.upper() in text.upper()]
+        if matches:
+            certifications[area] = matches
+    languages = {}
+    for lang in keywords["languages"]["idiomas"]:
+        if lang.lower() in text.lower():
+            for nivel in keywords["languages"]["niveles"]:
+                if nivel.lower() in text.lower():
+                    languages[lang] = nivel
+                    break
+            if lang not in languages:
+                languages[lang] = "no especificado"
+    return professional, soft_skills, certifications, languages
+
+
+def automaton_analyze(text: str) -> tuple:
+    return (analyzers.analyze_professional_keywords(text), analyzers.analyze_soft_skills(text),
+            analyzers.analyze_certifications(text), analyzers.analyze_languages(text))
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de analyzers.py")
+    parser.add_argument('--paragraphs', type=int, default=200, help="Líneas por CV")
+    parser.add_argument('--cvs', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cvs = ["\n".join(rng.choice(SAMPLE_LINES) for _ in range(args.paragraphs)) for _ in range(args.cvs)]
+    print(f"\n{args.cvs} CVs de {args.paragraphs} líneas ({len(cvs[0])} caracteres)")
+
+    # Diferencias esperadas por los límites de palabra y el nivel más cercano
+    for name, old, new in zip(("keywords", "habilidades blandas", "certificaciones", "idiomas"),
+                              legacy_analyze(cvs[0]), automaton_analyze(cvs[0])):
+        if old != new:
+            print(f"  {name}:\n    anterior: {old}\n    autómata: {new}")
+
+    def automaton_uncached():
+        analyzers._matches.cache_clear()
+        for cv in cvs:
+            automaton_analyze(cv)
+
+    legacy = timed(lambda: [legacy_analyze(cv) for cv in cvs], args.repeat)
+    automaton = timed(automaton_uncached, args.repeat)
+    print(f"\n{'4 funciones (anterior)':<30} {legacy * 1000:9.1f} ms")
+    print(f"{'4 funciones (autómata)':<30} {automaton * 1000:9.1f} ms  {legacy / automaton:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
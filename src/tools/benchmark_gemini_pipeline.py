@@ -0,0 +1,115 @@
+"""
+Benchmark del análisis de CVs contra el servidor falso de Gemini.
+
+Compara el esquema anterior (ThreadPoolExecutor de 4 hilos + reintentos por 429)
+con AnalysisEngine (asyncio + limitador de solicitudes/tokens por minuto), con un
+CV por solicitud y con lotes de varios CVs por solicitud.
+
+Uso:
+    python tools/benchmark_gemini_pipeline.py --cvs 120 --rpm 60 --latency 0.8 --error-rate 0.02
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from tools.fake_gemini_server import FakeGeminiServer
+from codeparts.cv_processor.gemini_processor import GeminiProcessor
+from codeparts.cv_processor.async_engine import AnalysisEngine
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """
+    Modelo compatible con GenerativeModel que habla con el servidor falso por REST
+    """
+
+    def __init__(self, base_url: str, model_name: str = "gemini-pro"):
+        self.endpoint = f"{base_url}/v1beta/models/{model_name}:generateContent"
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        payload = json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}]}).encode('utf-8')
+        request = urllib.request.Request(self.endpoint, data=payload, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                body = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise Exception(f"{e.code} {e.reason}") from None
+        return FakeResponse(body["candidates"][0]["content"]["parts"][0]["text"])
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        return await asyncio.to_thread(self.generate_content, prompt)
+
+
+def sample_texts(count: int) -> dict:
+    base = (
+        "Ana García Martínez\nEmail: ana.garcia@email.com\nTeléfono: 5512345678\n"
+        "Educación\nLicenciatura en Administración de Empresas - UNAM\n"
+        "Habilidades\n• Excel avanzado\n• SAP\n• Contabilidad\nIdiomas\n• Español nativo\n• Inglés avanzado\n"
+    )
+    return {f"cv_{i:04d}.pdf": f"{base}Folio {i}\n" for i in range(count)}
+
+
+def run_threaded(processor: GeminiProcessor, texts: dict) -> int:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(processor.analyze_cv, texts.values()))
+    return sum(1 for r in results if r)
+
+
+def run_engine(processor: GeminiProcessor, texts: dict, rpm: int, concurrency: int, batch_size: int) -> int:
+    engine = AnalysisEngine(processor, requests_per_minute=rpm, max_concurrency=concurrency, batch_size=batch_size)
+    results = engine.run(texts)
+    return sum(1 for r in results.values() if r)
+
+
+def benchmark(name: str, func, server: FakeGeminiServer, total: int) -> None:
+    served, rejected = server.served, server.rejected
+    start = time.perf_counter()
+    ok = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {ok:>4}/{total:<4} CVs  {elapsed:8.1f} s  "
+          f"{ok / elapsed * 60:7.1f} CVs/min  429s: {server.rejected - rejected:<5} "
+          f"atendidas: {server.served - served}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de Gemini")
+    parser.add_argument('--cvs', type=int, default=60)
+    parser.add_argument('--rpm', type=int, default=60, help="Cuota por minuto del servidor falso")
+    parser.add_argument('--latency', type=float, default=0.8)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--skip-threaded', action='store_true')
+    args = parser.parse_args()
+
+    texts = sample_texts(args.cvs)
+    print(f"{args.cvs} CVs, cuota {args.rpm} RPM, latencia {args.latency}s, 429 aleatorios {args.error_rate:.0%}\n")
+
+    if not args.skip_threaded:
+        # Servidor nuevo por escenario para que ambos arranquen con la cuota completa
+        with FakeGeminiServer(latency=args.latency, requests_per_minute=args.rpm, error_rate=args.error_rate) as server:
+            processor = GeminiProcessor(model=FakeGeminiModel(server.url))
+            benchmark("ThreadPoolExecutor(4)", lambda: run_threaded(processor, texts), server, args.cvs)
+
+    for name, batch_size in (("AnalysisEngine (1 por CV)", 1), (f"AnalysisEngine (lotes de {args.batch_size})", args.batch_size)):
+        with FakeGeminiServer(latency=args.latency, requests_per_minute=args.rpm, error_rate=args.error_rate) as server:
+            processor = GeminiProcessor(model=FakeGeminiModel(server.url))
+            benchmark(name, lambda: run_engine(processor, texts, args.rpm, args.concurrency, batch_size), server, args.cvs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark de los backends de extracción de texto sobre el corpus de
+tools/generate_sample_cvs.py.
+
+Mide cada backend de forma secuencial, la extracción anterior (PyPDF2 con
+concatenación `text += ...`) y el pool de procesos con el backend por defecto.
+
+Uso:
+    python tools/benchmark_pdf_extractors.py --copies 200 --long-pages 50
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from tools.generate_sample_cvs import generate_sample_cvs
+from codeparts.cv_processor.pdf_extractors import EXTRACTION_BACKENDS, extract_text
+
+
+def legacy_extract(pdf_path: str) -> str:
+    """Extracción original de CVProcessor.extract_text_from_pdf"""
+    import PyPDF2
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text()
+        return text
+
+
+def pool_extract(pdf_paths: list, max_workers: int) -> dict:
+    """Extrae el texto de varios PDFs en un pool de procesos ({ruta: texto})"""
+    chunksize = max(1, len(pdf_paths) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(pdf_paths, executor.map(extract_text, pdf_paths, chunksize=chunksize)))
+
+
+def build_corpus(corpus_dir: str, copies: int, long_pages: int) -> list:
+    samples = generate_sample_cvs(corpus_dir)
+    corpus = []
+    for i in range(copies):
+        for sample in samples:
+            target = os.path.join(corpus_dir, f"{i:04d}_{os.path.basename(sample)}")
+            shutil.copyfile(sample, target)
+            corpus.append(target)
+
+    if long_pages:
+        # Documento largo para medir cómo escala cada backend con el número de páginas
+        import fitz
+        long_path = os.path.join(corpus_dir, "long_document.pdf")
+        with fitz.open() as document:
+            with fitz.open(samples[0]) as page_source:
+                for _ in range(long_pages):
+                    document.insert_pdf(page_source)
+            document.save(long_path)
+        corpus.append(long_path)
+    return corpus
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de extracción de texto de PDFs")
+    parser.add_argument('--copies', type=int, default=100, help="Copias de cada CV de ejemplo")
+    parser.add_argument('--long-pages', type=int, default=50, help="Páginas del documento largo (0 para omitirlo)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    corpus_dir = tempfile.mkdtemp(prefix="cv_corpus_")
+    try:
+        corpus = build_corpus(corpus_dir, args.copies, args.long_pages)
+        print(f"\nCorpus: {len(corpus)} PDFs en {corpus_dir}\n")
+
+        _, elapsed = timed(lambda: [legacy_extract(p) for p in corpus])
+        print(f"{'pypdf2 (+= anterior)':<24} {elapsed:8.2f} s  {len(corpus) / elapsed:8.1f} PDFs/s")
+
+        for backend in EXTRACTION_BACKENDS:
+            try:
+                _, elapsed = timed(lambda: [extract_text(p, [backend]) for p in corpus])
+            except ImportError:
+                print(f"{backend:<24} no instalado")
+                continue
+            print(f"{backend:<24} {elapsed:8.2f} s  {len(corpus) / elapsed:8.1f} PDFs/s")
+
+        _, elapsed = timed(lambda: pool_extract(corpus, args.workers))
+        print(f"{f'pool de {args.workers} procesos':<24} {elapsed:8.2f} s  {len(corpus) / elapsed:8.1f} PDFs/s")
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
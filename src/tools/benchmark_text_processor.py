@@ -0,0 +1,105 @@
+"""
+Micro-benchmark de TextProcessor.process_text sobre CVs largos.
+
+Compara el esquema anterior (un re.sub por patrón bloqueado, nombre y título)
+con la alternancia precompilada de una sola pasada, verifica que ambos den el
+mismo texto y mide las cuatro llamadas extract_* sobre un mismo CV, que ahora
+comparten una sola extracción (extract_all).
+
+Uso:
+    python tools/benchmark_text_processor.py --paragraphs 200 --repeat 20
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from codeparts.cv_processor.text_processor import TextProcessor
+
+SAMPLE_LINES = [
+    "Lic. Juan Pablo Martínez López - Ingeniero Industrial",
+    "Experiencia laboral: Analista de costos en Empresa del Norte (2018 - presente)",
+    "Correo electrónico: juan.martinez@email.com | Teléfono: 55 1234 5678",
+    "Dirección: Avenida Reforma 123, código postal 06600",
+    "Habilidades: liderazgo, trabajo en equipo, gestión de proyectos, Excel avanzado, SAP",
+    "Certificaciones: PMP, Six Sigma, CCNA. Idiomas: inglés avanzado, español nativo",
+    "Dr. María Guadalupe González - profesora de finanzas y contabilidad",
+    "Responsable de control de costos, facturación, inventarios y compras",
+]
+
+
+def legacy_process_text(processor: TextProcessor, text: str) -> str:
+    """process_text original: un re.sub por término en tres pasadas"""
+    text = processor.clean_text(text)
+    for pattern in processor.blocked_patterns:
+        text = re.sub(r'\b' + re.escape(pattern) + r'\b', '', text, flags=re.IGNORECASE)
+    for name in processor.common_names:
+        text = re.sub(r'\b' + re.escape(name) + r'\b', '', text, flags=re.IGNORECASE)
+    for title in processor.titles:
+        text = re.sub(r'\b' + re.escape(title) + r'\b\.?', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def build_cv(rng: random.Random, paragraphs: int) -> str:
+    return "\n".join(rng.choice(SAMPLE_LINES) for _ in range(paragraphs))
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de TextProcessor.process_text")
+    parser.add_argument('--paragraphs', type=int, default=200, help="Líneas por CV")
+    parser.add_argument('--cvs', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cvs = [build_cv(rng, args.paragraphs) for _ in range(args.cvs)]
+    processor = TextProcessor()
+
+    mismatches = sum(1 for cv in cvs if legacy_process_text(processor, cv) != processor._process_text(cv))
+    terms = len(processor.blocked_patterns) + len(processor.common_names) + len(processor.titles)
+    print(f"\n{args.cvs} CVs de {args.paragraphs} líneas ({len(cvs[0])} caracteres), {terms} términos a eliminar")
+    print(f"Diferencias con el esquema anterior: {mismatches}\n")
+
+    legacy = timed(lambda: [legacy_process_text(processor, cv) for cv in cvs], args.repeat)
+    single = timed(lambda: [processor._process_text(cv) for cv in cvs], args.repeat)
+    print(f"{'process_text anterior':<34} {legacy * 1000:9.1f} ms")
+    print(f"{'process_text una pasada':<34} {single * 1000:9.1f} ms  {legacy / single:6.1f}x")
+
+    # Las cuatro extracciones sobre el mismo CV: antes procesaban el texto cuatro veces
+    def extract_all_legacy():
+        for cv in cvs:
+            for _ in range(4):
+                legacy_process_text(processor, cv)
+
+    def extract_all_memoized():
+        processor._extract_cached.cache_clear()
+        for cv in cvs:
+            processor.extract_keywords(cv)
+            processor.extract_soft_skills(cv)
+            processor.extract_certifications(cv)
+            processor.extract_languages(cv)
+
+    legacy = timed(extract_all_legacy, args.repeat)
+    memoized = timed(extract_all_memoized, args.repeat)
+    print(f"{'4 extract_* (anterior)':<34} {legacy * 1000:9.1f} ms")
+    print(f"{'4 extract_* (extract_all + memo)':<34} {memoized * 1000:9.1f} ms  {legacy / memoized:6.1f}x")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+"""
+Verifica que `is_candidate_suitable` (índice de perfiles) y ScoringEngine
+produzcan exactamente los mismos puntajes que la implementación original,
+incluida aquí como referencia, para todos los perfiles, y compara tiempos.
+También verifica que la cota del pre-filtro nunca quede por debajo del
+puntaje real de un candidato cuyo texto contiene todas sus frases.
+
+Uso:
+    python tools/check_scoring_parity.py --candidates 2000 --seed 7
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+from codeparts.cv_processor.job_profiles import JOB_PROFILES, is_candidate_suitable
+from codeparts.cv_processor.scoring import ScoringEngine
+from codeparts.cv_processor.prescreen import PreScreen
+
+
+def reference_is_candidate_suitable(cv_data: dict, puesto: str) -> tuple[bool, float]:
+    """
+    Implementación original de is_candidate_suitable (recorre todas las
+    habilidades contra todas las frases del candidato); es la referencia
+    """
+    if not cv_data or not isinstance(cv_data, dict):
+        return False, 0
+    
+    # Obtener perfil del puesto
+    perfil = JOB_PROFILES.get(puesto.lower(), {})
+    if not perfil:
+        return False, 0
+
+    # Obtener y normalizar habilidades del candidato
+    habilidades = cv_data.get('habilidades', [])
+    if isinstance(habilidades, str):
+        habilidades = [habilidades]
+    
+    # Convertir a minúsculas y normalizar
+    habilidades = [h.lower().strip() for h in habilidades if isinstance(h, str)]
+    
+    # Obtener experiencia del candidato
+    experiencia = cv_data.get('experiencia', [])
+    experiencia_str = []
+    años_experiencia = 0
+    
+    if isinstance(experiencia, list):
+        for exp in experiencia:
+            if isinstance(exp, dict):
+                # Extraer años de experiencia
+                periodo = exp.get('periodo', '').lower()
+                if 'presente' in periodo or 'actual' in periodo:
+                    try:
+                        año_inicio = int(''.join(filter(str.isdigit, periodo.split('-')[0])))
+                        años_experiencia += 2024 - año_inicio
+                    except:
+                        pass
+                
+                # Agregar puesto y responsabilidades como habilidades potenciales
+                puesto_exp = exp.get('puesto', '').lower().strip()
+                if puesto_exp:
+                    experiencia_str.append(puesto_exp)
+                for resp in exp.get('responsabilidades', []):
+                    if isinstance(resp, str):
+                        experiencia_str.append(resp.lower().strip())
+    
+    # Combinar habilidades explícitas y de experiencia
+    todas_habilidades = habilidades + experiencia_str
+    
+    # Obtener habilidades requeridas y deseables
+    requeridas = [h.lower().strip() for h in perfil.get('required_skills', [])]
+    deseables = [h.lower().strip() for h in perfil.get('preferred_skills', [])]
+    
+    # Calcular puntaje base (50%)
+    puntaje = 0
+    total_requeridas = len(requeridas) if requeridas else 1
+    
+    # Puntaje por habilidades requeridas (50%)
+    for hab in requeridas:
+        # Buscar coincidencias parciales
+        palabras_hab = set(hab.split())
+        mejor_coincidencia = 0
+        
+        for h in todas_habilidades:
+            palabras_h = set(h.split())
+            # Calcular porcentaje de coincidencia
+            if palabras_hab:
+                # Buscar coincidencias por palabras individuales
+                coincidencia = len(palabras_hab & palabras_h) / len(palabras_hab)
+                mejor_coincidencia = max(mejor_coincidencia, coincidencia)
+                
+                # Buscar coincidencias por subcadenas
+                if any(p in h for p in palabras_hab):
+                    mejor_coincidencia = max(mejor_coincidencia, 0.75)
+        
+        # Asignar puntaje proporcional a la mejor coincidencia
+        puntaje += (50 / total_requeridas) * mejor_coincidencia
+    
+    # Puntaje por habilidades deseables (30%)
+    if deseables:
+        for hab in deseables:
+            palabras_hab = set(hab.split())
+            mejor_coincidencia = 0
+            
+            for h in todas_habilidades:
+                palabras_h = set(h.split())
+                if palabras_hab:
+                    # Buscar coincidencias por palabras individuales
+                    coincidencia = len(palabras_hab & palabras_h) / len(palabras_hab)
+                    mejor_coincidencia = max(mejor_coincidencia, coincidencia)
+                    
+                    # Buscar coincidencias por subcadenas
+                    if any(p in h for p in palabras_hab):
+                        mejor_coincidencia = max(mejor_coincidencia, 0.75)
+            
+            puntaje += (30 / len(deseables)) * mejor_coincidencia
+    
+    # Puntaje por idiomas (10%)
+    idiomas_candidato = []
+    idiomas = cv_data.get('idiomas', [])
+    if isinstance(idiomas, list):
+        for idioma in idiomas:
+            if isinstance(idioma, str):
+                idiomas_candidato.append(idioma.lower())
+            elif isinstance(idioma, dict):
+                idiomas_candidato.append(idioma.get('idioma', '').lower())
+    
+    idiomas_requeridos = [i.lower() for i in perfil.get('required_languages', [])]
+    idiomas_deseables = [i.lower() for i in perfil.get('preferred_languages', [])]
+    
+    # Verificar idiomas requeridos (7%)
+    if idiomas_requeridos:
+        for idioma in idiomas_requeridos:
+            if any(idioma in i for i in idiomas_candidato):
+                puntaje += 7 / len(idiomas_requeridos)
+    
+    # Verificar idiomas deseables (3%)
+    if idiomas_deseables:
+        for idioma in idiomas_deseables:
+            if any(idioma in i for i in idiomas_candidato):
+                puntaje += 3 / len(idiomas_deseables)
+    
+    # Bonus por experiencia (hasta 10% extra)
+    años_minimos = perfil.get('min_experience_years', 2)
+    if años_experiencia >= años_minimos:
+        # Dar bonus proporcional a los años de experiencia extra
+        bonus = min(10, (años_experiencia - años_minimos + 1) * 2.5)
+        puntaje = min(100, puntaje + bonus)
+    
+    # Bonus por coincidencias parciales (hasta 10% extra)
+    if puntaje >= 40:  # Si ya tiene un puntaje decente
+        puntaje = min(100, puntaje + 10)
+    
+    # Redondear puntaje
+    puntaje = round(puntaje, 1)
+    
+    # Determinar si es apto (más flexible)
+    min_score = perfil.get('min_score', 40)  # Bajamos el mínimo predeterminado a 40
+    return puntaje >= min_score, puntaje
+
+
+NOISE_WORDS = ["gestión", "control", "ventas", "atención", "clientes", "liderazgo", "reportes",
+               "mantenimiento", "word", "python", "logística", "inventarios", "calidad", "a", "de"]
+LANGUAGES = ["Español (nativo)", "Inglés (intermedio)", "inglés avanzado", "Francés", "ESPAÑOL", "alemán básico"]
+PERIODS = ["2015 - presente", "ene 2019 - actual", "2010 - 2015", "Actualmente", "01/2020 - presente",
+           "presente", "2023-presente", ""]
+
+
+def random_phrase(rng: random.Random, vocabulary: list) -> str:
+    words = [rng.choice(vocabulary) if rng.random() < 0.6 else rng.choice(NOISE_WORDS)
+             for _ in range(rng.randint(1, 4))]
+    phrase = " ".join(words)
+    if rng.random() < 0.2:
+        # Subcadenas y mayúsculas para ejercitar las coincidencias parciales
+        phrase = phrase[:rng.randint(1, len(phrase))]
+    if rng.random() < 0.2:
+        phrase = f"  {phrase.upper()} "
+    return phrase
+
+
+def random_candidate(rng: random.Random, vocabulary: list):
+    roll = rng.random()
+    if roll < 0.02:
+        return {}
+    if roll < 0.03:
+        return None
+    habilidades = [random_phrase(rng, vocabulary) for _ in range(rng.randint(0, 12))]
+    if rng.random() < 0.05:
+        habilidades = random_phrase(rng, vocabulary)
+    experiencia = []
+    for _ in range(rng.randint(0, 4)):
+        if rng.random() < 0.1:
+            experiencia.append("Puesto sin detalle")
+            continue
+        experiencia.append({
+            "puesto": random_phrase(rng, vocabulary),
+            "empresa": "Empresa",
+            "periodo": rng.choice(PERIODS),
+            "responsabilidades": [random_phrase(rng, vocabulary) for _ in range(rng.randint(0, 3))]
+        })
+    idiomas = [rng.choice(LANGUAGES) if rng.random() < 0.8 else {"idioma": rng.choice(LANGUAGES), "nivel": "B2"}
+               for _ in range(rng.randint(0, 3))]
+    return {"nombre": "Candidato", "habilidades": habilidades, "experiencia": experiencia, "idiomas": idiomas}
+
+
+def compare(name: str, expected: list, actual: list) -> int:
+    """Cuenta (y muestra las primeras) diferencias contra la referencia"""
+    mismatches = 0
+    for row, (cv_expected, cv_actual) in enumerate(zip(expected, actual)):
+        for puesto, (is_suitable, score), (got_suitable, got_score) in zip(JOB_PROFILES, cv_expected, cv_actual):
+            if got_score != score or bool(got_suitable) != is_suitable:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"{name}: candidato {row}, perfil {puesto}: referencia {score} ({is_suitable}), "
+                          f"obtenido {got_score} ({got_suitable})")
+    return mismatches
+
+
+def candidate_text(cv_data) -> str:
+    """Texto de CV que contiene todas las frases del candidato"""
+    if not cv_data:
+        return ""
+    habilidades = cv_data.get('habilidades', [])
+    lines = [habilidades] if isinstance(habilidades, str) else list(habilidades)
+    for exp in cv_data.get('experiencia', []):
+        if isinstance(exp, dict):
+            lines += [exp['puesto'], exp['periodo']] + exp['responsabilidades']
+    lines += [i if isinstance(i, str) else i['idioma'] for i in cv_data.get('idiomas', [])]
+    return "\n".join(lines)
+
+
+def check_upper_bounds(expected: list, candidates: list) -> int:
+    """Cuenta los puntajes que superan la cota del pre-filtro (sin margen)"""
+    prescreen = PreScreen(list(JOB_PROFILES))
+    violations = 0
+    for row, (cv_expected, cv_data) in enumerate(zip(expected, candidates)):
+        bounds = prescreen.upper_bounds(candidate_text(cv_data))
+        for puesto, (_, score) in zip(JOB_PROFILES, cv_expected):
+            if score > bounds[puesto]:
+                violations += 1
+                if violations <= 10:
+                    print(f"cota: candidato {row}, perfil {puesto}: puntaje {score} > cota {bounds[puesto]}")
+    return violations
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paridad del puntaje con la implementación de referencia")
+    parser.add_argument('--candidates', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = sorted({word for perfil in JOB_PROFILES.values()
+                         for skill in perfil['required_skills'] + perfil['preferred_skills']
+                         for word in skill.lower().split()})
+    candidates = [random_candidate(rng, vocabulary) for _ in range(args.candidates)]
+
+    def reference():
+        return [[reference_is_candidate_suitable(cv_data, puesto) for puesto in JOB_PROFILES] for cv_data in candidates]
+
+    def indexed():
+        return [[is_candidate_suitable(cv_data, puesto) for puesto in JOB_PROFILES] for cv_data in candidates]
+
+    def vectorized():
+        engine = ScoringEngine()
+        scores = engine.score_batch(candidates)
+        suitable = engine.suitable(scores)
+        return [list(zip(suitable_row, score_row)) for suitable_row, score_row in zip(suitable.tolist(), scores.tolist())]
+
+    expected, reference_time = timed(reference)
+    mismatches = 0
+    cells = len(candidates) * len(JOB_PROFILES)
+    print(f"\n{len(candidates)} candidatos × {len(JOB_PROFILES)} perfiles = {cells} puntajes")
+    print(f"{'Referencia':<28} {reference_time:8.3f} s")
+    for name, func in (("is_candidate_suitable", indexed), ("ScoringEngine.score_batch", vectorized)):
+        actual, elapsed = timed(func)
+        differences = compare(name, expected, actual)
+        mismatches += differences
+        print(f"{name:<28} {elapsed:8.3f} s  {reference_time / elapsed:6.1f}x  diferencias: {differences}")
+
+    violations = check_upper_bounds(expected, candidates)
+    mismatches += violations
+    print(f"{'Cota del pre-filtro':<28} puntajes sobre la cota: {violations}")
+
+    # Un perfil editado en tiempo de ejecución debe reconstruir el índice
+    perfil = JOB_PROFILES[next(iter(JOB_PROFILES))]
+    perfil['required_skills'].append("soldadura submarina")
+    try:
+        expected, _ = timed(reference)
+        differences = compare("perfil editado", expected, indexed()) + compare("perfil editado", expected, vectorized())
+        mismatches += differences
+        print(f"{'Perfil editado':<28} diferencias: {differences}")
+    finally:
+        perfil['required_skills'].pop()
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
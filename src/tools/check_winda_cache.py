@@ -0,0 +1,136 @@
+"""
+Verifica el caché de resultados de Winda contra el servidor falso: una
+segunda validación de la misma lista no consulta a Winda, `force_refresh`
+sí lo hace, una consulta individual se responde desde el caché, los
+resultados vencidos (por TTL o porque un certificado venció después de la
+consulta) se vuelven a consultar y el reporte de certificados por vencer se
+arma sin ninguna consulta. El caché de prueba vive en una carpeta temporal.
+
+Uso:
+    python tools/check_winda_cache.py --ids 100 --concurrency 8
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from datetime import date, timedelta
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_winda_server import FakeWindaServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba del caché de resultados de Winda")
+    parser.add_argument('--ids', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.1, help="Segundos de cada búsqueda en el servidor falso")
+    parser.add_argument('--within-days', type=int, default=180, help="Ventana del reporte de certificados por vencer")
+    args = parser.parse_args()
+
+    fake = FakeWindaServer(latency=args.latency).start()
+    os.environ['LOGIN_URL'] = fake.login_url
+    os.environ['SEARCH_URL'] = fake.search_url
+
+    from system.config import CACHE_CONFIG, WINDA_CONFIG
+    temp_dir = tempfile.mkdtemp(prefix="winda_cache_check_")
+    CACHE_CONFIG['file_path'] = os.path.join(temp_dir, "app_cache.db")
+
+    from codeparts import winda_validator
+    from codeparts.winda_validator import WindaValidator, winda_cache, winda_cache_key
+    from codeparts.winda_bulk import WindaBulkValidator, expiring_lookups
+
+    winda_validator.COOKIES_FILE = os.path.join(temp_dir, "cookies.encrypted")
+    winda_validator.ASSETS_DIR = temp_dir
+
+    def no_browser(*args, **kwargs):
+        raise AssertionError("Se intentó abrir el navegador")
+    WindaValidator.setup_driver = classmethod(no_browser)
+
+    def check(label, passed, detail=""):
+        print(f"{label}: {'ok' if passed else 'FALLÓ'}{f' ({detail})' if detail else ''}")
+        return passed
+
+    ok = True
+    try:
+        WindaValidator.login_and_save_cookies(fake.email, fake.password)
+        ids = [f"W{i:05d}" for i in range(1, args.ids + 1)]
+        validator = WindaBulkValidator(max_concurrency=args.concurrency)
+
+        def timed_validate(**kwargs):
+            searches, started = fake.searches, time.perf_counter()
+            lookups = validator.validate(ids, **kwargs)
+            return lookups, fake.searches - searches, time.perf_counter() - started
+
+        first, searches, elapsed = timed_validate()
+        ok &= check("Primera validación", searches == len(ids) and not any(l.cached for l in first),
+                    f"{searches} búsquedas en {elapsed:.2f} s")
+
+        second, searches, cached_elapsed = timed_validate()
+        same = [l.certificates for l in second] == [l.certificates for l in first]
+        ok &= check("Segunda validación desde el caché", searches == 0 and all(l.cached for l in second) and same,
+                    f"{searches} búsquedas en {cached_elapsed * 1000:.1f} ms")
+
+        _, searches, _ = timed_validate(force_refresh=True)
+        ok &= check("Validación forzada", searches == len(ids), f"{searches} búsquedas")
+
+        searches, started = fake.searches, time.perf_counter()
+        data = asyncio.run(WindaValidator.fetch_winda_data(ids[0]))
+        elapsed = time.perf_counter() - started
+        ok &= check("Consulta individual desde el caché", fake.searches == searches and data == first[0].certificates,
+                    f"{elapsed * 1000:.2f} ms")
+
+        searches = fake.searches
+        asyncio.run(WindaValidator.fetch_winda_data(ids[0], force_refresh=True))
+        ok &= check("Consulta individual forzada", fake.searches == searches + 1)
+
+        # Un certificado que venció después de la consulta se vuelve a consultar
+        key = winda_cache_key(ids[1])
+        record = winda_cache().get(key)
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        record["certificates"] = [dict(record["certificates"][0], ValidTo=yesterday)]
+        record["fetched_at"] = time.time() - 2 * 24 * 3600
+        WINDA_CONFIG["cache"]["ttl"] = 7 * 24 * 3600
+        winda_cache().set(key, record)
+        searches = fake.searches
+        asyncio.run(WindaValidator.fetch_winda_data(ids[1]))
+        ok &= check("Certificado vencido tras la consulta se revalida", fake.searches == searches + 1)
+
+        # Un resultado más viejo que el TTL se vuelve a consultar
+        WINDA_CONFIG["cache"]["ttl"] = 0.2
+        time.sleep(0.3)
+        searches = fake.searches
+        asyncio.run(WindaValidator.fetch_winda_data(ids[2]))
+        ok &= check("Resultado más viejo que el TTL se revalida", fake.searches == searches + 1)
+        WINDA_CONFIG["cache"]["ttl"] = 24 * 3600
+
+        searches, started = fake.searches, time.perf_counter()
+        expiring = expiring_lookups(args.within_days)
+        elapsed = time.perf_counter() - started
+        days = [winda_validator.days_to_expiry(l.certificates[0]["ValidTo"]) for l in expiring]
+        expected = sum(1 for l in first if l.certificates and
+                       winda_validator.days_to_expiry(l.certificates[0]["ValidTo"]) <= args.within_days)
+        ok &= check("Certificados por vencer desde el caché",
+                    fake.searches == searches and bool(expiring) and len(expiring) == expected and days == sorted(days),
+                    f"{len(expiring)} IDs en {elapsed * 1000:.1f} ms, sin búsquedas")
+        path = WindaBulkValidator(expiring_days=args.within_days).write_report(
+            expiring, os.path.join(temp_dir, "por_vencer.xlsx"))
+        ok &= check("Reporte de certificados por vencer", os.path.exists(path))
+    except AssertionError as e:
+        print(f"FALLÓ: {str(e)}")
+        ok = False
+    finally:
+        fake.stop()
+
+    print(f"\nBúsquedas en el servidor: {fake.searches}")
+    print("Resultado: OK" if ok else "Resultado: FALLÓ")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Verifica el inicio de sesión por HTTP de WindaValidator contra el servidor
+falso de Winda: login correcto e incorrecto, búsqueda con las cookies
+obtenidas, refresco automático de una sesión expirada sin abrir el
+navegador, inicio de sesión con las credenciales guardadas cuando no hay
+cookies, vencimiento registrado de las cookies, un solo refresco para
+muchas consultas concurrentes y refresco en segundo plano antes del
+vencimiento. Las cookies, las credenciales y el caché de resultados de
+prueba se guardan en una carpeta temporal, no en assets.
+
+Uso:
+    python tools/check_winda_login.py --searches 20 --concurrent 16
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_winda_server import FakeWindaServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba del login HTTP de Winda")
+    parser.add_argument('--searches', type=int, default=20)
+    parser.add_argument('--concurrent', type=int, default=16, help="Consultas simultáneas con la sesión expirada")
+    parser.add_argument('--session-ttl', type=float, default=30.0)
+    args = parser.parse_args()
+
+    fake = FakeWindaServer(session_ttl=args.session_ttl).start()
+    # Las URLs se leen de las variables de entorno al importar la configuración
+    os.environ['LOGIN_URL'] = fake.login_url
+    os.environ['SEARCH_URL'] = fake.search_url
+
+    from system.config import CACHE_CONFIG, WINDA_CONFIG
+    from codeparts import winda_validator
+    from codeparts.winda_validator import WindaValidator, get_cookie_manager
+    from codeparts.winda_bulk import WindaBulkValidator
+
+    temp_dir = tempfile.mkdtemp(prefix="winda_check_")
+    CACHE_CONFIG['file_path'] = os.path.join(temp_dir, "app_cache.db")
+    winda_validator.COOKIES_FILE = os.path.join(temp_dir, "cookies.encrypted")
+    winda_validator.ASSETS_DIR = temp_dir
+
+    def no_browser(*args, **kwargs):
+        raise AssertionError("Se intentó abrir el navegador")
+    WindaValidator.setup_driver = classmethod(no_browser)
+
+    ok = True
+    try:
+        started = time.perf_counter()
+        cookies = WindaValidator.login_and_save_cookies(fake.email, fake.password)
+        elapsed = time.perf_counter() - started
+        print(f"Login por HTTP: {'ok' if cookies else 'FALLÓ'} en {elapsed * 1000:.0f} ms")
+        ok &= bool(cookies)
+
+        bad = WindaValidator.http_login(fake.email, "incorrecta")
+        print(f"Contraseña incorrecta rechazada: {'sí' if bad is None else 'NO'}")
+        ok &= bad is None
+
+        started = time.perf_counter()
+        found = 0
+        for i in range(1, args.searches + 1):
+            found += len(WindaValidator.parse_results(WindaValidator.make_request(f"W{i:05d}", cookies).json()))
+        elapsed = time.perf_counter() - started
+        print(f"{args.searches} búsquedas con las cookies: {found} certificados en {elapsed:.2f} s")
+
+        fake.expire_sessions()
+        started = time.perf_counter()
+        data = asyncio.run(WindaValidator.fetch_winda_data("W00001", force_refresh=True))
+        elapsed = time.perf_counter() - started
+        print(f"Sesión expirada refrescada por HTTP: {'ok' if data else 'FALLÓ'} en {elapsed * 1000:.0f} ms")
+        ok &= bool(data)
+
+        # Sin archivo de cookies: se inicia sesión con las credenciales guardadas, sin navegador
+        winda_validator.cookie_vault().clear()
+        logins = fake.logins
+        data = asyncio.run(WindaValidator.fetch_winda_data("W00002", force_refresh=True))
+        relogged = bool(data) and fake.logins == logins + 1
+        print(f"Sin cookies guardadas, sesión con las credenciales: {'ok' if relogged else 'FALLÓ'}")
+        ok &= relogged
+
+        _, expires_at = WindaValidator.load_cookie_record()
+        expires_in = expires_at - time.time() if expires_at else None
+        recorded = expires_in is not None and 0 < expires_in <= args.session_ttl
+        print(f"Vencimiento registrado: {'ok' if recorded else 'FALLÓ'} "
+              f"({expires_in:.0f} s)" if expires_in is not None else "Vencimiento registrado: FALLÓ")
+        ok &= recorded
+
+        fake.expire_sessions()
+        logins = fake.logins
+        ids = [f"W{i:05d}" for i in range(1, args.concurrent + 1)]
+        lookups = WindaBulkValidator(max_concurrency=args.concurrent).validate(ids, force_refresh=True)
+        errors = sum(1 for lookup in lookups if lookup.error)
+        single = fake.logins - logins == 1
+        print(f"{args.concurrent} consultas con la sesión expirada: {fake.logins - logins} inicio(s) de sesión, "
+              f"{errors} errores {'(ok)' if single and not errors else '(FALLÓ)'}")
+        ok &= single and not errors
+
+        # Refresco en segundo plano: margen casi igual a la vida de la sesión
+        WINDA_CONFIG["cookies"]["refresh_margin"] = args.session_ttl - 0.5
+        WINDA_CONFIG["cookies"]["check_interval"] = 0.1
+        manager = get_cookie_manager()
+        refreshes, logins = manager.refreshes, fake.logins
+
+        async def run_refresher():
+            task = asyncio.create_task(manager.keep_fresh())
+            await asyncio.sleep(1.5)
+            task.cancel()
+
+        asyncio.run(run_refresher())
+        refreshed = manager.refreshes > refreshes and fake.logins > logins
+        print(f"Refresco en segundo plano antes del vencimiento: {'ok' if refreshed else 'FALLÓ'} "
+              f"({manager.refreshes - refreshes} refrescos)")
+        ok &= refreshed
+    except AssertionError as e:
+        print(f"FALLÓ: {str(e)}")
+        ok = False
+    finally:
+        fake.stop()
+
+    print(f"\nLogins: {fake.logins}, fallidos: {fake.failed_logins}, "
+          f"búsquedas: {fake.searches}, rechazadas: {fake.rejected_searches}")
+    print("Resultado: OK" if ok else "Resultado: FALLÓ")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
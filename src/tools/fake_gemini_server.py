@@ -0,0 +1,157 @@
+"""
+Servidor local que imita el endpoint generateContent de Gemini para pruebas
+y benchmarks, con latencia configurable, cuota por minuto y 429 inyectados.
+
+Uso:
+    python tools/fake_gemini_server.py --port 8765 --latency 0.8 --rpm 60 --error-rate 0.02
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_CV_RESPONSE = {
+    "nombre": "Candidato de Prueba",
+    "correo": "candidato@email.com",
+    "telefono": "5512345678",
+    "ubicacion": "Ciudad de México",
+    "habilidades": ["excel avanzado", "contabilidad", "gestión de proyectos", "trabajo en equipo"],
+    "idiomas": ["Español (nativo)", "Inglés (intermedio)"],
+    "educacion": ["Licenciatura en Administración"],
+    "experiencia": [
+        {
+            "puesto": "Auxiliar administrativo",
+            "empresa": "Empresa de Prueba",
+            "periodo": "2019 - presente",
+            "responsabilidades": ["control de costos", "facturación"]
+        }
+    ]
+}
+
+
+def default_response(prompt: str) -> str:
+    """Responde un objeto por CV, o un arreglo con IDs si el prompt es de un lote"""
+    batch_ids = re.findall(r'^\s*<<<CV id="([^"]+)">>>$', prompt, re.MULTILINE)
+    if batch_ids:
+        return json.dumps([{"id": cv_id, **SAMPLE_CV_RESPONSE} for cv_id in batch_ids], ensure_ascii=False)
+    return json.dumps(SAMPLE_CV_RESPONSE, ensure_ascii=False)
+
+
+class FakeGeminiServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.5,
+                 jitter: float = 0.2, requests_per_minute: int = 60, error_rate: float = 0.0,
+                 response_factory=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_per_minute = requests_per_minute
+        self.error_rate = error_rate
+        self.response_factory = response_factory or default_response
+
+        self.served = 0
+        self.rejected = 0
+        self._window = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _admit(self) -> bool:
+        """Aplica la cuota de solicitudes por minuto en una ventana deslizante"""
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+                self.rejected += 1
+                return False
+            if self.error_rate and random.random() < self.error_rate:
+                self.rejected += 1
+                return False
+            self._window.append(now)
+            return True
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if not self.path.endswith(':generateContent'):
+                    self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+                    return
+
+                if not server._admit():
+                    self._send_json(429, {"error": {"code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"}})
+                    return
+
+                time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+                prompt = "".join(
+                    part.get('text', '')
+                    for content in request.get('contents', [])
+                    for part in content.get('parts', [])
+                )
+                with server._lock:
+                    server.served += 1
+                self._send_json(200, {
+                    "candidates": [{
+                        "content": {"role": "model", "parts": [{"text": server.response_factory(prompt)}]},
+                        "finishReason": "STOP"
+                    }]
+                })
+
+        return Handler
+
+    def start(self) -> "FakeGeminiServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor falso de Gemini")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--rpm', type=int, default=60)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeGeminiServer(port=args.port, latency=args.latency, jitter=args.jitter,
+                            requests_per_minute=args.rpm, error_rate=args.error_rate)
+    print(f"Servidor falso de Gemini escuchando en {fake.url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
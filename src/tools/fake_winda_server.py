@@ -0,0 +1,221 @@
+"""
+Servidor local que imita el inicio de sesión y la búsqueda de Winda para
+pruebas: formulario con token antiforgery, cookie de sesión y el endpoint
+de búsqueda, que responde JSON con la sesión iniciada o redirige al login.
+
+Uso:
+    python tools/fake_winda_server.py --port 8766 --email demo@cjr.mx --password demo
+    (y LOGIN_URL=http://127.0.0.1:8766/account/ SEARCH_URL=http://127.0.0.1:8766/organisation/search-bulk-result)
+"""
+
+import json
+import time
+import secrets
+import argparse
+import threading
+from datetime import date, timedelta
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TOKEN_FIELD = "__RequestVerificationToken"
+TOKEN_COOKIE = ".AspNetCore.Antiforgery"
+SESSION_COOKIE = ".AspNetCore.Identity.Application"
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><body>
+<form method="post" action="/account/login">
+  <input id="Login" name="Login" type="text" value="">
+  <input id="Password" name="Password" type="password">
+  <input name="{token_field}" type="hidden" value="{token}">
+  <button id="loginButton" type="submit">Log in</button>
+</form>
+<div id="CybotCookiebotDialogBodyLevelButtonAccept"></div>
+</body></html>"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><body><span class="full-name">{email}</span></body></html>"""
+
+
+def default_records(winda_id: str) -> list:
+    """Un certificado por ID; los terminados en 0 no existen"""
+    if winda_id.endswith("0"):
+        return []
+    valid_to = date.today() + timedelta(days=(sum(map(ord, winda_id)) % 900) - 200)
+    return [{
+        "WindaId": winda_id, "FirstName": "Técnico", "Surname": winda_id, "Country": "Mexico",
+        "CourseTitle": "Basic Safety Training", "CourseCode": "BST", "TrainingProviderName": "Proveedor",
+        "CompletionDate": "2023-01-01", "ValidFrom": "2023-01-01", "ValidTo": valid_to.isoformat(), "Status": "Valid"
+    }]
+
+
+class FakeWindaServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, email: str = "demo@cjr.mx",
+                 password: str = "demo", latency: float = 0.05, session_ttl: float = 0.0,
+                 records_factory=None):
+        self.email = email
+        self.password = password
+        self.latency = latency
+        # Segundos de vida de una sesión (0: no vence)
+        self.session_ttl = session_ttl
+        self.records_factory = records_factory or default_records
+
+        self.logins = 0
+        self.failed_logins = 0
+        self.searches = 0
+        self.rejected_searches = 0
+        self._tokens = {}  # cookie antiforgery -> token del formulario
+        self._sessions = {}  # cookie de sesión -> instante de creación
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def login_url(self) -> str:
+        return f"{self.url}/account/"
+
+    @property
+    def search_url(self) -> str:
+        return f"{self.url}/organisation/search-bulk-result"
+
+    def expire_sessions(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def _session_valid(self, session_id: str) -> bool:
+        with self._lock:
+            created = self._sessions.get(session_id)
+            if created is None:
+                return False
+            if self.session_ttl and time.monotonic() - created > self.session_ttl:
+                del self._sessions[session_id]
+                return False
+            return True
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _cookies(self) -> dict:
+                cookie = SimpleCookie(self.headers.get('Cookie', ''))
+                return {name: morsel.value for name, morsel in cookie.items()}
+
+            def _form(self) -> dict:
+                length = int(self.headers.get('Content-Length', 0))
+                fields = parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True)
+                return {name: values[0] for name, values in fields.items()}
+
+            def _send(self, status: int, body: str, content_type: str = 'text/html; charset=utf-8',
+                      headers: dict = None):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    if name == 'Set-Cookie':
+                        for cookie in value:
+                            self.send_header('Set-Cookie', cookie)
+                    else:
+                        self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _login_page(self):
+                token, cookie = secrets.token_urlsafe(16), secrets.token_urlsafe(16)
+                with server._lock:
+                    server._tokens[cookie] = token
+                self._send(200, LOGIN_PAGE.format(token_field=TOKEN_FIELD, token=token),
+                           headers={'Set-Cookie': [f"{TOKEN_COOKIE}={cookie}; Path=/; HttpOnly"]})
+
+            def do_GET(self):
+                if self.path.startswith('/account'):
+                    self._login_page()
+                elif self.path.startswith('/organisation') and server._session_valid(self._cookies().get(SESSION_COOKIE)):
+                    self._send(200, HOME_PAGE.format(email=server.email))
+                else:
+                    self._send(302, '', headers={'Location': '/account/'})
+
+            def do_POST(self):
+                time.sleep(server.latency)
+                cookies = self._cookies()
+                form = self._form()
+                if self.path.startswith('/account/login'):
+                    with server._lock:
+                        expected = server._tokens.pop(cookies.get(TOKEN_COOKIE), None)
+                    valid = (expected is not None and form.get(TOKEN_FIELD) == expected and
+                             form.get('Login') == server.email and form.get('Password') == server.password)
+                    if not valid:
+                        with server._lock:
+                            server.failed_logins += 1
+                        self._login_page()
+                        return
+                    session_id = secrets.token_urlsafe(24)
+                    with server._lock:
+                        server._sessions[session_id] = time.monotonic()
+                        server.logins += 1
+                    max_age = f"; Max-Age={int(server.session_ttl)}" if server.session_ttl else ""
+                    self._send(302, '', headers={
+                        'Location': '/organisation/',
+                        'Set-Cookie': [f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly{max_age}"]
+                    })
+                elif self.path.startswith('/organisation/search-bulk-result'):
+                    if not server._session_valid(cookies.get(SESSION_COOKIE)):
+                        with server._lock:
+                            server.rejected_searches += 1
+                        self._send(302, '', headers={'Location': '/account/'})
+                        return
+                    with server._lock:
+                        server.searches += 1
+                    records = server.records_factory(form.get('SearchString', ''))
+                    body = json.dumps({"draw": 1, "recordsTotal": len(records), "recordsFiltered": len(records),
+                                       "data": records}, ensure_ascii=False)
+                    self._send(200, body, 'application/json; charset=utf-8')
+                else:
+                    self._send(404, 'Not found')
+
+        return Handler
+
+    def start(self) -> "FakeWindaServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor falso de Winda")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--email', default="demo@cjr.mx")
+    parser.add_argument('--password', default="demo")
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--session-ttl', type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeWindaServer(port=args.port, email=args.email, password=args.password,
+                           latency=args.latency, session_ttl=args.session_ttl)
+    print(f"Servidor falso de Winda escuchando en {fake.url}")
+    print(f"  LOGIN_URL={fake.login_url}\n  SEARCH_URL={fake.search_url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
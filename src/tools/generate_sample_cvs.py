@@ -50,7 +50,7 @@ def create_sample_cv(filename, candidate_info):
     
     c.save()
 
-def generate_sample_cvs():
+def generate_sample_cvs(cv_dir=None):
     # Sample candidates for different positions
     candidates = [
         {
@@ -121,14 +121,18 @@ def generate_sample_cvs():
     ]
     
     # Create CVs directory if it doesn't exist
-    cv_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'curriculums')
+    if cv_dir is None:
+        cv_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'curriculums')
     os.makedirs(cv_dir, exist_ok=True)
     
     # Generate CVs
+    filenames = []
     for candidate in candidates:
         filename = os.path.join(cv_dir, f"CV_{candidate['name'].replace(' ', '_')}.pdf")
         create_sample_cv(filename, candidate)
+        filenames.append(filename)
         print(f"Generated CV for {candidate['name']}")
+    return filenames
 
 if __name__ == '__main__':
     generate_sample_cvs()